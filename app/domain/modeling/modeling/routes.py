@@ -663,8 +663,15 @@ async def create_semantic_model(
 
 
 @router.get("/semantic")
-async def list_semantic_models(source_id: Optional[str] = None):
-    """List semantic models."""
+async def list_semantic_models(source_id: Optional[str] = None, summary: bool = False):
+    """
+    List semantic models.
+    
+    With ``summary=true`` each entry carries the model's columns and field
+    counts instead of its full definition, read without decoding any model.
+    """
+    if summary:
+        return {"models": semantic_manager.list_summaries(source_id or None)}
     if source_id:
         models = semantic_manager.list_by_source(source_id)
     else:
@@ -12,15 +12,28 @@ Supports lazy loading for large databases.
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
+from functools import lru_cache
 
 from app.infrastructure.adapters.factory import get_adapter
-from app.infrastructure.adapters.base import BaseAdapter, AdapterError
+from app.infrastructure.adapters.base import (
+    AdapterError,
+    AdapterResult,
+    BaseAdapter,
+    ConnectionPool,
+    SingleConnPool,
+)
 
 logger = logging.getLogger(__name__)
 
+# Schema names that are safe to inline as SQL string literals
+_SAFE_SCHEMA_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SCHEMA_PARAM_RE = re.compile(r"table_schema = %s")
+
 
 class ColumnType(str, Enum):
     """Normalized column types across databases."""
@@ -427,8 +440,17 @@ class SchemaIntrospector:
         """
         self.adapter = adapter
         self.engine = adapter.ENGINE.lower()
+        # Sessions are borrowed from the pool so parallel lookups stay bounded
+        self.pool: ConnectionPool = adapter.pool or SingleConnPool(adapter)
         self._schema_cache: Dict[str, SchemaInfo] = {}
         self._table_cache: Dict[str, TableInfo] = {}
+        # Column queries with the schema literal baked in, keyed by schema name
+        self._column_sql: Dict[str, str] = {}
+    
+    def _execute(self, sql: str, params: Optional[List[Any]] = None) -> AdapterResult:
+        """Execute a query on a session borrowed from the pool."""
+        with self.pool.acquire() as conn:
+            return conn.execute(sql, params)
     
     def get_schemas(self) -> List[SchemaInfo]:
         """
@@ -444,19 +466,19 @@ class SchemaIntrospector:
         # Try SHOW DATABASES first for MySQL-based engines (especially StarRocks/Doris with catalogs)
         if self.engine in ("mysql", "starrocks", "doris") and has_catalog:
             try:
-                logger.debug(f"Using SHOW DATABASES for {self.engine} with catalog {self.adapter.catalog}")
-                result = self.adapter.execute("SHOW DATABASES")
-                schemas = []
-                for row in result.rows:
-                    # SHOW DATABASES returns rows with 'Database' column
-                    name = row.get("Database") or (list(row.values())[0] if row.values() else None)
-                    if name and name not in ('information_schema', 'mysql', 'performance_schema', 'sys'):
-                        schemas.append(SchemaInfo(name=name))
-                logger.debug(f"SHOW DATABASES returned {len(schemas)} schemas")
+                logger.debug("Using SHOW DATABASES for %s with catalog %s", self.engine, self.adapter.catalog)
+                result = self._execute("SHOW DATABASES")
+                # SHOW DATABASES returns rows with 'Database' column
+                key = _resolve_key(result.rows, "Database")
+                schemas = [
+                    SchemaInfo(name=row[key]) for row in result.rows
+                    if row[key] and row[key] not in ('information_schema', 'mysql', 'performance_schema', 'sys')
+                ]
+                logger.debug("SHOW DATABASES returned %d schemas", len(schemas))
                 if schemas:
                     return schemas
             except Exception as e:
-                logger.warning(f"SHOW DATABASES failed, trying information_schema: {e}")
+                logger.warning("SHOW DATABASES failed, trying information_schema: %s", e)
         
         # Standard query from SCHEMA_QUERIES
         query = self.SCHEMA_QUERIES.get(self.engine)
@@ -465,36 +487,35 @@ class SchemaIntrospector:
             query = "SELECT schema_name FROM information_schema.schemata"
         
         try:
-            logger.debug(f"Executing schema query for engine {self.engine}: {query}")
-            result = self.adapter.execute(query)
-            logger.debug(f"Schema query returned {len(result.rows)} rows")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executing schema query for engine %s: %s", self.engine, query)
+            result = self._execute(query)
+            logger.debug("Schema query returned %d rows", len(result.rows))
             
-            schemas = []
-            for row in result.rows:
-                # Handle different column names
-                name = row.get("schema_name") or row.get("name") or row.get("databaseName") or (list(row.values())[0] if row.values() else None)
-                if name:
-                    schemas.append(SchemaInfo(name=name))
+            # Handle different column names; resolved once from the first row
+            key = _resolve_key(result.rows, "schema_name", "name", "databaseName")
+            schemas = [SchemaInfo(name=row[key]) for row in result.rows if row[key]]
             
             if not schemas:
-                logger.warning(f"No schemas found for engine {self.engine}. Query returned {len(result.rows)} rows but no valid schema names.")
+                logger.warning("No schemas found for engine %s. Query returned %d rows but no valid schema names.", self.engine, len(result.rows))
                 # Try alternative query for MySQL-based engines (StarRocks, Doris)
                 if self.engine in ("mysql", "starrocks", "doris"):
                     try:
                         logger.debug("Trying alternative query: SHOW DATABASES")
-                        alt_result = self.adapter.execute("SHOW DATABASES")
-                        for row in alt_result.rows:
-                            # SHOW DATABASES returns rows with 'Database' column
-                            name = row.get("Database") or (list(row.values())[0] if row.values() else None)
-                            if name and name not in ('information_schema', 'mysql', 'performance_schema', 'sys'):
-                                schemas.append(SchemaInfo(name=name))
-                        logger.debug(f"Alternative query returned {len(schemas)} schemas")
+                        alt_result = self._execute("SHOW DATABASES")
+                        # SHOW DATABASES returns rows with 'Database' column
+                        key = _resolve_key(alt_result.rows, "Database")
+                        schemas.extend(
+                            SchemaInfo(name=row[key]) for row in alt_result.rows
+                            if row[key] and row[key] not in ('information_schema', 'mysql', 'performance_schema', 'sys')
+                        )
+                        logger.debug("Alternative query returned %d schemas", len(schemas))
                     except Exception as alt_e:
-                        logger.warning(f"Alternative query also failed: {alt_e}")
+                        logger.warning("Alternative query also failed: %s", alt_e)
             
             return schemas if schemas else []
         except Exception as e:
-            logger.error(f"Failed to get schemas for engine {self.engine}: {e}", exc_info=True)
+            logger.error("Failed to get schemas for engine %s: %s", self.engine, e, exc_info=True)
             # Return empty list instead of default schema to indicate failure
             return []
     
@@ -530,11 +551,13 @@ class SchemaIntrospector:
             params = [schema_name]
         
         try:
-            result = self.adapter.execute(query, params if params else None)
+            result = self._execute(query, params if params else None)
             tables = []
+            name_key = _resolve_key(result.rows, "table_name", "name")
+            type_key = _resolve_key(result.rows, "table_type", "type", fallback_to_first=False)
             for row in result.rows:
-                table_name = row.get("table_name") or row.get("name") or list(row.values())[0]
-                table_type = row.get("table_type") or row.get("type") or "TABLE"
+                table_name = row[name_key]
+                table_type = (row[type_key] if type_key else None) or "TABLE"
                 if isinstance(table_type, str):
                     table_type = table_type.upper()
                     if table_type in ("U", "BASE TABLE"):
@@ -549,7 +572,7 @@ class SchemaIntrospector:
                 ))
             return tables
         except Exception as e:
-            logger.error(f"Failed to get tables for schema {schema_name}: {e}")
+            logger.error("Failed to get tables for schema %s: %s", schema_name, e)
             return []
     
     def get_columns(self, schema_name: str, table_name: str) -> List[ColumnInfo]:
@@ -565,7 +588,12 @@ class SchemaIntrospector:
         """
         query_template = self.COLUMN_QUERIES.get(self.engine)
         
-        if self.engine == "postgres":
+        specialized = self._specialized_column_sql(schema_name)
+        if specialized:
+            # Only the table name is bound; the server plans per schema
+            query = specialized
+            params = [table_name] * specialized.count("%s")
+        elif self.engine == "postgres":
             params = [schema_name, table_name, schema_name, table_name, schema_name, table_name]
             query = query_template
         elif self.engine == "mysql":
@@ -588,32 +616,43 @@ class SchemaIntrospector:
             params = [schema_name, table_name]
         
         try:
-            result = self.adapter.execute(query, params)
+            result = self._execute(query, params)
             columns = []
+            # Handle case-insensitive key lookup (MySQL returns uppercase, PostgreSQL lowercase).
+            # Every row shares the first row's keys, so resolve them once up front.
+            row_keys = {k.lower(): k for k in result.rows[0]} if result.rows else {}
+            
+            def key_for(*names: str) -> Optional[str]:
+                return next((row_keys[n] for n in names if n in row_keys), None)
+            
+            name_key = key_for("column_name", "name")
+            type_key = key_for("data_type", "type")
+            nullable_key = key_for("is_nullable")
+            pk_key = key_for("is_primary_key")
+            fk_key = key_for("fk_ref", "foreign_key_ref")
+            default_key = key_for("column_default", "default_value")
+            position_key = key_for("ordinal_position")
+            length_key = key_for("character_maximum_length", "max_length")
+            precision_key = key_for("numeric_precision", "precision")
+            scale_key = key_for("numeric_scale", "scale")
+            
+            def get_key(row: Dict[str, Any], key: Optional[str]) -> Any:
+                return row[key] if key else None
+            
             for row in result.rows:
-                # Handle case-insensitive key lookup (MySQL returns uppercase, PostgreSQL lowercase)
-                def get_key(row, *keys):
-                    """Get value from row using case-insensitive key matching."""
-                    row_lower = {k.lower(): v for k, v in row.items()}
-                    for key in keys:
-                        key_lower = key.lower()
-                        if key_lower in row_lower:
-                            return row_lower[key_lower]
-                    return None
-                
-                col_name = get_key(row, "column_name", "name") or None
-                data_type = (get_key(row, "data_type", "type") or "unknown").lower()
-                is_nullable = get_key(row, "is_nullable") or "YES"
+                col_name = get_key(row, name_key) or None
+                data_type = (get_key(row, type_key) or "unknown").lower()
+                is_nullable = get_key(row, nullable_key) or "YES"
                 if isinstance(is_nullable, str):
                     is_nullable = is_nullable.upper() == "YES"
                 elif isinstance(is_nullable, int):
                     is_nullable = is_nullable == 0  # SQLite: 0 means nullable
                 
-                is_pk = get_key(row, "is_primary_key") or False
+                is_pk = get_key(row, pk_key) or False
                 if isinstance(is_pk, int):
                     is_pk = is_pk > 0
                 
-                fk_ref = get_key(row, "fk_ref", "foreign_key_ref")
+                fk_ref = get_key(row, fk_key)
                 if fk_ref and (isinstance(fk_ref, str) and fk_ref.startswith("None")):
                     fk_ref = None
                 
@@ -625,17 +664,37 @@ class SchemaIntrospector:
                     is_primary_key=bool(is_pk),
                     is_foreign_key=fk_ref is not None,
                     foreign_key_ref=fk_ref,
-                    default_value=get_key(row, "column_default", "default_value"),
-                    ordinal_position=get_key(row, "ordinal_position") or 0,
-                    max_length=get_key(row, "character_maximum_length", "max_length"),
-                    precision=get_key(row, "numeric_precision", "precision"),
-                    scale=get_key(row, "numeric_scale", "scale"),
+                    default_value=get_key(row, default_key),
+                    ordinal_position=get_key(row, position_key) or 0,
+                    max_length=get_key(row, length_key),
+                    precision=get_key(row, precision_key),
+                    scale=get_key(row, scale_key),
                 ))
             return columns
         except Exception as e:
-            logger.error(f"Failed to get columns for {schema_name}.{table_name}: {e}")
+            logger.error("Failed to get columns for %s.%s: %s", schema_name, table_name, e)
             return []
     
+    def _specialized_column_sql(self, schema_name: str) -> Optional[str]:
+        """
+        Get the PostgreSQL/MySQL column query specialized for one schema.
+        
+        The schema is inlined as a literal (after validating it is a plain
+        identifier) so only the table name remains a bind parameter. Returns
+        None for other engines or names that cannot be inlined safely.
+        """
+        if self.engine not in ("postgres", "mysql"):
+            return None
+        sql = self._column_sql.get(schema_name)
+        if sql is None:
+            if not _SAFE_SCHEMA_RE.match(schema_name):
+                return None
+            sql = _SCHEMA_PARAM_RE.sub(
+                f"table_schema = '{schema_name}'", self.COLUMN_QUERIES[self.engine]
+            )
+            self._column_sql[schema_name] = sql
+        return sql
+    
     def get_table_info(self, schema_name: str, table_name: str) -> TableInfo:
         """
         Get complete table info including columns.
@@ -701,9 +760,15 @@ class SchemaIntrospector:
         results = []
         
         schemas = [SchemaInfo(name=schema_name)] if schema_name else self.get_schemas()
+        names = [schema.name for schema in schemas]
         
-        for schema in schemas:
-            tables = self.get_tables(schema.name)
+        if len(names) > 1 and self.pool.size > 1:
+            with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+                per_schema = list(executor.map(self.get_tables, names))
+        else:
+            per_schema = [self.get_tables(name) for name in names]
+        
+        for tables in per_schema:
             for table in tables:
                 if pattern_lower in table.table_name.lower():
                     results.append(table)
@@ -712,8 +777,7 @@ class SchemaIntrospector:
     
     def _normalize_type(self, data_type: str) -> ColumnType:
         """Normalize database type to standard type."""
-        dt = data_type.lower().split("(")[0].strip()  # Remove size info
-        return self.TYPE_MAPPING.get(dt, ColumnType.UNKNOWN)
+        return _normalize_type(type(self), data_type)
     
     def get_sample_data(
         self, 
@@ -742,10 +806,10 @@ class SchemaIntrospector:
         query = f"SELECT * FROM {full_name} LIMIT {limit}"
         
         try:
-            result = self.adapter.execute(query)
+            result = self._execute(query)
             return result.rows
         except Exception as e:
-            logger.error(f"Failed to get sample data: {e}")
+            logger.error("Failed to get sample data: %s", e)
             return []
     
     def get_table_stats(self, schema_name: str, table_name: str) -> Dict[str, Any]:
@@ -756,7 +820,7 @@ class SchemaIntrospector:
         
         try:
             if self.engine == "postgres":
-                result = self.adapter.execute(f"""
+                result = self._execute(f"""
                     SELECT reltuples::bigint AS row_count,
                            pg_total_relation_size('{schema_name}.{table_name}') AS size_bytes
                     FROM pg_class c
@@ -767,7 +831,7 @@ class SchemaIntrospector:
                     stats["rowCount"] = result.rows[0].get("row_count")
                     stats["sizeBytes"] = result.rows[0].get("size_bytes")
             elif self.engine == "mysql":
-                result = self.adapter.execute(f"""
+                result = self._execute(f"""
                     SELECT table_rows AS row_count, data_length + index_length AS size_bytes
                     FROM information_schema.tables
                     WHERE table_schema = '{schema_name}' AND table_name = '{table_name}'
@@ -777,11 +841,44 @@ class SchemaIntrospector:
                     stats["sizeBytes"] = result.rows[0].get("size_bytes")
             else:
                 # Generic count
-                result = self.adapter.execute(f"SELECT COUNT(*) as cnt FROM \"{schema_name}\".\"{table_name}\"")
+                result = self._execute(f"SELECT COUNT(*) as cnt FROM \"{schema_name}\".\"{table_name}\"")
                 if result.rows:
                     stats["rowCount"] = result.rows[0].get("cnt")
         except Exception as e:
-            logger.warning(f"Could not get stats for {schema_name}.{table_name}: {e}")
+            logger.warning("Could not get stats for %s.%s: %s", schema_name, table_name, e)
         
         return stats
 
+
+def _resolve_key(
+    rows: List[Dict[str, Any]],
+    *candidates: str,
+    fallback_to_first: bool = True,
+) -> Optional[str]:
+    """
+    Pick the result column holding a value, checked once against the first row.
+    
+    Returns the first candidate present, else the first column of the row
+    (unless ``fallback_to_first`` is False), else None.
+    """
+    if not rows:
+        return None
+    first = rows[0]
+    for key in candidates:
+        if key in first:
+            return key
+    if fallback_to_first and first:
+        return next(iter(first))
+    return None
+
+
+@lru_cache(maxsize=256)
+def _normalize_type(introspector_cls: type, data_type: str) -> ColumnType:
+    """
+    Normalize database type to standard type using introspector_cls.TYPE_MAPPING.
+    
+    Cached per class and raw type string; an engine reports a few dozen
+    distinct types, so repeat columns skip the parsing.
+    """
+    dt = data_type.lower().split("(")[0].strip()  # Remove size info
+    return introspector_cls.TYPE_MAPPING.get(dt, ColumnType.UNKNOWN)
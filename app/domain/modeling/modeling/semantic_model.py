@@ -12,20 +12,211 @@ The semantic model sits on top of the physical schema and ERD,
 providing a business-friendly view of the data.
 """
 
-import json
+import io
+import itertools
 import logging
+import pickle
 import re
+import secrets
 import sqlite3
+import threading
 import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    re2 = None
+    RE2_AVAILABLE = False
+
+try:
+    import sqlglot
+    from sqlglot.errors import TokenError
+    from sqlglot.tokens import TokenType
+    SQLGLOT_AVAILABLE = True
+except ImportError:
+    sqlglot = None
+    SQLGLOT_AVAILABLE = False
+
+from app.shared.utils.serialization import dumps as json_dumps, loads as json_loads
+from app.shared.utils.slots import slotted_dataclass
 
 logger = logging.getLogger(__name__)
 
 
+_MISSING = object()
+
+
+def _pick(data: dict, *keys: str, default: Any = None) -> Any:
+    """Return the value of the first key present in ``data`` (camelCase or snake_case)."""
+    for key in keys:
+        value = data.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return default
+
+
+# Child field IDs only need to be unique, not unguessable: a per-process
+# random prefix plus a counter avoids a CSPRNG read for every field loaded
+_ID_PREFIX = secrets.token_hex(8)
+_id_counter = itertools.count()
+
+
+def _fast_id() -> str:
+    """Unique ID for a dimension, measure, or calculated field."""
+    return f"{_ID_PREFIX}-{next(_id_counter):x}"
+
+
+class _LazyTimestamp:
+    """
+    Timestamp field that keeps ISO strings as loaded and parses on first read.
+    
+    Models decoded in bulk (``list_all``) rarely touch their timestamps, so
+    ``from_dict`` stores the raw string and ``to_dict`` writes it back as-is.
+    """
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = f"_{name}"
+    
+    def __get__(self, instance: Any, owner: type = None) -> Optional[datetime]:
+        if instance is None:
+            return None  # dataclass default
+        value = instance.__dict__.get(self.slot)
+        if isinstance(value, str):
+            value = instance.__dict__[self.slot] = datetime.fromisoformat(value)
+        return value
+    
+    def __set__(self, instance: Any, value: Union[str, datetime, None]) -> None:
+        instance.__dict__[self.slot] = value
+
+
+def _isoformat(value: Union[str, datetime, None]) -> Optional[str]:
+    """ISO form of a stored timestamp, passing raw strings through unparsed."""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+# Lookup indexes (see SemanticModel._lookup) are checked against these:
+# every _FieldList mutation takes a fresh version, and renaming an indexed
+# field moves the rename generation on
+_list_versions = itertools.count(1)
+_rename_generation = 0
+
+
+class _FieldList(list):
+    """List of model fields that records a new version on every mutation."""
+    
+    __slots__ = ("version",)
+    
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.version = next(_list_versions)
+
+
+def _bump_version(name: str):
+    mutate = getattr(list, name)
+    
+    def method(self, *args, **kwargs):
+        result = mutate(self, *args, **kwargs)
+        self.version = next(_list_versions)
+        return result
+    
+    method.__name__ = name
+    return method
+
+
+for _name in (
+    "__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+    "insert", "pop", "remove", "clear", "sort", "reverse",
+):
+    setattr(_FieldList, _name, _bump_version(_name))
+del _name
+
+
+class _FieldListAttr:
+    """Model attribute that stores assigned field lists as ``_FieldList``."""
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = f"_{name}"
+    
+    def __get__(self, instance: Any, owner: type = None) -> List[Any]:
+        if instance is None:
+            return ()  # dataclass default, copied into a fresh list by __set__
+        return instance.__dict__[self.slot]
+    
+    def __set__(self, instance: Any, value: List[Any]) -> None:
+        if type(value) is not _FieldList:
+            value = _FieldList(value)
+        instance.__dict__[self.slot] = value
+
+
+def _track_renames(cls):
+    """
+    Route ``id`` and ``name`` assignments through a property that moves the
+    rename generation on once the field has been indexed.
+    
+    Fields that were never indexed (the common case while loading) skip
+    the bump, so decoding models does not invalidate other models' indexes.
+    """
+    def tracked(slot):
+        put = slot.__set__
+        
+        def set_(obj: Any, value: str) -> None:
+            global _rename_generation
+            put(obj, value)
+            if getattr(obj, "_indexed", False):
+                _rename_generation += 1
+        
+        return property(slot.__get__, set_)
+    
+    for name in ("id", "name"):
+        setattr(cls, name, tracked(cls.__dict__[name]))
+    return cls
+
+
+class _FieldIndex:
+    """First position of each id/name in a field list."""
+    
+    __slots__ = ("items", "version", "generation", "exact", "folded")
+    
+    def __init__(self, items: _FieldList, fold: bool):
+        # Read both counters before scanning, so a concurrent change forces a rebuild
+        self.items = items
+        self.version = items.version
+        self.generation = _rename_generation
+        self.exact: Dict[str, int] = {}
+        self.folded: Optional[Dict[str, int]] = {} if fold else None
+        for i, item in enumerate(items):
+            item._indexed = True
+            self.exact.setdefault(item.id, i)
+            self.exact.setdefault(item.name, i)
+            if fold:
+                self.folded.setdefault(item.name.lower().strip(), i)
+    
+    def is_current(self, items: _FieldList) -> bool:
+        return (
+            items is self.items
+            and items.version == self.version
+            and _rename_generation == self.generation
+        )
+    
+    def find(self, key: str) -> Any:
+        pos = self.exact.get(key)
+        if self.folded is not None:
+            folded = self.folded.get(key.lower().strip())
+            if folded is not None and (pos is None or folded < pos):
+                pos = folded
+        return None if pos is None else self.items[pos]
+
+
 class AggregationType(str, Enum):
     """Supported aggregation functions."""
     SUM = "SUM"
@@ -73,7 +264,25 @@ class FormatType(str, Enum):
     BOOLEAN = "boolean"
 
 
-@dataclass
+# Value -> member maps used by from_dict in place of calling the enum class
+_AGGREGATION_MAP = {e.value: e for e in AggregationType}
+_DIM_TYPE_MAP = {e.value: e for e in DimensionType}
+_FORMAT_TYPE_MAP = {e.value: e for e in FormatType}
+
+# SQL template per aggregation, used by Measure.to_sql
+_AGG_SQL = {a: f"{a.value}({{}})" for a in AggregationType}
+_AGG_SQL[AggregationType.NONE] = "{}"
+_AGG_SQL[AggregationType.COUNT_DISTINCT] = "COUNT(DISTINCT {})"
+
+
+def _coerce(members: Dict[str, Enum], enum_cls: type, value: Any) -> Enum:
+    """Map a stored value to its enum member; unknown values raise as before."""
+    member = members.get(value)
+    return member if member is not None else enum_cls(value)
+
+
+@_track_renames
+@slotted_dataclass
 class Dimension:
     """
     A dimension (categorical column) in the semantic model.
@@ -92,6 +301,7 @@ class Dimension:
         synonyms: Alternative names for NLQ
         metadata: Additional attributes
     """
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
     id: str
     name: str
     source_column: str
@@ -124,22 +334,23 @@ class Dimension:
     @classmethod
     def from_dict(cls, data: dict) -> "Dimension":
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data["id"] if "id" in data else _fast_id(),
             name=data.get("name", ""),
-            source_column=data.get("sourceColumn", data.get("source_column", "")),
-            source_table=data.get("sourceTable", data.get("source_table", "")),
+            source_column=_pick(data, "sourceColumn", "source_column", default=""),
+            source_table=_pick(data, "sourceTable", "source_table", default=""),
             description=data.get("description"),
-            dimension_type=DimensionType(data.get("dimensionType", data.get("dimension_type", "categorical"))),
-            hierarchy_level=data.get("hierarchyLevel", data.get("hierarchy_level", 0)),
-            parent_dimension_id=data.get("parentDimensionId", data.get("parent_dimension_id")),
-            default_format=FormatType(data.get("defaultFormat", data.get("default_format", "text"))),
-            is_visible=data.get("isVisible", data.get("is_visible", True)),
+            dimension_type=_coerce(_DIM_TYPE_MAP, DimensionType, _pick(data, "dimensionType", "dimension_type", default="categorical")),
+            hierarchy_level=_pick(data, "hierarchyLevel", "hierarchy_level", default=0),
+            parent_dimension_id=_pick(data, "parentDimensionId", "parent_dimension_id"),
+            default_format=_coerce(_FORMAT_TYPE_MAP, FormatType, _pick(data, "defaultFormat", "default_format", default="text")),
+            is_visible=_pick(data, "isVisible", "is_visible", default=True),
             synonyms=data.get("synonyms", []),
             metadata=data.get("metadata", {}),
         )
 
 
-@dataclass
+@_track_renames
+@slotted_dataclass
 class Measure:
     """
     A measure (metric) in the semantic model.
@@ -160,6 +371,7 @@ class Measure:
         synonyms: Alternative names for NLQ
         metadata: Additional attributes
     """
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
     id: str
     name: str
     expression: str
@@ -196,17 +408,17 @@ class Measure:
     @classmethod
     def from_dict(cls, data: dict) -> "Measure":
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data["id"] if "id" in data else _fast_id(),
             name=data.get("name", ""),
             expression=data.get("expression", ""),
-            aggregation=AggregationType(data.get("aggregation", "SUM")),
-            source_table=data.get("sourceTable", data.get("source_table")),
+            aggregation=_coerce(_AGGREGATION_MAP, AggregationType, data.get("aggregation", "SUM")),
+            source_table=_pick(data, "sourceTable", "source_table"),
             description=data.get("description"),
-            format_string=data.get("formatString", data.get("format_string", "#,##0.00")),
-            format_type=FormatType(data.get("formatType", data.get("format_type", "number"))),
-            is_visible=data.get("isVisible", data.get("is_visible", True)),
-            is_additive=data.get("isAdditive", data.get("is_additive", True)),
-            depends_on=data.get("dependsOn", data.get("depends_on", [])),
+            format_string=_pick(data, "formatString", "format_string", default="#,##0.00"),
+            format_type=_coerce(_FORMAT_TYPE_MAP, FormatType, _pick(data, "formatType", "format_type", default="number")),
+            is_visible=_pick(data, "isVisible", "is_visible", default=True),
+            is_additive=_pick(data, "isAdditive", "is_additive", default=True),
+            depends_on=_pick(data, "dependsOn", "depends_on", default=[]),
             filters=data.get("filters", []),
             synonyms=data.get("synonyms", []),
             metadata=data.get("metadata", {}),
@@ -214,15 +426,11 @@ class Measure:
     
     def to_sql(self) -> str:
         """Generate SQL expression for this measure."""
-        if self.aggregation == AggregationType.NONE:
-            return self.expression
-        elif self.aggregation == AggregationType.COUNT_DISTINCT:
-            return f"COUNT(DISTINCT {self.expression})"
-        else:
-            return f"{self.aggregation.value}({self.expression})"
+        return _AGG_SQL[self.aggregation].format(self.expression)
 
 
-@dataclass
+@_track_renames
+@slotted_dataclass
 class CalculatedField:
     """
     A calculated field that derives from other measures/dimensions.
@@ -232,6 +440,7 @@ class CalculatedField:
     - [Revenue] - [Cost]    -> Profit
     - CASE WHEN [Status] = 'Active' THEN 1 ELSE 0 END
     """
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
     id: str
     name: str
     expression: str
@@ -260,20 +469,20 @@ class CalculatedField:
     @classmethod
     def from_dict(cls, data: dict) -> "CalculatedField":
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data["id"] if "id" in data else _fast_id(),
             name=data.get("name", ""),
             expression=data.get("expression", ""),
-            result_type=data.get("resultType", data.get("result_type", "number")),
+            result_type=_pick(data, "resultType", "result_type", default="number"),
             description=data.get("description"),
-            format_string=data.get("formatString", data.get("format_string", "#,##0.00")),
-            format_type=FormatType(data.get("formatType", data.get("format_type", "number"))),
-            is_visible=data.get("isVisible", data.get("is_visible", True)),
-            referenced_fields=data.get("referencedFields", data.get("referenced_fields", [])),
+            format_string=_pick(data, "formatString", "format_string", default="#,##0.00"),
+            format_type=_coerce(_FORMAT_TYPE_MAP, FormatType, _pick(data, "formatType", "format_type", default="number")),
+            is_visible=_pick(data, "isVisible", "is_visible", default=True),
+            referenced_fields=_pick(data, "referencedFields", "referenced_fields", default=[]),
             metadata=data.get("metadata", {}),
         )
 
 
-@dataclass
+@slotted_dataclass
 class TimeIntelligence:
     """
     Time intelligence configuration for a time dimension.
@@ -305,11 +514,11 @@ class TimeIntelligence:
     @classmethod
     def from_dict(cls, data: dict) -> "TimeIntelligence":
         return cls(
-            dimension_id=data.get("dimensionId", data.get("dimension_id", "")),
-            date_column=data.get("dateColumn", data.get("date_column", "")),
-            fiscal_year_start_month=data.get("fiscalYearStartMonth", data.get("fiscal_year_start_month", 1)),
-            week_start_day=data.get("weekStartDay", data.get("week_start_day", 1)),
-            enabled_calculations=data.get("enabledCalculations", data.get("enabled_calculations", [])),
+            dimension_id=_pick(data, "dimensionId", "dimension_id", default=""),
+            date_column=_pick(data, "dateColumn", "date_column", default=""),
+            fiscal_year_start_month=_pick(data, "fiscalYearStartMonth", "fiscal_year_start_month", default=1),
+            week_start_day=_pick(data, "weekStartDay", "week_start_day", default=1),
+            enabled_calculations=_pick(data, "enabledCalculations", "enabled_calculations", default=[]),
         )
 
 
@@ -325,88 +534,136 @@ class SemanticModel:
     name: str
     source_id: str
     erd_model_id: Optional[str] = None
-    dimensions: List[Dimension] = field(default_factory=list)
-    measures: List[Measure] = field(default_factory=list)
-    calculated_fields: List[CalculatedField] = field(default_factory=list)
+    dimensions: List[Dimension] = _FieldListAttr()
+    measures: List[Measure] = _FieldListAttr()
+    calculated_fields: List[CalculatedField] = _FieldListAttr()
     time_intelligence: List[TimeIntelligence] = field(default_factory=list)
     description: Optional[str] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+    created_at: Optional[datetime] = _LazyTimestamp()
+    updated_at: Optional[datetime] = _LazyTimestamp()
     version: int = 1
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
-        if self.created_at is None:
+        if self._created_at is None:
             self.created_at = datetime.now(timezone.utc)
-        if self.updated_at is None:
+        if self._updated_at is None:
             self.updated_at = datetime.now(timezone.utc)
+        self._field_indexes: Dict[str, _FieldIndex] = {}
+    
+    def __getstate__(self) -> dict:
+        # Indexes are rebuilt on first lookup rather than pickled with the model
+        state = self.__dict__.copy()
+        state["_field_indexes"] = {}
+        return state
+    
+    def to_json(self) -> str:
+        """
+        Serialized ``to_dict()``, as stored by SemanticModelManager.
+        
+        Encoded on every call: fields and metadata are edited in place, so
+        a cached copy could not tell when it went stale.
+        """
+        buffer = io.StringIO()
+        self.write_json(buffer)
+        return buffer.getvalue()
+    
+    # Keys of the serialized form holding lists of field objects
+    _FIELD_LIST_KEYS = frozenset({"dimensions", "measures", "calculatedFields", "timeIntelligence"})
+    
+    def _document_items(self) -> Iterator[Tuple[str, Any]]:
+        """Top-level (key, value) pairs of the serialized form, in order."""
+        yield "id", self.id
+        yield "name", self.name
+        yield "sourceId", self.source_id
+        yield "erdModelId", self.erd_model_id
+        yield "dimensions", self.dimensions
+        yield "measures", self.measures
+        yield "calculatedFields", self.calculated_fields
+        yield "timeIntelligence", self.time_intelligence
+        yield "description", self.description
+        yield "createdAt", _isoformat(self._created_at)
+        yield "updatedAt", _isoformat(self._updated_at)
+        yield "version", self.version
+        yield "metadata", self.metadata
     
     def to_dict(self) -> dict:
         return {
-            "id": self.id,
-            "name": self.name,
-            "sourceId": self.source_id,
-            "erdModelId": self.erd_model_id,
-            "dimensions": [d.to_dict() for d in self.dimensions],
-            "measures": [m.to_dict() for m in self.measures],
-            "calculatedFields": [c.to_dict() for c in self.calculated_fields],
-            "timeIntelligence": [t.to_dict() for t in self.time_intelligence],
-            "description": self.description,
-            "createdAt": self.created_at.isoformat() if self.created_at else None,
-            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
-            "version": self.version,
-            "metadata": self.metadata,
+            key: [item.to_dict() for item in value] if key in self._FIELD_LIST_KEYS else value
+            for key, value in self._document_items()
         }
     
+    def write_json(self, writer: TextIO) -> None:
+        """
+        Write the ``to_dict()`` document to ``writer`` as JSON.
+        
+        Fields are encoded one at a time, so the full nested dict is
+        never built alongside its serialized form.
+        """
+        write = writer.write
+        write("{")
+        for i, (key, value) in enumerate(self._document_items()):
+            if i:
+                write(",")
+            write(json_dumps(key))
+            write(":")
+            if key in self._FIELD_LIST_KEYS:
+                write("[")
+                for j, item in enumerate(value):
+                    if j:
+                        write(",")
+                    write(json_dumps(item.to_dict()))
+                write("]")
+            else:
+                write(json_dumps(value))
+        write("}")
+    
     @classmethod
     def from_dict(cls, data: dict) -> "SemanticModel":
         created_at = data.get("createdAt") or data.get("created_at")
         updated_at = data.get("updatedAt") or data.get("updated_at")
         
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data["id"] if "id" in data else str(uuid.uuid4()),
             name=data.get("name", "Untitled"),
-            source_id=data.get("sourceId", data.get("source_id", "")),
-            erd_model_id=data.get("erdModelId", data.get("erd_model_id")),
+            source_id=_pick(data, "sourceId", "source_id", default=""),
+            erd_model_id=_pick(data, "erdModelId", "erd_model_id"),
             dimensions=[Dimension.from_dict(d) for d in data.get("dimensions", [])],
             measures=[Measure.from_dict(m) for m in data.get("measures", [])],
-            calculated_fields=[CalculatedField.from_dict(c) for c in data.get("calculatedFields", data.get("calculated_fields", []))],
-            time_intelligence=[TimeIntelligence.from_dict(t) for t in data.get("timeIntelligence", data.get("time_intelligence", []))],
+            calculated_fields=[CalculatedField.from_dict(c) for c in _pick(data, "calculatedFields", "calculated_fields", default=[])],
+            time_intelligence=[TimeIntelligence.from_dict(t) for t in _pick(data, "timeIntelligence", "time_intelligence", default=[])],
             description=data.get("description"),
-            created_at=datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at,
-            updated_at=datetime.fromisoformat(updated_at) if isinstance(updated_at, str) else updated_at,
+            created_at=created_at,
+            updated_at=updated_at,
             version=data.get("version", 1),
             metadata=data.get("metadata", {}),
         )
     
+    def _lookup(self, attr: str, id_or_name: str, fold: bool) -> Any:
+        """
+        First field in ``attr`` whose ID or name matches ``id_or_name``.
+        
+        The per-list index is rebuilt whenever the list is replaced or
+        mutated, or an indexed field is renamed, so lookups always agree
+        with a front-to-back scan.
+        """
+        items = getattr(self, attr)
+        index = self._field_indexes.get(attr)
+        if index is None or not index.is_current(items):
+            index = self._field_indexes[attr] = _FieldIndex(items, fold)
+        return index.find(id_or_name)
+    
     def get_dimension(self, id_or_name: str) -> Optional[Dimension]:
         """Get dimension by ID or name (case-insensitive matching)."""
-        id_or_name_lower = id_or_name.lower().strip()
-        for d in self.dimensions:
-            if d.id == id_or_name or d.name == id_or_name:
-                return d
-            # Case-insensitive fallback
-            if d.name.lower().strip() == id_or_name_lower:
-                return d
-        return None
+        return self._lookup("dimensions", id_or_name, fold=True)
     
     def get_measure(self, id_or_name: str) -> Optional[Measure]:
         """Get measure by ID or name (case-insensitive matching)."""
-        id_or_name_lower = id_or_name.lower().strip()
-        for m in self.measures:
-            if m.id == id_or_name or m.name == id_or_name:
-                return m
-            # Case-insensitive fallback
-            if m.name.lower().strip() == id_or_name_lower:
-                return m
-        return None
+        return self._lookup("measures", id_or_name, fold=True)
     
     def get_calculated_field(self, id_or_name: str) -> Optional[CalculatedField]:
         """Get calculated field by ID or name."""
-        for c in self.calculated_fields:
-            if c.id == id_or_name or c.name == id_or_name:
-                return c
-        return None
+        return self._lookup("calculated_fields", id_or_name, fold=False)
     
     def get_time_dimensions(self) -> List[Dimension]:
         """Get all time-type dimensions."""
@@ -419,37 +676,39 @@ class SemanticModel:
         Returns:
             List of validation error messages
         """
-        errors = []
-        
-        # Check for duplicate names
-        dim_names = [d.name for d in self.dimensions]
-        measure_names = [m.name for m in self.measures]
-        calc_names = [c.name for c in self.calculated_fields]
+        return list(self._iter_errors())
+    
+    def _iter_errors(self) -> Iterator[str]:
+        """Yield validation errors in the order validate() reports them."""
+        # Check for duplicate names (one counting pass over all fields)
+        name_counts = Counter(d.name for d in self.dimensions)
+        name_counts.update(m.name for m in self.measures)
+        name_counts.update(c.name for c in self.calculated_fields)
         
-        all_names = dim_names + measure_names + calc_names
-        duplicates = [n for n in set(all_names) if all_names.count(n) > 1]
-        for dup in duplicates:
-            errors.append(f"Duplicate name: {dup}")
+        for name, count in name_counts.items():
+            if count > 1:
+                yield f"Duplicate name: {name}"
         
         # Validate calculated field references
-        valid_refs = set(dim_names + measure_names + calc_names)
+        valid_refs = name_counts.keys()
         for calc in self.calculated_fields:
             for ref in calc.referenced_fields:
                 if ref not in valid_refs:
-                    errors.append(f"Calculated field '{calc.name}' references unknown field: {ref}")
+                    yield f"Calculated field '{calc.name}' references unknown field: {ref}"
         
         # Validate hierarchy relationships
         dim_ids = {d.id for d in self.dimensions}
         for dim in self.dimensions:
             if dim.parent_dimension_id and dim.parent_dimension_id not in dim_ids:
-                errors.append(f"Dimension '{dim.name}' references unknown parent: {dim.parent_dimension_id}")
+                yield f"Dimension '{dim.name}' references unknown parent: {dim.parent_dimension_id}"
         
         # Validate time intelligence configurations
+        dim_keys = dim_ids | {d.name for d in self.dimensions}
+        dim_folded = {d.name.lower().strip() for d in self.dimensions}
         for ti in self.time_intelligence:
-            if not self.get_dimension(ti.dimension_id):
-                errors.append(f"Time intelligence references unknown dimension: {ti.dimension_id}")
-        
-        return errors
+            # Same match rules as get_dimension(), as set lookups
+            if ti.dimension_id not in dim_keys and ti.dimension_id.lower().strip() not in dim_folded:
+                yield f"Time intelligence references unknown dimension: {ti.dimension_id}"
 
 
 class SemanticModelManager:
@@ -457,6 +716,12 @@ class SemanticModelManager:
     Manages semantic model persistence.
     """
     
+    # Models kept in memory (pickled) by get()
+    CACHE_SIZE = 128
+    
+    # Stored as PRAGMA user_version once _init_db has migrated the database
+    SCHEMA_VERSION = 1
+    
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize manager.
@@ -471,11 +736,37 @@ class SemanticModelManager:
             db_path = str(db_dir / "semantic.db")
         
         self.db_path = db_path
+        # One connection shared by all calls; the lock serializes access to it
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        # Pickled models by id, tagged with the updated_at they were read at
+        self._cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for this single-writer store."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL is durable with NORMAL sync and skips an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection for one unit of work, committing on success."""
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS semantic_models (
                     id TEXT PRIMARY KEY,
@@ -493,7 +784,103 @@ class SemanticModelManager:
                 CREATE INDEX IF NOT EXISTS idx_semantic_source_id 
                 ON semantic_models(source_id)
             """)
-            conn.commit()
+            # List queries order by updated_at; these let SQLite walk rows
+            # in order instead of sorting them
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_semantic_source_updated
+                ON semantic_models(source_id, updated_at DESC)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_semantic_updated
+                ON semantic_models(updated_at DESC)
+            """)
+            # Normalized copies of the model's fields so listings and name
+            # lookups don't have to decode the JSON blob (which stays the
+            # source of truth for round-trips)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS semantic_dimensions (
+                    model_id TEXT NOT NULL REFERENCES semantic_models(id) ON DELETE CASCADE,
+                    id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    source_column TEXT,
+                    source_table TEXT,
+                    dimension_type TEXT,
+                    position INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS semantic_measures (
+                    model_id TEXT NOT NULL REFERENCES semantic_models(id) ON DELETE CASCADE,
+                    id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    expression TEXT,
+                    aggregation TEXT,
+                    source_table TEXT,
+                    position INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS semantic_calculated_fields (
+                    model_id TEXT NOT NULL REFERENCES semantic_models(id) ON DELETE CASCADE,
+                    id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    expression TEXT,
+                    result_type TEXT,
+                    position INTEGER NOT NULL
+                )
+            """)
+            for table in self._CHILD_TABLES:
+                conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_model_name
+                    ON {table}(model_id, name)
+                """)
+            
+            # Backfill rows for models stored before the child tables existed.
+            # Runs once per database: user_version records that it is done
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                stale = conn.execute("""
+                    SELECT data FROM semantic_models
+                    WHERE id NOT IN (SELECT model_id FROM semantic_dimensions)
+                      AND id NOT IN (SELECT model_id FROM semantic_measures)
+                      AND id NOT IN (SELECT model_id FROM semantic_calculated_fields)
+                """).fetchall()
+                for row in stale:
+                    self._write_children(conn, SemanticModel.from_dict(json_loads(row["data"])))
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+    
+    _CHILD_TABLES = ("semantic_dimensions", "semantic_measures", "semantic_calculated_fields")
+    
+    def _write_children(self, conn: sqlite3.Connection, model: SemanticModel) -> None:
+        """Replace a model's normalized field rows (inside the caller's transaction)."""
+        for table in self._CHILD_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE model_id = ?", (model.id,))
+        conn.executemany(
+            "INSERT INTO semantic_dimensions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (model.id, d.id, d.name, d.source_column, d.source_table, d.dimension_type.value, i)
+                for i, d in enumerate(model.dimensions)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO semantic_measures VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (model.id, m.id, m.name, m.expression, m.aggregation.value, m.source_table, i)
+                for i, m in enumerate(model.measures)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO semantic_calculated_fields VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (model.id, c.id, c.name, c.expression, c.result_type, i)
+                for i, c in enumerate(model.calculated_fields)
+            ],
+        )
+    
+    _INSERT_SQL = """
+        INSERT INTO semantic_models 
+        (id, name, source_id, erd_model_id, description, data, version, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
     
     def create(self, model: SemanticModel) -> SemanticModel:
         """Create a new semantic model."""
@@ -503,45 +890,73 @@ class SemanticModelManager:
         model.created_at = datetime.now(timezone.utc)
         model.updated_at = model.created_at
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO semantic_models 
-                (id, name, source_id, erd_model_id, description, data, version, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        with self._transaction() as conn:
+            self._cache.pop(model.id, None)
+            conn.execute(self._INSERT_SQL, (
                 model.id,
                 model.name,
                 model.source_id,
                 model.erd_model_id,
                 model.description,
-                json.dumps(model.to_dict()),
+                model.to_json(),
                 model.version,
                 model.created_at.isoformat(),
                 model.updated_at.isoformat(),
             ))
-            conn.commit()
+            self._write_children(conn, model)
         
         logger.info(f"Created semantic model: {model.id}")
         return model
     
     def get(self, model_id: str) -> Optional[SemanticModel]:
-        """Get semantic model by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        """
+        Get semantic model by ID.
+        
+        Recently read models are kept as pickled snapshots while their
+        stored updated_at is unchanged; unpickling one is much cheaper than
+        decoding the JSON again. Every call returns a fresh instance, so
+        unsaved edits to it never reach the cache.
+        
+        The freshness check reads only updated_at; the data column is
+        fetched on a cache miss or when the snapshot is stale.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT updated_at FROM semantic_models WHERE id = ?",
+                (model_id,)
+            ).fetchone()
+            
+            if not row:
+                self._cache.pop(model_id, None)
+                return None
+            
+            cached = self._cache.get(model_id)
+            if cached is not None and cached[0] == row["updated_at"]:
+                self._cache.move_to_end(model_id)
+                return pickle.loads(cached[1])
+            
             row = conn.execute(
-                "SELECT data FROM semantic_models WHERE id = ?",
+                "SELECT updated_at, data FROM semantic_models WHERE id = ?",
                 (model_id,)
             ).fetchone()
+            if not row:
+                self._cache.pop(model_id, None)
+                return None
+            
+            model = SemanticModel.from_dict(json_loads(row["data"]))
+            self._cache[model_id] = (row["updated_at"], pickle.dumps(model, pickle.HIGHEST_PROTOCOL))
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
         
-        if row:
-            return SemanticModel.from_dict(json.loads(row["data"]))
-        return None
+        return model
     
     def update(self, model: SemanticModel) -> SemanticModel:
         """Update an existing semantic model."""
         model.updated_at = datetime.now(timezone.utc)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
+            # Drop the cached snapshot; it is stale once this commits
+            self._cache.pop(model.id, None)
             conn.execute("""
                 UPDATE semantic_models 
                 SET name = ?, erd_model_id = ?, description = ?, data = ?, version = ?, updated_at = ?
@@ -550,24 +965,26 @@ class SemanticModelManager:
                 model.name,
                 model.erd_model_id,
                 model.description,
-                json.dumps(model.to_dict()),
+                model.to_json(),
                 model.version,
                 model.updated_at.isoformat(),
                 model.id,
             ))
-            conn.commit()
+            self._write_children(conn, model)
         
         logger.info(f"Updated semantic model: {model.id}")
         return model
     
     def delete(self, model_id: str) -> bool:
         """Delete a semantic model."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
+            self._cache.pop(model_id, None)
+            for table in self._CHILD_TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE model_id = ?", (model_id,))
             cursor = conn.execute(
                 "DELETE FROM semantic_models WHERE id = ?",
                 (model_id,)
             )
-            conn.commit()
             deleted = cursor.rowcount > 0
         
         if deleted:
@@ -576,24 +993,99 @@ class SemanticModelManager:
     
     def list_by_source(self, source_id: str) -> List[SemanticModel]:
         """List all semantic models for a source."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             rows = conn.execute(
                 "SELECT data FROM semantic_models WHERE source_id = ? ORDER BY updated_at DESC",
                 (source_id,)
             ).fetchall()
         
-        return [SemanticModel.from_dict(json.loads(row["data"])) for row in rows]
+        return [SemanticModel.from_dict(json_loads(row["data"])) for row in rows]
+    
+    def list_summaries(self, source_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List models without decoding their JSON payload.
+        
+        Returns the model columns plus field counts from the normalized
+        tables, for callers that don't need full SemanticModel objects.
+        """
+        sql = """
+            SELECT id, name, source_id, erd_model_id, description, version, created_at, updated_at,
+                   (SELECT COUNT(*) FROM semantic_dimensions d WHERE d.model_id = sm.id) AS dimension_count,
+                   (SELECT COUNT(*) FROM semantic_measures m WHERE m.model_id = sm.id) AS measure_count,
+                   (SELECT COUNT(*) FROM semantic_calculated_fields c WHERE c.model_id = sm.id) AS calculated_field_count
+            FROM semantic_models sm
+        """
+        params: tuple = ()
+        if source_id is not None:
+            sql += " WHERE source_id = ?"
+            params = (source_id,)
+        sql += " ORDER BY updated_at DESC"
+        
+        with self._transaction() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "sourceId": row["source_id"],
+                "erdModelId": row["erd_model_id"],
+                "description": row["description"],
+                "version": row["version"],
+                "createdAt": row["created_at"],
+                "updatedAt": row["updated_at"],
+                "dimensionCount": row["dimension_count"],
+                "measureCount": row["measure_count"],
+                "calculatedFieldCount": row["calculated_field_count"],
+            }
+            for row in rows
+        ]
+    
+    def list_field_names(self, source_id: str) -> List[Dict[str, str]]:
+        """
+        List the field names of every model for a source.
+        
+        Reads the normalized field tables, so no JSON blob is parsed.
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("""
+                SELECT sm.id AS model_id, 'dimension' AS field_type, f.name
+                FROM semantic_models sm JOIN semantic_dimensions f ON f.model_id = sm.id
+                WHERE sm.source_id = ?
+                UNION ALL
+                SELECT sm.id, 'measure', f.name
+                FROM semantic_models sm JOIN semantic_measures f ON f.model_id = sm.id
+                WHERE sm.source_id = ?
+                UNION ALL
+                SELECT sm.id, 'calculated', f.name
+                FROM semantic_models sm JOIN semantic_calculated_fields f ON f.model_id = sm.id
+                WHERE sm.source_id = ?
+            """, (source_id, source_id, source_id)).fetchall()
+        
+        return [
+            {"modelId": row["model_id"], "fieldType": row["field_type"], "name": row["name"]}
+            for row in rows
+        ]
     
     def list_all(self) -> List[SemanticModel]:
         """List all semantic models."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             rows = conn.execute(
                 "SELECT data FROM semantic_models ORDER BY updated_at DESC"
             ).fetchall()
         
-        return [SemanticModel.from_dict(json.loads(row["data"])) for row in rows]
+        return [SemanticModel.from_dict(json_loads(row["data"])) for row in rows]
+
+
+# String literal token types: keywords inside them are data, not SQL.
+# Quoted identifiers ([name], "name") are not included, so a keyword in a
+# field reference stays blocked as it is with the regex.
+_STRING_TOKENS = frozenset(
+    getattr(TokenType, name) for name in (
+        "STRING", "NATIONAL_STRING", "RAW_STRING", "BIT_STRING", "HEX_STRING",
+        "BYTE_STRING", "HEREDOC_STRING", "UNICODE_STRING",
+    ) if hasattr(TokenType, name)
+) if SQLGLOT_AVAILABLE else frozenset()
 
 
 class ExpressionValidator:
@@ -634,8 +1126,19 @@ class ExpressionValidator:
         r"--",  # SQL comments
         r"/\*",  # Block comments
         r";",   # Statement separator
+        r"#",   # MySQL comments
     ]
     
+    # All blocked patterns fused into one alternation; group gN is BLOCKED_PATTERNS[N].
+    # Compiled with RE2 (linear-time DFA) when google-re2 is installed.
+    _BLOCKED_RE = (re2 if RE2_AVAILABLE else re).compile(
+        "(?i)" + "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(BLOCKED_PATTERNS))
+    )
+    # Indexes of the keyword patterns, the only hits the tokenizer may drop
+    _KEYWORD_PATTERNS = frozenset(i for i, p in enumerate(BLOCKED_PATTERNS) if p.startswith(r"\b"))
+    _FUNC_RE = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+    _BRACKET_RE = re.compile(r"\[([^\]]+)\]")
+    
     @classmethod
     def validate(cls, expression: str) -> tuple[bool, List[str]]:
         """
@@ -647,20 +1150,23 @@ class ExpressionValidator:
         Returns:
             (is_valid, list of error messages)
         """
-        errors = []
-        
         # Strip whitespace
         expression = expression.strip()
+        return cls._check(expression, cls._blocked_patterns(expression))
+    
+    @classmethod
+    def _check(cls, expression: str, blocked: Set[int]) -> Tuple[bool, List[str]]:
+        """Validate a stripped expression whose blocked-pattern hits are known."""
+        errors = []
         
         # Empty expression is invalid
         if not expression:
             errors.append("Expression cannot be empty")
             return False, errors
         
-        # Check for blocked patterns
-        for pattern in cls.BLOCKED_PATTERNS:
-            if re.search(pattern, expression, re.IGNORECASE):
-                errors.append(f"Blocked pattern detected: {pattern}")
+        # Report blocked patterns in pattern order
+        for i in sorted(blocked):
+            errors.append(f"Blocked pattern detected: {cls.BLOCKED_PATTERNS[i]}")
         
         # Check bracket balance
         open_parens = expression.count("(")
@@ -669,15 +1175,14 @@ class ExpressionValidator:
             errors.append(f"Unbalanced parentheses: {open_parens} open, {close_parens} close")
         
         # Check bracket references [field_name]
-        bracket_refs = re.findall(r"\[([^\]]+)\]", expression)
+        bracket_refs = cls._BRACKET_RE.findall(expression)
         # These will be validated against actual fields later
         
         # Check for unknown functions (handle both uppercase and lowercase)
         # Pattern matches function names (letters, numbers, underscores) followed by opening parenthesis
         # Only check if expression contains function calls (has parentheses)
         if "(" in expression:
-            func_pattern = r"\b([A-Za-z_][A-Za-z0-9_]*)\s*\("
-            functions_used = re.findall(func_pattern, expression)
+            functions_used = cls._FUNC_RE.findall(expression)
             for func in functions_used:
                 func_upper = func.upper()
                 if func_upper not in cls.ALLOWED_FUNCTIONS:
@@ -688,6 +1193,39 @@ class ExpressionValidator:
         
         return len(errors) == 0, errors
     
+    @classmethod
+    def _blocked_patterns(cls, expression: str) -> Set[int]:
+        """Indexes into BLOCKED_PATTERNS that occur in ``expression``."""
+        hits = {int(m.lastgroup[1:]) for m in cls._BLOCKED_RE.finditer(expression)}
+        return cls._drop_literal_keywords(expression, hits)
+    
+    @classmethod
+    def _drop_literal_keywords(cls, expression: str, hits: Set[int]) -> Set[int]:
+        """
+        Drop keyword hits that only occur inside string literals.
+        
+        Separators and comment markers always come from the raw-text regex:
+        a lexer for one dialect can read them as string contents that
+        another dialect executes (e.g. MySQL's ``#`` comments). Keyword
+        hits are re-checked with one sqlglot lexer pass when available.
+        """
+        if not SQLGLOT_AVAILABLE or not hits & cls._KEYWORD_PATTERNS:
+            return hits
+        # MySQL reads backslash escapes in literals and SQLite does not, so
+        # with one present the literal boundaries depend on the dialect
+        if "\\" in expression:
+            return hits
+        try:
+            tokens = sqlglot.tokenize(expression, read="sqlite")
+        except TokenError:
+            return hits
+        
+        keywords: Set[int] = set()
+        for tok in tokens:
+            if tok.token_type not in _STRING_TOKENS:
+                keywords.update(int(m.lastgroup[1:]) for m in cls._BLOCKED_RE.finditer(tok.text))
+        return (hits - cls._KEYWORD_PATTERNS) | (keywords & cls._KEYWORD_PATTERNS)
+    
     @classmethod
     def extract_field_references(cls, expression: str) -> List[str]:
         """
@@ -698,7 +1236,7 @@ class ExpressionValidator:
         Returns:
             List of field names referenced
         """
-        return re.findall(r"\[([^\]]+)\]", expression)
+        return cls._BRACKET_RE.findall(expression)
     
     @classmethod
     def substitute_fields(
@@ -716,8 +1254,18 @@ class ExpressionValidator:
         Returns:
             Expression with substituted values
         """
-        result = expression
-        for field_name, sql_expr in field_map.items():
-            result = result.replace(f"[{field_name}]", f"({sql_expr})")
-        return result
-
+        # Each [name] token is replaced whole, so [Revenue] can never clobber
+        # part of [Revenue Growth]. Substituted expressions are expanded in
+        # turn (calculated fields built on other calculated fields); a name
+        # already being expanded is left as-is, so reference cycles end.
+        def expand(text: str, active: FrozenSet[str]) -> str:
+            def replace(match: "re.Match[str]") -> str:
+                name = match.group(1)
+                sql_expr = field_map.get(name)
+                if sql_expr is None or name in active:
+                    return match.group(0)
+                return f"({expand(sql_expr, active | {name})})"
+            
+            return cls._BRACKET_RE.sub(replace, text)
+        
+        return expand(expression, frozenset())
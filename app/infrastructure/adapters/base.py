@@ -14,9 +14,12 @@ DESIGN PRINCIPLES:
 """
 
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -69,6 +72,42 @@ class AdapterResult:
         self.row_count = len(self.rows)
 
 
+class ConnectionPool:
+    """
+    Bounded set of sessions that concurrent callers borrow from.
+    
+    Adapters backed by a driver-level pool are safe to call from several
+    threads; this wrapper caps how many do so at once so parallel work
+    (e.g. introspecting many tables) blocks instead of exhausting the
+    driver pool.
+    
+    Usage:
+        with pool.acquire() as conn:
+            conn.execute("SELECT 1")
+    """
+    
+    def __init__(self, adapter: "BaseAdapter", size: Optional[int] = None):
+        self.adapter = adapter
+        self.size = max(1, size or min(4, os.cpu_count() or 1))
+        self._slots = threading.BoundedSemaphore(self.size)
+    
+    @contextmanager
+    def acquire(self) -> Iterator["BaseAdapter"]:
+        """Borrow a session, blocking until one is free."""
+        self._slots.acquire()
+        try:
+            yield self.adapter
+        finally:
+            self._slots.release()
+
+
+class SingleConnPool(ConnectionPool):
+    """Pool over an adapter holding one connection: callers are serialized."""
+    
+    def __init__(self, adapter: "BaseAdapter"):
+        super().__init__(adapter, size=1)
+
+
 class BaseAdapter(ABC):
     """
     Abstract base class for database adapters.
@@ -98,6 +137,11 @@ class BaseAdapter(ABC):
     # Placeholder format used by this engine
     PLACEHOLDER: str = "?"
     
+    # Whether execute() checks a connection out of a driver-level pool
+    # (``self._pool``) per call, so several threads may call it at once.
+    # Adapters that run every query on one shared connection leave this off.
+    POOLED_EXECUTE: bool = False
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize adapter with connection configuration.
@@ -110,6 +154,7 @@ class BaseAdapter(ABC):
         self._connection = None
         self._connected = False
         self._last_used = None
+        self._session_pool: Optional[ConnectionPool] = None
     
     @abstractmethod
     def connect(self) -> None:
@@ -176,6 +221,25 @@ class BaseAdapter(ABC):
         """
         return sql, params or []
     
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        """
+        Session pool for concurrent callers.
+        
+        Returns None unless the adapter opts in with ``POOLED_EXECUTE`` and
+        its driver-level pool is open; a single connection must not be
+        shared across threads.
+        """
+        if not self.POOLED_EXECUTE or getattr(self, "_pool", None) is None:
+            return None
+        if getattr(self, "_session_pool", None) is None:
+            driver_size = getattr(self, "pool_size", None)
+            size = min(4, os.cpu_count() or 1)
+            if driver_size:
+                size = min(size, driver_size)
+            self._session_pool = ConnectionPool(self, size=size)
+        return self._session_pool
+    
     def is_connected(self) -> bool:
         """Check if adapter has an active connection."""
         return self._connected
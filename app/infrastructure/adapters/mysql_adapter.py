@@ -92,6 +92,7 @@ class MySQLAdapter(BaseAdapter):
     
     ENGINE = "mysql"
     PLACEHOLDER = "%s"  # MySQL uses %s for parameters
+    POOLED_EXECUTE = True  # execute() borrows from the driver pool per call
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize MySQL adapter."""
@@ -56,6 +56,7 @@ class PostgresAdapter(BaseAdapter):
     
     ENGINE = "postgres"
     PLACEHOLDER = "%s"  # PostgreSQL uses %s for parameters
+    POOLED_EXECUTE = True  # execute() borrows from the driver pool per call
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize PostgreSQL adapter."""
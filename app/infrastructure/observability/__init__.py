@@ -11,7 +11,8 @@ from app.infrastructure.observability.analytics import (
     ObservabilityConfig,
     init_observability,
     get_analytics,
-    load_config_from_env
+    load_config_from_env,
+    refresh_observability_config
 )
 
 __all__ = [
@@ -20,5 +21,6 @@ __all__ = [
     "ObservabilityConfig",
     "init_observability",
     "get_analytics",
-    "load_config_from_env"
+    "load_config_from_env",
+    "refresh_observability_config"
 ]
@@ -17,23 +17,52 @@ Features:
 """
 
 import os
+import re
 import time
 import json
+import random
 import logging
+import heapq
+import queue
+import atexit
 import hashlib
 import threading
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable
-from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass, field, asdict
-from collections import defaultdict
-from functools import wraps
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple
+from datetime import datetime, timezone
+from dataclasses import field, fields
+from collections import Counter, defaultdict, deque
+from functools import lru_cache, wraps
+from itertools import accumulate, chain, count
+from operator import itemgetter
+from array import array
+from bisect import bisect_left
 from contextlib import contextmanager
+from secrets import token_hex
 
 from pydantic import BaseModel, Field
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from app.shared.utils.slots import slotted_dataclass
+
 logger = logging.getLogger(__name__)
 
+# Bound once for the per-query/per-trace sampling checks
+_rand = random.random
+
 
 # =============================================================================
 # Configuration
@@ -71,7 +100,7 @@ class ObservabilityConfig(BaseModel):
 # Query Analytics
 # =============================================================================
 
-@dataclass
+@slotted_dataclass
 class QueryRecord:
     """Record of a query execution."""
     
@@ -99,6 +128,144 @@ class QueryRecord:
     success: bool = True
     error_code: Optional[str] = None
     error_message: Optional[str] = None
+    
+    # Epoch nanoseconds of timestamp, used for bucketing and retention
+    timestamp_ns: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        timestamp = self.timestamp
+        if timestamp.tzinfo is None:
+            # Naive timestamps are UTC, as the retention cutoff always assumed
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        self.timestamp_ns = round(timestamp.timestamp() * 1_000_000) * 1000
+
+
+# Records buffered before their aggregates are folded into the stats
+STATS_BATCH_SIZE = 1024
+# Max query records per DuckDB insert from the storage writer thread
+STORAGE_BATCH_SIZE = 256
+
+
+def _new_stats() -> Dict[str, Any]:
+    """Empty in-memory aggregate statistics."""
+    return {
+        "total_queries": 0,
+        "total_errors": 0,
+        "total_duration_ms": 0,
+        "total_rows": 0,
+        "cache_hits": 0,
+        # Per dataset/hour/tenant aggregates as flat key -> number dicts;
+        # _grouped() rebuilds the {"count", "duration_ms", "errors"} view.
+        # Dataset and tenant names are stored as small int codes (_key_code)
+        "key_codes": {},
+        "key_names": [],
+        "dataset_count": defaultdict(int),
+        "dataset_duration_ms": defaultdict(float),
+        "dataset_errors": defaultdict(int),
+        # Hour aggregates are keyed by hour bucket (hours since the epoch)
+        "hour_count": defaultdict(int),
+        "hour_duration_ms": defaultdict(float),
+        "hour_errors": defaultdict(int),
+        "tenant_count": defaultdict(int),
+        "tenant_duration_ms": defaultdict(float),
+        # Min-heap of (duration_ms, seq, entry) for the slowest queries;
+        # durations at or below slow_cutoff cannot enter it (see _track_slow)
+        "slow_queries": [],
+        "slow_cutoff": SLOW_QUERY_MS,
+        "popular_dimensions": defaultdict(int),
+        "popular_metrics": defaultdict(int),
+    }
+
+
+# Slow-query tracking: queries over SLOW_QUERY_MS, keeping the SLOW_QUERY_LIMIT slowest
+SLOW_QUERY_MS = 1000
+SLOW_QUERY_LIMIT = 10
+# Tie-breaker so heap entries never compare their dicts
+_slow_seq = count()
+
+_by_count = itemgetter(1)
+
+
+def _top(counts: Dict[str, int], n: int = 20) -> Dict[str, int]:
+    """The n highest counts, largest first."""
+    return dict(heapq.nlargest(n, counts.items(), key=_by_count))
+
+
+def _track_slow(stats: Dict[str, Any], record: "QueryRecord") -> None:
+    """
+    Add a record slower than stats["slow_cutoff"] to the slow-query heap.
+    
+    Once the heap is full the cut-off rises to its fastest entry, so callers
+    filter with a single comparison and never offer a record that would be
+    discarded.
+    """
+    heap = stats["slow_queries"]
+    entry = (record.duration_ms, next(_slow_seq), {
+        "query_id": record.query_id,
+        "dataset": record.dataset,
+        "duration_ms": record.duration_ms,
+        "timestamp": record.timestamp.isoformat(),
+    })
+    if len(heap) < SLOW_QUERY_LIMIT:
+        heapq.heappush(heap, entry)
+    else:
+        heapq.heapreplace(heap, entry)
+    if len(heap) >= SLOW_QUERY_LIMIT:
+        stats["slow_cutoff"] = heap[0][0]
+
+
+def _slowest(heap: List[Any]) -> List[Dict[str, Any]]:
+    """Slow-query entries, slowest first."""
+    return [entry for _, _, entry in sorted(heap, reverse=True)]
+
+
+def _key_code(stats: Dict[str, Any], name: str) -> int:
+    """Int code standing in for a dataset or tenant name in the stats dicts."""
+    codes = stats["key_codes"]
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(stats["key_names"])
+        stats["key_names"].append(name)
+    return code
+
+
+def _grouped(stats: Dict[str, Any], group: str) -> Dict[str, Dict[str, Any]]:
+    """Nested per-name view of a coded group's flat aggregates (group="dataset" or "tenant")."""
+    names = stats["key_names"]
+    durations = stats[f"{group}_duration_ms"]
+    errors = stats.get(f"{group}_errors")
+    grouped = {}
+    for code, count in stats[f"{group}_count"].items():
+        entry = {"count": count, "duration_ms": durations[code]}
+        if errors is not None:
+            entry["errors"] = errors.get(code, 0)
+        grouped[names[code]] = entry
+    return grouped
+
+
+HOUR_NS = 3_600_000_000_000
+
+
+def _current_hour() -> int:
+    """Hour bucket (hours since the epoch) of the current time."""
+    return time.time_ns() // HOUR_NS
+
+
+@lru_cache(maxsize=256)
+def _hour_label(bucket: int) -> str:
+    """Hourly stats key ("%Y-%m-%d-%H", UTC) for an hour bucket."""
+    return datetime.fromtimestamp(bucket * 3600, tz=timezone.utc).strftime("%Y-%m-%d-%H")
+
+
+def _group_codes(keys: List[Any]):
+    """Distinct keys in first-seen order plus each key's position among them."""
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(key, len(index)) for key in keys),
+        dtype=np.intp,
+        count=len(keys)
+    )
+    return list(index), codes
 
 
 class QueryAnalytics:
@@ -107,6 +274,13 @@ class QueryAnalytics:
     def __init__(self, config: ObservabilityConfig):
         self.config = config
         self._lock = threading.Lock()
+        # Records not yet folded into _stats (see _flush_stats)
+        self._pending_stats: List[QueryRecord] = []
+        # Rows waiting for the storage writer thread; _storage_lock is held
+        # while a batch is taken off the queue and written
+        self._storage_q: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._storage_lock = threading.Lock()
+        self._storage_thread: Optional[threading.Thread] = None
         
         # Use DuckDB state storage instead of in-memory
         try:
@@ -118,20 +292,17 @@ class QueryAnalytics:
             self._storage = None
             self._use_storage = False
             # Fallback to in-memory for backward compatibility
-            self._records: List[QueryRecord] = []
-            self._stats = {
-                "total_queries": 0,
-                "total_errors": 0,
-                "total_duration_ms": 0,
-                "total_rows": 0,
-                "cache_hits": 0,
-                "by_dataset": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                "by_hour": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                "by_tenant": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                "slow_queries": [],
-                "popular_dimensions": defaultdict(int),
-                "popular_metrics": defaultdict(int),
-            }
+            self._records: Deque[QueryRecord] = deque()
+            self._stats = _new_stats()
+        
+        if self._use_storage:
+            # DuckDB inserts happen on a background thread so record_query()
+            # never waits on the database
+            self._last_cleanup = time.monotonic()
+            self._storage_thread = threading.Thread(
+                target=self._storage_writer_loop, name="analytics-storage-writer", daemon=True
+            )
+            self._storage_thread.start()
     
     def record_query(self, record: QueryRecord) -> None:
         """Record a query execution."""
@@ -141,131 +312,206 @@ class QueryAnalytics:
         
         # Apply sampling
         if self.config.analytics_sample_rate < 1.0:
-            import random
-            if random.random() > self.config.analytics_sample_rate:
+            if _rand() > self.config.analytics_sample_rate:
                 logger.debug(f"Query skipped due to sampling (rate={self.config.analytics_sample_rate})")
                 return
         
-        if self._use_storage and self._storage:
-            # Store in DuckDB
-            try:
-                record_dict = {
-                    "query_id": record.query_id,
-                    "timestamp": record.timestamp,
-                    "dataset": record.dataset,
-                    "tenant_id": record.tenant_id,
-                    "dimensions": record.dimensions,
-                    "metrics": record.metrics,
-                    "filters": record.filters,
-                    "duration_ms": record.duration_ms,
-                    "rows_returned": record.rows_returned,
-                    "bytes_scanned": record.bytes_scanned,
-                    "cache_hit": record.cache_hit,
-                    "success": record.success,
-                    "error_code": record.error_code,
-                    "error_message": record.error_message,
-                    "api_key_hash": record.api_key_hash,
-                    "user_id": record.user_id,
-                    "source_ip": record.source_ip,
-                    "user_agent": record.user_agent,
-                }
-                self._storage.record_query(record_dict)
-                logger.debug(f"Query recorded in DuckDB: {record.query_id}, dataset={record.dataset}")
-                
-                # Also update in-memory stats as backup (for get_hourly_stats fallback)
-                with self._lock:
-                    if not hasattr(self, '_stats'):
-                        from collections import defaultdict
-                        self._stats = {
-                            "total_queries": 0,
-                            "total_errors": 0,
-                            "total_duration_ms": 0,
-                            "total_rows": 0,
-                            "cache_hits": 0,
-                            "by_dataset": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                            "by_hour": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                            "by_tenant": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                            "slow_queries": [],
-                            "popular_dimensions": defaultdict(int),
-                            "popular_metrics": defaultdict(int),
-                        }
-                    if not hasattr(self, '_records'):
-                        self._records = []
-                    self._records.append(record)
-                    self._update_stats(record)
-                
-                # Periodic cleanup
-                if hasattr(self, '_last_cleanup'):
-                    if (datetime.now() - self._last_cleanup).total_seconds() > 3600:  # Every hour
-                        self._storage.cleanup_old_records(self.config.analytics_retention_hours)
-                        self._last_cleanup = datetime.now()
-                else:
-                    self._last_cleanup = datetime.now()
-            except Exception as e:
-                logger.error(f"Failed to store query in DuckDB, using fallback: {e}", exc_info=True)
-                # Fallback to in-memory
-                with self._lock:
-                    if not hasattr(self, '_records'):
-                        self._records = []
-                    if not hasattr(self, '_stats'):
-                        from collections import defaultdict
-                        self._stats = {
-                            "total_queries": 0,
-                            "total_errors": 0,
-                            "total_duration_ms": 0,
-                            "total_rows": 0,
-                            "cache_hits": 0,
-                            "by_dataset": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                            "by_hour": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                            "by_tenant": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                            "slow_queries": [],
-                            "popular_dimensions": defaultdict(int),
-                            "popular_metrics": defaultdict(int),
-                        }
-                    self._records.append(record)
-                    self._update_stats(record)
+        if self._storage_thread is not None:
+            # Queued for DuckDB; written in batches by _storage_writer_loop
+            self._storage_q.put({
+                "query_id": record.query_id,
+                "timestamp": record.timestamp,
+                "dataset": record.dataset,
+                "tenant_id": record.tenant_id,
+                "dimensions": record.dimensions,
+                "metrics": record.metrics,
+                "filters": record.filters,
+                "duration_ms": record.duration_ms,
+                "rows_returned": record.rows_returned,
+                "bytes_scanned": record.bytes_scanned,
+                "cache_hit": record.cache_hit,
+                "success": record.success,
+                "error_code": record.error_code,
+                "error_message": record.error_message,
+                "api_key_hash": record.api_key_hash,
+                "user_id": record.user_id,
+                "source_ip": record.source_ip,
+                "user_agent": record.user_agent,
+            })
+            logger.debug(f"Query queued for DuckDB: {record.query_id}, dataset={record.dataset}")
         else:
-            # Fallback to in-memory
             logger.debug(f"Using in-memory storage (use_storage={self._use_storage}, storage={self._storage})")
-            with self._lock:
-                if not hasattr(self, '_records'):
-                    self._records = []
-                if not hasattr(self, '_stats'):
-                    from collections import defaultdict
-                    self._stats = {
-                        "total_queries": 0,
-                        "total_errors": 0,
-                        "total_duration_ms": 0,
-                        "total_rows": 0,
-                        "cache_hits": 0,
-                        "by_dataset": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                        "by_hour": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                        "by_tenant": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                        "slow_queries": [],
-                        "popular_dimensions": defaultdict(int),
-                        "popular_metrics": defaultdict(int),
-                    }
-                self._records.append(record)
+        
+        # In-memory stats: primary without storage, and the backup for the
+        # get_hourly_stats fallback with it
+        with self._lock:
+            if not hasattr(self, '_records'):
+                self._records = deque()
+            if not hasattr(self, '_stats'):
+                self._stats = _new_stats()
+            self._append_record(record)
+            self._buffer_stats(record)
+    
+    def _storage_writer_loop(self) -> None:
+        """Write queued records to DuckDB, batching whatever is pending."""
+        get = self._storage_q.get
+        while True:
+            row = get()
+            if row is None:
+                break
+            with self._storage_lock:
+                running = self._write_storage_batch([row])
+            if not running:
+                break
+    
+    def _write_storage_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Top up batch from the queue and write it. Caller holds _storage_lock.
+        
+        Returns False once the close() sentinel has been taken off the queue.
+        """
+        running = True
+        get_nowait = self._storage_q.get_nowait
+        while len(batch) < STORAGE_BATCH_SIZE:
+            try:
+                row = get_nowait()
+            except queue.Empty:
+                break
+            if row is None:
+                running = False
+                break
+            batch.append(row)
+        if not batch:
+            return running
+        try:
+            self._storage.record_queries(batch)
+        except Exception as e:
+            # Retry row by row (inserts are upserts) so one bad row loses only itself
+            logger.warning(f"Batch insert of {len(batch)} queries failed, retrying individually: {e}")
+            for row in batch:
+                try:
+                    self._storage.record_query(row)
+                except Exception as e:
+                    logger.error(f"Failed to store query in DuckDB: {e}", exc_info=True)
+        if time.monotonic() - self._last_cleanup > 3600:  # Every hour
+            try:
+                self._storage.cleanup_old_records(self.config.analytics_retention_hours)
+            except Exception as e:
+                logger.error(f"Failed to clean up old query records: {e}", exc_info=True)
+            self._last_cleanup = time.monotonic()
+        return running
+    
+    def _flush_storage(self) -> None:
+        """Write queued records now so storage reads include them."""
+        if self._storage_thread is None:
+            return
+        with self._storage_lock:
+            while not self._storage_q.empty():
+                if not self._write_storage_batch([]):
+                    # Leave the close() sentinel for the writer thread
+                    self._storage_q.put(None)
+                    break
+    
+    def close(self) -> None:
+        """Write out queued records and stop the storage writer."""
+        thread, self._storage_thread = self._storage_thread, None
+        if thread is None:
+            return
+        self._storage_q.put(None)
+        thread.join()
+    
+    def _buffer_stats(self, record: QueryRecord) -> None:
+        """Queue a record for aggregation. Caller holds the lock."""
+        self._pending_stats.append(record)
+        if len(self._pending_stats) >= STATS_BATCH_SIZE:
+            self._flush_stats()
+    
+    def _flush_stats(self) -> None:
+        """Fold buffered records into _stats. Caller holds the lock."""
+        pending = self._pending_stats
+        if not pending:
+            return
+        self._pending_stats = []
+        if not NUMPY_AVAILABLE:
+            for record in pending:
                 self._update_stats(record)
-                self._cleanup_old_records()
+            return
+        self._update_stats_batch(pending)
+    
+    def _update_stats_batch(self, records: List[QueryRecord]) -> None:
+        """
+        Vectorized _update_stats for a batch of records.
+        
+        Record fields become NumPy columns and the per-dataset/hour/tenant
+        sums are np.bincount over categorical codes, so the Python-level
+        work per record is a few attribute reads.
+        """
+        if not hasattr(self, '_stats') or not self._stats:
+            self._stats = _new_stats()
+        stats = self._stats
+        n = len(records)
+        
+        duration = np.fromiter((r.duration_ms for r in records), dtype=np.float64, count=n)
+        rows = np.fromiter((r.rows_returned for r in records), dtype=np.int64, count=n)
+        failed = np.fromiter((not r.success for r in records), dtype=bool, count=n)
+        cached = np.fromiter((r.cache_hit for r in records), dtype=bool, count=n)
+        
+        stats["total_queries"] += n
+        stats["total_duration_ms"] += float(duration.sum())
+        stats["total_rows"] += int(rows.sum())
+        stats["total_errors"] += int(failed.sum())
+        stats["cache_hits"] += int(cached.sum())
+        
+        def fold(group, keys, duration, failed, coded=True):
+            uniques, codes = _group_codes(keys)
+            if coded:
+                uniques = [_key_code(stats, key) for key in uniques]
+            size = len(uniques)
+            counts = np.bincount(codes, minlength=size)
+            durations = np.bincount(codes, weights=duration, minlength=size)
+            target_count = stats[f"{group}_count"]
+            target_duration = stats[f"{group}_duration_ms"]
+            for i, key in enumerate(uniques):
+                target_count[key] += int(counts[i])
+                target_duration[key] += float(durations[i])
+            target_errors = stats.get(f"{group}_errors")
+            if target_errors is not None and failed.any():
+                error_counts = np.bincount(codes, weights=failed, minlength=size)
+                for i in np.flatnonzero(error_counts):
+                    target_errors[uniques[i]] += int(error_counts[i])
+        
+        fold("dataset", [r.dataset for r in records], duration, failed)
+        fold("hour", [r.timestamp_ns // HOUR_NS for r in records], duration, failed, coded=False)
+        tenant_rows = [i for i, r in enumerate(records) if r.tenant_id]
+        if tenant_rows:
+            fold(
+                "tenant",
+                [records[i].tenant_id for i in tenant_rows],
+                duration[tenant_rows],
+                failed[tenant_rows]
+            )
+        
+        # Popular dimensions/metrics
+        for counts, names in (
+            (stats["popular_dimensions"], Counter(chain.from_iterable(r.dimensions for r in records))),
+            (stats["popular_metrics"], Counter(chain.from_iterable(r.metrics for r in records))),
+        ):
+            for name, count in names.items():
+                counts[name] += count
+        
+        # Slow queries: only the batch's SLOW_QUERY_LIMIT slowest can qualify
+        slow = np.flatnonzero(duration > stats["slow_cutoff"])
+        if slow.size > SLOW_QUERY_LIMIT:
+            slow = slow[np.argpartition(duration[slow], -SLOW_QUERY_LIMIT)[-SLOW_QUERY_LIMIT:]]
+        for i in slow:
+            if records[i].duration_ms > stats["slow_cutoff"]:
+                _track_slow(stats, records[i])
     
     def _update_stats(self, record: QueryRecord) -> None:
         """Update aggregated statistics."""
         # Ensure _stats is initialized
         if not hasattr(self, '_stats') or not self._stats:
-            self._stats = {
-                "total_queries": 0,
-                "total_duration_ms": 0,
-                "total_rows": 0,
-                "total_errors": 0,
-                "cache_hits": 0,
-                "by_dataset": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                "by_hour": defaultdict(lambda: {"count": 0, "duration_ms": 0, "errors": 0}),
-                "by_tenant": defaultdict(lambda: {"count": 0, "duration_ms": 0}),
-                "slow_queries": [],
-                "popular_dimensions": defaultdict(int),
-                "popular_metrics": defaultdict(int),
-            }
+            self._stats = _new_stats()
         self._stats["total_queries"] += 1
         self._stats["total_duration_ms"] += record.duration_ms
         self._stats["total_rows"] += record.rows_returned
@@ -277,28 +523,24 @@ class QueryAnalytics:
             self._stats["cache_hits"] += 1
         
         # By dataset
-        ds_stats = self._stats["by_dataset"][record.dataset]
-        ds_stats["count"] += 1
-        ds_stats["duration_ms"] += record.duration_ms
+        dataset = _key_code(self._stats, record.dataset)
+        self._stats["dataset_count"][dataset] += 1
+        self._stats["dataset_duration_ms"][dataset] += record.duration_ms
         if not record.success:
-            ds_stats["errors"] += 1
+            self._stats["dataset_errors"][dataset] += 1
         
-        # By hour - ensure timestamp is timezone-aware
-        ts = record.timestamp
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=timezone.utc)
-        hour_key = ts.strftime("%Y-%m-%d-%H")
-        hour_stats = self._stats["by_hour"][hour_key]
-        hour_stats["count"] += 1
-        hour_stats["duration_ms"] += record.duration_ms
+        # By hour
+        hour_key = record.timestamp_ns // HOUR_NS
+        self._stats["hour_count"][hour_key] += 1
+        self._stats["hour_duration_ms"][hour_key] += record.duration_ms
         if not record.success:
-            hour_stats["errors"] = hour_stats.get("errors", 0) + 1
+            self._stats["hour_errors"][hour_key] += 1
         
         # By tenant
         if record.tenant_id:
-            tenant_stats = self._stats["by_tenant"][record.tenant_id]
-            tenant_stats["count"] += 1
-            tenant_stats["duration_ms"] += record.duration_ms
+            tenant = _key_code(self._stats, record.tenant_id)
+            self._stats["tenant_count"][tenant] += 1
+            self._stats["tenant_duration_ms"][tenant] += record.duration_ms
         
         # Popular dimensions/metrics
         for dim in record.dimensions:
@@ -307,36 +549,35 @@ class QueryAnalytics:
             self._stats["popular_metrics"][met] += 1
         
         # Slow queries (keep top 10)
-        if record.duration_ms > 1000:  # > 1 second
-            self._stats["slow_queries"].append({
-                "query_id": record.query_id,
-                "dataset": record.dataset,
-                "duration_ms": record.duration_ms,
-                "timestamp": record.timestamp.isoformat(),
-            })
-            self._stats["slow_queries"] = sorted(
-                self._stats["slow_queries"],
-                key=lambda x: x["duration_ms"],
-                reverse=True
-            )[:10]
+        if record.duration_ms > self._stats["slow_cutoff"]:
+            _track_slow(self._stats, record)
+    
+    def _append_record(self, record: QueryRecord) -> None:
+        """Retain a record and evict expired ones. Caller holds the lock."""
+        records = self._records
+        if records and record.timestamp_ns < records[-1].timestamp_ns:
+            # Late arrival: insert it in timestamp order so the oldest record
+            # is always at the front
+            position = len(records) - 1
+            while position and records[position - 1].timestamp_ns > record.timestamp_ns:
+                position -= 1
+            records.insert(position, record)
+        else:
+            records.append(record)
+        self._cleanup_old_records()
     
     def _cleanup_old_records(self) -> None:
         """Remove records older than retention period."""
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.config.analytics_retention_hours)
-        # Ensure both timestamps are timezone-aware for comparison
-        filtered = []
-        for r in self._records:
-            # Make timestamp timezone-aware if it's not
-            ts = r.timestamp
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            if ts > cutoff:
-                filtered.append(r)
-        self._records = filtered
+        cutoff_ns = time.time_ns() - int(self.config.analytics_retention_hours * HOUR_NS)
+        # Records are kept in timestamp order, so expired ones are at the front
+        records = self._records
+        while records and records[0].timestamp_ns <= cutoff_ns:
+            records.popleft()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get aggregated statistics."""
         if self._use_storage and self._storage:
+            self._flush_storage()
             # Get from DuckDB
             try:
                 overall_stats = self._storage.get_overall_stats()
@@ -362,16 +603,8 @@ class QueryAnalytics:
                         "errors": ds["errors"]
                     } for ds in dataset_stats},
                     "slow_queries": slow_queries,
-                    "popular_dimensions": dict(sorted(
-                        popular_dimensions.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:20]),
-                    "popular_metrics": dict(sorted(
-                        popular_metrics.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:20]),
+                    "popular_dimensions": _top(popular_dimensions),
+                    "popular_metrics": _top(popular_metrics),
                 }
             except Exception as e:
                 logger.warning(f"Failed to get stats from DuckDB: {e}")
@@ -380,6 +613,7 @@ class QueryAnalytics:
         
         # Fallback to in-memory stats
         with self._lock:
+            self._flush_stats()
             if not hasattr(self, '_stats'):
                 return {
                     "total_queries": 0,
@@ -402,29 +636,23 @@ class QueryAnalytics:
                 "avg_duration_ms": self._stats["total_duration_ms"] / total if total > 0 else 0,
                 "avg_rows": self._stats["total_rows"] / total if total > 0 else 0,
                 "cache_hit_rate": self._stats["cache_hits"] / total if total > 0 else 0,
-                "by_dataset": dict(self._stats["by_dataset"]),
-                "slow_queries": self._stats["slow_queries"],
-                "popular_dimensions": dict(sorted(
-                    self._stats["popular_dimensions"].items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:20]),
-                "popular_metrics": dict(sorted(
-                    self._stats["popular_metrics"].items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:20]),
+                "by_dataset": _grouped(self._stats, "dataset"),
+                "slow_queries": _slowest(self._stats["slow_queries"]),
+                "popular_dimensions": _top(self._stats["popular_dimensions"]),
+                "popular_metrics": _top(self._stats["popular_metrics"]),
             }
     
     def get_hourly_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get hourly statistics for the last N hours."""
         if self._use_storage and self._storage:
+            self._flush_storage()
             # Get from DuckDB
             try:
                 duckdb_stats = self._storage.get_hourly_stats(hours=hours)
                 # Merge with in-memory stats to ensure we have the latest data
                 # (DuckDB might not have committed recent queries yet)
                 with self._lock:
+                    self._flush_stats()
                     # Build DuckDB map
                     duckdb_map = {}
                     for stat in duckdb_stats:
@@ -434,17 +662,17 @@ class QueryAnalytics:
                     # Get in-memory stats (always check, even if empty)
                     in_memory_map = {}
                     if hasattr(self, '_stats') and self._stats:
-                        now = datetime.now(timezone.utc)
+                        current = _current_hour()
                         for i in range(hours):
-                            hour = now - timedelta(hours=i)
-                            hour_key = hour.strftime("%Y-%m-%d-%H")
-                            stats = self._stats["by_hour"].get(hour_key, {"count": 0, "duration_ms": 0, "errors": 0})
-                            if stats["count"] > 0:
+                            bucket = current - i
+                            count = self._stats["hour_count"].get(bucket, 0)
+                            if count > 0:
+                                hour_key = _hour_label(bucket)
                                 in_memory_map[hour_key] = {
                                     "hour": hour_key,
-                                    "count": stats["count"],
-                                    "errors": stats.get("errors", 0),
-                                    "avg_duration_ms": stats["duration_ms"] / stats["count"] if stats["count"] > 0 else 0,
+                                    "count": count,
+                                    "errors": self._stats["hour_errors"].get(bucket, 0),
+                                    "avg_duration_ms": self._stats["hour_duration_ms"][bucket] / count,
                                 }
                     
                     # Merge: always prefer in-memory data (it's more recent)
@@ -459,10 +687,9 @@ class QueryAnalytics:
                     
                     # Build result for ALL hours, ensuring chronological order
                     result = []
-                    now = datetime.now(timezone.utc)
+                    current = _current_hour()
                     for i in range(hours):
-                        hour = now - timedelta(hours=i)
-                        hour_key = hour.strftime("%Y-%m-%d-%H")
+                        hour_key = _hour_label(current - i)
                         if hour_key in merged_map:
                             result.append(merged_map[hour_key])
                         else:
@@ -486,13 +713,13 @@ class QueryAnalytics:
         
         # Fallback to in-memory stats
         with self._lock:
+            self._flush_stats()
             if not hasattr(self, '_stats'):
                 # Return empty stats for all hours
                 result = []
-                now = datetime.now(timezone.utc)
+                current = _current_hour()
                 for i in range(hours):
-                    hour = now - timedelta(hours=i)
-                    hour_key = hour.strftime("%Y-%m-%d-%H")
+                    hour_key = _hour_label(current - i)
                     result.append({
                         "hour": hour_key,
                         "count": 0,
@@ -502,23 +729,23 @@ class QueryAnalytics:
                 return list(reversed(result))
             
             result = []
-            # Use UTC timezone for consistency with recording
-            now = datetime.now(timezone.utc)
+            # Hour buckets are UTC, matching recording
+            current = _current_hour()
             for i in range(hours):
-                hour = now - timedelta(hours=i)
-                hour_key = hour.strftime("%Y-%m-%d-%H")
-                stats = self._stats["by_hour"].get(hour_key, {"count": 0, "duration_ms": 0, "errors": 0})
+                bucket = current - i
+                count = self._stats["hour_count"].get(bucket, 0)
                 result.append({
-                    "hour": hour_key,
-                    "count": stats["count"],
-                    "errors": stats.get("errors", 0),
-                    "avg_duration_ms": stats["duration_ms"] / stats["count"] if stats["count"] > 0 else 0,
+                    "hour": _hour_label(bucket),
+                    "count": count,
+                    "errors": self._stats["hour_errors"].get(bucket, 0),
+                    "avg_duration_ms": self._stats["hour_duration_ms"][bucket] / count if count > 0 else 0,
                 })
             return list(reversed(result))
     
     def get_dataset_stats(self) -> List[Dict[str, Any]]:
         """Get per-dataset statistics."""
         if self._use_storage and self._storage:
+            self._flush_storage()
             # Get from DuckDB
             try:
                 return self._storage.get_dataset_stats()
@@ -529,11 +756,12 @@ class QueryAnalytics:
         
         # Fallback to in-memory stats
         with self._lock:
+            self._flush_stats()
             if not hasattr(self, '_stats'):
                 return []
             
             result = []
-            for dataset, stats in self._stats["by_dataset"].items():
+            for dataset, stats in _grouped(self._stats, "dataset").items():
                 result.append({
                     "dataset": dataset,
                     "count": stats["count"],
@@ -545,6 +773,7 @@ class QueryAnalytics:
     def get_recent_queries(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent query records formatted for dashboard."""
         if self._use_storage and self._storage:
+            self._flush_storage()
             # Get from DuckDB
             try:
                 records = self._storage.get_query_records(limit=limit)
@@ -582,7 +811,7 @@ class QueryAnalytics:
             
             logger.debug(f"Found {len(self._records)} in-memory records, returning {limit} most recent")
             # Get the most recent records (sorted by timestamp, newest first)
-            sorted_records = sorted(self._records, key=lambda r: r.timestamp, reverse=True)
+            sorted_records = sorted(self._records, key=lambda r: r.timestamp_ns, reverse=True)
             recent = []
             for record in sorted_records[:limit]:
                 recent.append({
@@ -601,22 +830,64 @@ class QueryAnalytics:
 # Prometheus Metrics
 # =============================================================================
 
+class _ThreadCounters:
+    """
+    Counter totals recorded by a single thread.
+    
+    Only the owning thread writes ``counts``, so increments need no lock and
+    none can be lost; export() reads a copy of the dict from other threads.
+    """
+    
+    __slots__ = ("thread", "counts")
+    
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.counts: Dict[str, float] = {}
+
+
+class _MetricShard:
+    """One lock-guarded slice of the metric series, selected by key hash."""
+    
+    __slots__ = ("lock", "gauges", "histograms", "histogram_next")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gauges: Dict[str, float] = defaultdict(float)
+        self.histograms: Dict[str, "array[float]"] = defaultdict(lambda: array("d"))
+        # Next ring slot to overwrite, for histograms that are full
+        self.histogram_next: Dict[str, int] = {}
+
+
 class PrometheusMetrics:
     """Prometheus metrics exporter."""
     
+    # Bound on cached series keys; label values such as request paths can be unbounded
+    KEY_CACHE_SIZE = 10000
+    # Observations retained per histogram series
+    HISTOGRAM_SIZE = 10000
+    # Series are spread over this many independently locked shards (power of two)
+    SHARDS = 16
+    
     def __init__(self, config: ObservabilityConfig):
         self.config = config
         self.prefix = config.metrics_prefix
         self.default_labels = config.metrics_default_labels
         
-        # Metrics storage
-        self._counters: Dict[str, float] = defaultdict(float)
-        self._gauges: Dict[str, float] = defaultdict(float)
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
-        self._lock = threading.Lock()
+        # Metrics storage: updates to different series rarely contend for the same lock
+        self._shards = [_MetricShard() for _ in range(self.SHARDS)]
+        # Counters are kept per thread (see _ThreadCounters); totals of
+        # finished threads are folded into _retired_counts
+        self._local = threading.local()
+        self._thread_counters: List[_ThreadCounters] = []
+        self._retired_counts: Dict[str, float] = defaultdict(float)
+        self._counters_lock = threading.Lock()
+        self._key_cache: Dict[Any, str] = {}
+        # Rendered export line prefixes per histogram series (see _histogram_prefixes)
+        self._histogram_prefix_cache: Dict[str, Tuple[str, ...]] = {}
         
         # Histogram buckets for latency
         self._latency_buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+        self._bucket_labels = [f'le="{bucket}"' for bucket in [*map(str, self._latency_buckets), "+Inf"]]
     
     def _label_str(self, labels: Dict[str, str]) -> str:
         """Convert labels to string key."""
@@ -625,73 +896,149 @@ class PrometheusMetrics:
             return ""
         return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(all_labels.items())) + "}"
     
+    def _metric_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
+        """Full series key for name and labels, rendered once per distinct pair."""
+        cache_key = (name, frozenset(labels.items())) if labels else name
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            if len(self._key_cache) >= self.KEY_CACHE_SIZE:
+                self._key_cache.clear()
+            key = f"{self.prefix}_{name}{self._label_str(labels or {})}"
+            self._key_cache[cache_key] = key
+        return key
+    
+    def _shard(self, key: str) -> _MetricShard:
+        """Shard owning a series key (str hashes are cached, so this is cheap)."""
+        return self._shards[hash(key) & (self.SHARDS - 1)]
+    
     def inc_counter(self, name: str, value: float = 1, labels: Dict[str, str] = None) -> None:
         """Increment a counter."""
         if not self.config.metrics_enabled:
             return
-        labels = labels or {}
-        key = f"{self.prefix}_{name}{self._label_str(labels)}"
-        with self._lock:
-            self._counters[key] += value
+        key = self._metric_key(name, labels)
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._register_thread()
+        counts[key] = counts.get(key, 0.0) + value
+    
+    def _register_thread(self) -> Dict[str, float]:
+        """Give the calling thread its own counter dict."""
+        counters = _ThreadCounters()
+        with self._counters_lock:
+            # Keep the registry bounded by live threads
+            self._retire_finished_threads()
+            self._thread_counters.append(counters)
+        self._local.counts = counters.counts
+        return counters.counts
+    
+    def _retire_finished_threads(self) -> None:
+        """Fold the counts of threads that have exited. Caller holds _counters_lock."""
+        live = []
+        for counters in self._thread_counters:
+            if counters.thread.is_alive():
+                live.append(counters)
+            else:
+                for key, value in counters.counts.items():
+                    self._retired_counts[key] += value
+        self._thread_counters[:] = live
+    
+    def _counter_totals(self) -> Dict[str, float]:
+        """Current value of every counter series, summed over threads."""
+        with self._counters_lock:
+            self._retire_finished_threads()
+            totals = defaultdict(float, self._retired_counts)
+            for counters in self._thread_counters:
+                for key, value in counters.counts.copy().items():
+                    totals[key] += value
+        return totals
     
     def set_gauge(self, name: str, value: float, labels: Dict[str, str] = None) -> None:
         """Set a gauge value."""
         if not self.config.metrics_enabled:
             return
-        labels = labels or {}
-        key = f"{self.prefix}_{name}{self._label_str(labels)}"
-        with self._lock:
-            self._gauges[key] = value
+        key = self._metric_key(name, labels)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.gauges[key] = value
     
     def observe_histogram(self, name: str, value: float, labels: Dict[str, str] = None) -> None:
         """Observe a histogram value."""
         if not self.config.metrics_enabled:
             return
-        labels = labels or {}
-        key = f"{self.prefix}_{name}{self._label_str(labels)}"
-        with self._lock:
-            self._histograms[key].append(value)
-            # Keep only last 10000 observations
-            if len(self._histograms[key]) > 10000:
-                self._histograms[key] = self._histograms[key][-10000:]
-    
-    def _histogram_buckets(self, values: List[float]) -> Dict[str, int]:
-        """Calculate histogram bucket counts."""
-        result = {}
-        for bucket in self._latency_buckets:
-            result[str(bucket)] = sum(1 for v in values if v <= bucket)
+        key = self._metric_key(name, labels)
+        shard = self._shard(key)
+        with shard.lock:
+            values = shard.histograms[key]
+            # Keep only last HISTOGRAM_SIZE observations: once full, the
+            # buffer is a ring and the oldest slot is overwritten in place
+            if len(values) < self.HISTOGRAM_SIZE:
+                values.append(value)
+            else:
+                slot = shard.histogram_next.get(key, 0)
+                values[slot] = value
+                shard.histogram_next[key] = (slot + 1) % self.HISTOGRAM_SIZE
+    
+    def _histogram_buckets(self, values: "array[float]") -> Dict[str, int]:
+        """Calculate histogram bucket counts (cumulative: observations <= bucket)."""
+        buckets = self._latency_buckets
+        # One pass: index of the smallest bucket each value fits in, then a running total
+        if NUMPY_AVAILABLE:
+            slots = np.searchsorted(buckets, np.frombuffer(values, dtype=np.float64), side="left")
+            per_slot = np.bincount(slots, minlength=len(buckets) + 1).tolist()
+        else:
+            per_slot = [0] * (len(buckets) + 1)
+            for v in values:
+                per_slot[bisect_left(buckets, v)] += 1
+        result = dict(zip(map(str, buckets), accumulate(per_slot)))
         result["+Inf"] = len(values)
         return result
     
+    def _histogram_prefixes(self, key: str) -> Tuple[str, ...]:
+        """Line prefixes for a histogram series: one per bucket, then _sum and _count."""
+        prefixes = self._histogram_prefix_cache.get(key)
+        if prefixes is None:
+            if len(self._histogram_prefix_cache) >= self.KEY_CACHE_SIZE:
+                self._histogram_prefix_cache.clear()
+            if "{" in key:
+                bucket_keys = [key.replace("}", f",{label}}}") for label in self._bucket_labels]
+            else:
+                bucket_keys = [f"{key}{{{label}}}" for label in self._bucket_labels]
+            prefixes = (
+                *(f"{bucket_key}_bucket " for bucket_key in bucket_keys),
+                f"{key}_sum ",
+                f"{key}_count ",
+            )
+            self._histogram_prefix_cache[key] = prefixes
+        return prefixes
+    
     def export(self) -> str:
         """Export metrics in Prometheus format."""
         lines = []
+        counters = self._counter_totals().items()
+        gauges, histograms = [], []
         
-        with self._lock:
-            # Counters
-            for key, value in self._counters.items():
-                lines.append(f"{key} {value}")
-            
-            # Gauges
-            for key, value in self._gauges.items():
-                lines.append(f"{key} {value}")
+        # Snapshot each shard under its own lock; rendering happens unlocked
+        for shard in self._shards:
+            with shard.lock:
+                gauges.extend(shard.gauges.items())
+                histograms.extend((key, array("d", values)) for key, values in shard.histograms.items())
+        
+        # Counters
+        for key, value in counters:
+            lines.append(f"{key} {value}")
+        
+        # Gauges
+        for key, value in gauges:
+            lines.append(f"{key} {value}")
+        
+        # Histograms
+        for key, values in histograms:
+            if not values:
+                continue
             
-            # Histograms
-            for key, values in self._histograms.items():
-                if not values:
-                    continue
-                
-                buckets = self._histogram_buckets(values)
-                for bucket, count in buckets.items():
-                    bucket_label = f'le="{bucket}"'
-                    if "{" in key:
-                        bucket_key = key.replace("}", f",{bucket_label}}}")
-                    else:
-                        bucket_key = f"{key}{{{bucket_label}}}"
-                    lines.append(f"{bucket_key}_bucket {count}")
-                
-                lines.append(f"{key}_sum {sum(values)}")
-                lines.append(f"{key}_count {len(values)}")
+            prefixes = self._histogram_prefixes(key)
+            counts = [*self._histogram_buckets(values).values(), sum(values), len(values)]
+            lines.extend(map(str.__add__, prefixes, map(str, counts)))
         
         return "\n".join(lines)
     
@@ -740,6 +1087,21 @@ class PrometheusMetrics:
 # OpenTelemetry Tracing
 # =============================================================================
 
+# Span ids are cut from one token_hex() call per this many spans
+SPAN_ID_BATCH = 256
+_span_ids: Deque[str] = deque()
+
+
+def _next_span_id() -> str:
+    """Random 16-hex-digit span id from a pre-generated pool."""
+    try:
+        return _span_ids.popleft()
+    except IndexError:
+        batch = token_hex(8 * SPAN_ID_BATCH)
+        _span_ids.extend(batch[i:i + 16] for i in range(16, len(batch), 16))
+        return batch[:16]
+
+
 class Span:
     """Represents a trace span."""
     
@@ -751,8 +1113,8 @@ class Span:
     ):
         self.tracer = tracer
         self.name = name
-        self.trace_id = tracer._current_trace_id or self._generate_id(32)
-        self.span_id = self._generate_id(16)
+        self.trace_id = tracer._current_trace_id or token_hex(16)
+        self.span_id = _next_span_id()
         self.parent_id = parent_id
         self.start_time = time.time()
         self.end_time: Optional[float] = None
@@ -761,11 +1123,6 @@ class Span:
         self.status = "OK"
         self.status_message: Optional[str] = None
     
-    def _generate_id(self, length: int) -> str:
-        """Generate a random ID."""
-        import random
-        return "".join(random.choices("0123456789abcdef", k=length))
-    
     def set_attribute(self, key: str, value: Any) -> "Span":
         """Set a span attribute."""
         self.attributes[key] = value
@@ -824,7 +1181,8 @@ class OpenTelemetryTracer:
     def __init__(self, config: ObservabilityConfig):
         self.config = config
         self.service_name = config.tracing_service_name
-        self._spans: List[Dict[str, Any]] = []
+        # Only the last 1000 spans are kept
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=1000)
         self._lock = threading.Lock()
         self._current_trace_id: Optional[str] = None
         self._span_stack: List[Span] = []
@@ -838,8 +1196,7 @@ class OpenTelemetryTracer:
         
         # Apply sampling
         if self.config.tracing_sample_rate < 1.0:
-            import random
-            if random.random() > self.config.tracing_sample_rate:
+            if _rand() > self.config.tracing_sample_rate:
                 yield None
                 return
         
@@ -859,38 +1216,45 @@ class OpenTelemetryTracer:
     @contextmanager
     def start_span(self, name: str):
         """Start a new span within current trace."""
-        if not self.config.tracing_enabled or not self._current_trace_id:
+        span = self._open_span(name)
+        if span is None:
             yield None
             return
         
-        parent_id = self._span_stack[-1].span_id if self._span_stack else None
-        span = Span(self, name, parent_id)
-        self._span_stack.append(span)
-        
         try:
             yield span
         finally:
-            span.end()
-            self._span_stack.pop()
+            self._close_span(span)
+    
+    def _open_span(self, name: str) -> Optional[Span]:
+        """Push a child span of the current trace, or None when not tracing."""
+        if not self._current_trace_id or not self.config.tracing_enabled:
+            return None
+        parent_id = self._span_stack[-1].span_id if self._span_stack else None
+        span = Span(self, name, parent_id)
+        self._span_stack.append(span)
+        return span
+    
+    def _close_span(self, span: Span) -> None:
+        """End and pop a span returned by _open_span."""
+        span.end()
+        self._span_stack.pop()
     
     def _record_span(self, span: Span) -> None:
         """Record a completed span."""
         with self._lock:
             self._spans.append(span.to_dict())
-            # Keep only last 1000 spans
-            if len(self._spans) > 1000:
-                self._spans = self._spans[-1000:]
     
     def get_spans(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent spans."""
         with self._lock:
-            return self._spans[-limit:]
+            return list(self._spans)[-limit:]
     
     def export(self) -> Dict[str, Any]:
         """Export spans in OTLP format."""
         with self._lock:
-            spans = self._spans.copy()
-            self._spans = []
+            spans = list(self._spans)
+            self._spans.clear()
         
         return {
             "resourceSpans": [{
@@ -910,15 +1274,21 @@ class OpenTelemetryTracer:
 def trace(name: str):
     """Decorator to trace a function."""
     def decorator(func: Callable):
+        func_name = func.__name__
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            tracer = get_tracer()
-            if tracer:
-                with tracer.start_span(name) as span:
-                    if span:
-                        span.set_attribute("function", func.__name__)
-                    return func(*args, **kwargs)
-            return func(*args, **kwargs)
+            # Spans are opened inline rather than through start_span(), so an
+            # untraced call costs one global read and an attribute check
+            tracer = _tracer
+            span = tracer._open_span(name) if tracer is not None else None
+            if span is None:
+                return func(*args, **kwargs)
+            span.attributes["function"] = func_name
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer._close_span(span)
         return wrapper
     return decorator
 
@@ -943,7 +1313,7 @@ class AuditEventType(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@slotted_dataclass
 class AuditEvent:
     """Audit log event."""
     
@@ -976,29 +1346,88 @@ class AuditEvent:
     request_id: Optional[str] = None
 
 
+_AUDIT_FIELDS = tuple(f.name for f in fields(AuditEvent))
+
+
+@lru_cache(maxsize=1024)
+def _api_key_digest(api_key: str) -> str:
+    """Short SHA-256 digest of an API key; the same few keys recur across requests."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _audit_record(event: AuditEvent) -> Dict[str, Any]:
+    """Shallow field dict of an event (asdict() would deep-copy details)."""
+    return {name: getattr(event, name) for name in _AUDIT_FIELDS}
+
+
+def _json_default(obj: Any) -> str:
+    """Datetimes as ISO 8601 (as orjson writes them), anything else via str()."""
+    return obj.isoformat() if isinstance(obj, datetime) else str(obj)
+
+
+def _audit_line(record: Dict[str, Any]) -> bytes:
+    """One newline-terminated JSON line for the audit log file, from _audit_record()."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, default=_json_default) + "\n").encode()
+
+
+_audit_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _audit_event_dict(line: bytes) -> Dict[str, Any]:
+    """Field dict of a retained audit line, typed as the logged event was."""
+    record = _audit_loads(line)
+    record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+    record["event_type"] = AuditEventType(record["event_type"])
+    return record
+
+
 class AuditLogger:
     """Audit log collector and exporter."""
     
+    # Most lines the background writer joins into a single write()
+    WRITE_BATCH = 256
+    # Events retained in memory for get_events()
+    MAX_EVENTS = 10000
+    
     def __init__(self, config: ObservabilityConfig):
         self.config = config
-        self._events: List[AuditEvent] = []
+        # Recent events as (epoch seconds, event type, tenant, JSON line): the
+        # filter fields stay scalar and each event is one bytes object
+        self._events: Deque[Tuple[float, AuditEventType, Optional[str], bytes]] = deque(
+            maxlen=self.MAX_EVENTS
+        )
         self._lock = threading.Lock()
-        self._file_handler = None
+        self._fd: Optional[int] = None
+        self._write_q: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+        # One case-insensitive alternation instead of lowering every key per pattern
+        self._sensitive_re = re.compile(
+            "|".join(map(re.escape, config.audit_sensitive_fields)) or r"(?!)",
+            re.IGNORECASE
+        )
         
         if config.audit_log_file:
-            self._file_handler = open(config.audit_log_file, "a")
+            # File I/O happens on a background thread so log() never waits on the disk
+            self._fd = os.open(config.audit_log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="audit-log-writer", daemon=True
+            )
+            self._writer_thread.start()
     
     def _hash_api_key(self, api_key: Optional[str]) -> Optional[str]:
         """Hash API key for logging."""
         if not api_key:
             return None
-        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        return _api_key_digest(api_key)
     
     def _sanitize_details(self, details: Dict[str, Any]) -> Dict[str, Any]:
         """Remove sensitive fields from details."""
+        sensitive = self._sensitive_re.search
         sanitized = {}
         for key, value in details.items():
-            if any(sensitive in key.lower() for sensitive in self.config.audit_sensitive_fields):
+            if sensitive(key):
                 sanitized[key] = "[REDACTED]"
             elif isinstance(value, dict):
                 sanitized[key] = self._sanitize_details(value)
@@ -1006,6 +1435,31 @@ class AuditLogger:
                 sanitized[key] = value
         return sanitized
     
+    def _writer_loop(self) -> None:
+        """Write queued lines to the log file, batching whatever is pending."""
+        get, get_nowait = self._write_q.get, self._write_q.get_nowait
+        running = True
+        while running:
+            line = get()
+            if line is None:
+                break
+            batch = [line]
+            while len(batch) < self.WRITE_BATCH:
+                try:
+                    line = get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    running = False
+                    break
+                batch.append(line)
+            data = memoryview(b"".join(batch))
+            try:
+                while data:
+                    data = data[os.write(self._fd, data):]
+            except OSError as e:
+                logger.error(f"Failed to write audit log: {e}")
+    
     def log(self, event: AuditEvent) -> None:
         """Log an audit event."""
         if not self.config.audit_enabled:
@@ -1014,17 +1468,15 @@ class AuditLogger:
         # Sanitize
         event.details = self._sanitize_details(event.details)
         
+        line = _audit_line(_audit_record(event))
+        
+        # Write to file if configured
+        if self._writer_thread is not None:
+            self._write_q.put(line)
+        
+        # The deque drops the oldest event beyond MAX_EVENTS
         with self._lock:
-            self._events.append(event)
-            
-            # Write to file if configured
-            if self._file_handler:
-                self._file_handler.write(json.dumps(asdict(event), default=str) + "\n")
-                self._file_handler.flush()
-            
-            # Keep only last 10000 events in memory
-            if len(self._events) > 10000:
-                self._events = self._events[-10000:]
+            self._events.append((event.timestamp.timestamp(), event.event_type, event.tenant_id, line))
     
     def log_query(
         self,
@@ -1056,7 +1508,7 @@ class AuditLogger:
             details["filters"] = filters
         
         event = AuditEvent(
-            event_id=request_id or hashlib.sha256(str(time.time()).encode()).hexdigest()[:16],
+            event_id=request_id or token_hex(8),
             timestamp=datetime.now(),
             event_type=AuditEventType.QUERY,
             api_key_hash=self._hash_api_key(api_key),
@@ -1088,7 +1540,7 @@ class AuditLogger:
     ) -> None:
         """Log an authentication event."""
         event = AuditEvent(
-            event_id=hashlib.sha256(str(time.time()).encode()).hexdigest()[:16],
+            event_id=token_hex(8),
             timestamp=datetime.now(),
             event_type=event_type,
             api_key_hash=self._hash_api_key(api_key),
@@ -1114,7 +1566,7 @@ class AuditLogger:
     ) -> None:
         """Log a permission check."""
         event = AuditEvent(
-            event_id=hashlib.sha256(str(time.time()).encode()).hexdigest()[:16],
+            event_id=token_hex(8),
             timestamp=datetime.now(),
             event_type=AuditEventType.PERMISSION_GRANTED if granted else AuditEventType.PERMISSION_DENIED,
             api_key_hash=self._hash_api_key(api_key),
@@ -1139,25 +1591,33 @@ class AuditLogger:
     ) -> List[Dict[str, Any]]:
         """Get audit events with optional filtering."""
         with self._lock:
-            events = self._events.copy()
+            events = list(self._events)
         
         # Filter
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
+            events = [e for e in events if e[1] == event_type]
         if tenant_id:
-            events = [e for e in events if e.tenant_id == tenant_id]
+            events = [e for e in events if e[2] == tenant_id]
         if start_time:
-            events = [e for e in events if e.timestamp >= start_time]
+            start = start_time.timestamp()
+            events = [e for e in events if e[0] >= start]
         if end_time:
-            events = [e for e in events if e.timestamp <= end_time]
+            end = end_time.timestamp()
+            events = [e for e in events if e[0] <= end]
         
         # Return most recent
-        return [asdict(e) for e in events[-limit:]]
+        return [_audit_event_dict(e[3]) for e in events[-limit:]]
     
     def close(self) -> None:
-        """Close file handler."""
-        if self._file_handler:
-            self._file_handler.close()
+        """Write out queued lines and close the log file."""
+        with self._lock:
+            thread, self._writer_thread = self._writer_thread, None
+        if thread is None:
+            return
+        self._write_q.put(None)
+        thread.join()
+        os.close(self._fd)
+        self._fd = None
 
 
 # =============================================================================
@@ -1169,23 +1629,59 @@ _analytics: Optional[QueryAnalytics] = None
 _metrics: Optional[PrometheusMetrics] = None
 _tracer: Optional[OpenTelemetryTracer] = None
 _audit: Optional[AuditLogger] = None
+_init_lock = threading.Lock()
 
 
 def init_observability(config: Optional[ObservabilityConfig] = None) -> None:
-    """Initialize observability components."""
+    """
+    Initialize observability components.
+    
+    Without a config this is a no-op once initialized, so repeated or
+    concurrent startup calls build the components only once. Passing a
+    config always rebuilds them (and closes the previous analytics storage
+    writer and audit log).
+    """
     global _config, _analytics, _metrics, _tracer, _audit
     
-    _config = config or load_config_from_env()
-    _analytics = QueryAnalytics(_config)
-    _metrics = PrometheusMetrics(_config)
-    _tracer = OpenTelemetryTracer(_config)
-    _audit = AuditLogger(_config)
+    if config is None and _config is not None:
+        return
+    
+    with _init_lock:
+        if config is None and _config is not None:
+            return
+        
+        previous = (_analytics, _audit)
+        new_config = config or load_config_from_env()
+        _analytics = QueryAnalytics(new_config)
+        _metrics = PrometheusMetrics(new_config)
+        _tracer = OpenTelemetryTracer(new_config)
+        _audit = AuditLogger(new_config)
+        # Set last: a non-None _config means every component is in place
+        _config = new_config
+    
+    for component in previous:
+        if component is not None:
+            component.close()
     
     logger.info("Observability initialized")
 
 
+@atexit.register
+def _close_observability() -> None:
+    """Flush the background writers (analytics storage, audit log) on exit."""
+    for component in (_analytics, _audit):
+        if component is not None:
+            component.close()
+
+
+@lru_cache(maxsize=1)
 def load_config_from_env() -> ObservabilityConfig:
-    """Load configuration from environment variables."""
+    """
+    Load configuration from environment variables.
+    
+    The result is cached; call refresh_observability_config() after
+    changing the environment (e.g. in tests).
+    """
     return ObservabilityConfig(
         analytics_enabled=os.getenv("ANALYTICS_ENABLED", "true").lower() == "true",
         analytics_retention_hours=int(os.getenv("ANALYTICS_RETENTION_HOURS", "168")),
@@ -1202,6 +1698,11 @@ def load_config_from_env() -> ObservabilityConfig:
     )
 
 
+def refresh_observability_config() -> None:
+    """Forget the cached environment configuration."""
+    load_config_from_env.cache_clear()
+
+
 def get_analytics() -> Optional[QueryAnalytics]:
     """Get query analytics instance."""
     global _analytics
@@ -37,6 +37,42 @@ logger = logging.getLogger(__name__)
 # STATE STORAGE MANAGER
 # =============================================================================
 
+_INSERT_QUERY_RECORD = """
+    INSERT OR REPLACE INTO query_records (
+        query_id, timestamp, dataset, tenant_id,
+        dimensions, metrics, filters,
+        duration_ms, rows_returned, bytes_scanned,
+        cache_hit, success, error_code, error_message,
+        api_key_hash, user_id, source_ip, user_agent
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _query_record_row(record: Dict[str, Any]) -> List[Any]:
+    """Parameters for _INSERT_QUERY_RECORD from a QueryRecord dictionary."""
+    return [
+        record.get("query_id"),
+        record.get("timestamp"),
+        record.get("dataset"),
+        record.get("tenant_id"),
+        # Convert lists/dicts to JSON strings
+        json.dumps(record.get("dimensions", [])),
+        json.dumps(record.get("metrics", [])),
+        json.dumps(record.get("filters", {}) or {}),
+        record.get("duration_ms"),
+        record.get("rows_returned"),
+        record.get("bytes_scanned", 0),
+        record.get("cache_hit", False),
+        record.get("success", True),
+        record.get("error_code"),
+        record.get("error_message"),
+        record.get("api_key_hash"),
+        record.get("user_id"),
+        record.get("source_ip"),
+        record.get("user_agent"),
+    ]
+
+
 class StateStorage:
     """
     Centralized state storage using DuckDB.
@@ -189,41 +225,17 @@ class StateStorage:
         Args:
             record: QueryRecord as dictionary
         """
-        conn = self._get_connection()
-        
-        # Convert lists/dicts to JSON strings
-        dimensions_json = json.dumps(record.get("dimensions", []))
-        metrics_json = json.dumps(record.get("metrics", []))
-        filters_json = json.dumps(record.get("filters", {}) or {})
+        self.record_queries([record])
+    
+    def record_queries(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Record a batch of query executions in one statement.
         
-        conn.execute("""
-            INSERT OR REPLACE INTO query_records (
-                query_id, timestamp, dataset, tenant_id,
-                dimensions, metrics, filters,
-                duration_ms, rows_returned, bytes_scanned,
-                cache_hit, success, error_code, error_message,
-                api_key_hash, user_id, source_ip, user_agent
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            record.get("query_id"),
-            record.get("timestamp"),
-            record.get("dataset"),
-            record.get("tenant_id"),
-            dimensions_json,
-            metrics_json,
-            filters_json,
-            record.get("duration_ms"),
-            record.get("rows_returned"),
-            record.get("bytes_scanned", 0),
-            record.get("cache_hit", False),
-            record.get("success", True),
-            record.get("error_code"),
-            record.get("error_message"),
-            record.get("api_key_hash"),
-            record.get("user_id"),
-            record.get("source_ip"),
-            record.get("user_agent"),
-        ])
+        Args:
+            records: QueryRecords as dictionaries
+        """
+        conn = self._get_connection()
+        conn.executemany(_INSERT_QUERY_RECORD, [_query_record_row(r) for r in records])
     
     def get_query_records(
         self,
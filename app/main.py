@@ -1107,7 +1107,8 @@ def natural_language_query(
             config = NLQConfig(
                 provider=req.provider,
                 model=req.model,
-                api_key=api_key
+                api_key=api_key,
+                structured_output=os.getenv("NLQ_STRUCTURED_OUTPUT", "false").lower() == "true"
             )
             result = translate_question(req.question, dataset_schema, config)
     except SetuPranaliError:
@@ -6,14 +6,32 @@ Supports OpenAI, Anthropic, and local LLMs.
 """
 
 import os
+import copy
 import json
+import time
+import random
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+import re
+import sys
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Union
+from dataclasses import dataclass, replace
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+# Upper bound on questions sent in one batched translation call
+MAX_BATCH_SIZE = 16
+
+
 @dataclass
 class NLQConfig:
     """Configuration for Natural Language Query engine."""
@@ -23,6 +41,15 @@ class NLQConfig:
     base_url: Optional[str] = None
     temperature: float = 0.0
     max_tokens: int = 500
+    # OpenAI structured outputs (strict JSON schema). Only newer models
+    # (gpt-4o-mini, gpt-4o-2024-08-06 and later) and few local backends
+    # accept it, so the default is plain JSON mode.
+    structured_output: bool = False
+    # Limits for the async batch path (translate_many_async); None = unlimited
+    max_concurrent: int = 10
+    max_requests_per_minute: Optional[int] = None
+    max_tokens_per_minute: Optional[int] = None
+    max_retries: int = 5
 
 
 @dataclass
@@ -35,95 +62,195 @@ class NLQResult:
     suggestions: List[str]
 
 
+def _schema_key(dataset_schema: Dict[str, Any]) -> str:
+    """Canonical JSON form of a schema, used to key per-schema caches."""
+    return json.dumps(dataset_schema, sort_keys=True, default=str)
+
+
 def get_system_prompt(dataset_schema: Dict[str, Any]) -> str:
     """Generate system prompt with dataset schema."""
-    dimensions = dataset_schema.get("dimensions", [])
-    metrics = dataset_schema.get("metrics", [])
+    return _cached_system_prompt(_schema_key(dataset_schema))
+
+
+@lru_cache(maxsize=64)
+def _cached_system_prompt(schema_key: str) -> str:
+    """System prompt for a schema, built once per distinct schema."""
+    return _build_system_prompt(json.loads(schema_key))
+
+
+def _build_system_prompt(dataset_schema: Dict[str, Any]) -> str:
+    """
+    Render the system prompt for a dataset schema.
     
-    dim_list = "\n".join([
-        f"  - {d['name']}: {d.get('description', d.get('label', d['name']))} (type: {d.get('type', 'string')})"
-        for d in dimensions
-    ])
+    Kept compact since it is sent with every request: one line per field,
+    descriptions only when they add something, aggregation only when it
+    is not the default sum.
+    """
+    def describe(field: Dict[str, Any]) -> str:
+        text = field.get("description") or field.get("label")
+        return f": {text}" if text and text != field["name"] else ""
     
-    metric_list = "\n".join([
-        f"  - {m['name']}: {m.get('description', m.get('label', m['name']))} (aggregation: {m.get('aggregation', 'sum')})"
-        for m in metrics
-    ])
+    dim_list = "\n".join(
+        f"{d['name']}|{d.get('type', 'string')}{describe(d)}"
+        for d in dataset_schema.get("dimensions", [])
+    )
+    def aggregation(metric: Dict[str, Any]) -> str:
+        agg = str(metric.get("aggregation") or "sum")
+        return "" if agg.lower() == "sum" else f"|{agg}"
     
-    return f"""You are a semantic query translator for a BI analytics system called SetuPranali.
-
-Your job is to translate natural language questions into structured semantic queries.
-
-Available Dataset: {dataset_schema.get('name', dataset_schema.get('id', 'unknown'))}
-Description: {dataset_schema.get('description', 'No description')}
+    metric_list = "\n".join(
+        f"{m['name']}{aggregation(m)}{describe(m)}"
+        for m in dataset_schema.get("metrics", [])
+    )
+    description = dataset_schema.get("description")
+    
+    return f"""Translate questions about dataset {dataset_schema.get('name', dataset_schema.get('id', 'unknown'))} into semantic queries for the SetuPranali BI system.{f" Dataset: {description}" if description else ""}
 
-Available Dimensions (groupable fields):
+Dimensions (name|type: description):
 {dim_list}
 
-Available Metrics (aggregatable measures):
+Metrics (name|aggregation if not sum: description):
 {metric_list}
 
-Output a JSON object with this structure:
-{{
-    "dimensions": ["dimension_name1", "dimension_name2"],
-    "metrics": ["metric_name1"],
-    "filters": [
-        {{"field": "field_name", "operator": "eq|ne|gt|gte|lt|lte|in|like", "value": "value"}}
-    ],
-    "orderBy": [
-        {{"field": "field_name", "direction": "asc|desc"}}
-    ],
-    "limit": 100,
-    "explanation": "Brief explanation of what this query does",
-    "confidence": 0.95
-}}
-
-Rules:
-1. Only use dimensions and metrics that exist in the schema above
-2. Use appropriate filter operators
-3. If the question is ambiguous, make reasonable assumptions and note them in explanation
-4. Set confidence between 0 and 1 based on how well you understood the question
-5. Always return valid JSON
-
-If you cannot translate the question, return:
-{{
-    "error": "explanation of why",
-    "suggestions": ["alternative question 1", "alternative question 2"]
-}}
+Reply with JSON only:
+{{"dimensions":[...],"metrics":[...],"filters":[{{"field":"...","operator":"eq|ne|gt|gte|lt|lte|in|like","value":...}}],"orderBy":[{{"field":"...","direction":"asc|desc"}}],"limit":100,"explanation":"...","confidence":0.95}}
+Rules: use only listed fields; note assumptions in explanation; confidence in [0,1].
+If untranslatable: {{"error":"...","suggestions":["..."]}}
 """
 
 
-def translate_with_openai(
-    question: str,
-    dataset_schema: Dict[str, Any],
-    config: NLQConfig
-) -> NLQResult:
-    """Translate question using OpenAI."""
+def _string_list() -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+# Reply shape enforced by the providers (OpenAI structured outputs, Anthropic
+# tool input). Strict mode needs every property required and no extras, so
+# unused members are null/empty rather than absent. "error" comes first so a
+# streamed reply reveals failure before the query fields.
+_NLQ_JSON_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "error": {"type": ["string", "null"]},
+        "suggestions": _string_list(),
+        "dimensions": _string_list(),
+        "metrics": _string_list(),
+        "filters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "field": {"type": "string"},
+                    "operator": {
+                        "type": "string",
+                        "enum": ["eq", "ne", "gt", "gte", "lt", "lte", "in", "like"]
+                    },
+                    "value": {"anyOf": [
+                        {"type": "string"},
+                        {"type": "number"},
+                        {"type": "boolean"},
+                        {"type": "null"},
+                        {"type": "array", "items": {"anyOf": [{"type": "string"}, {"type": "number"}]}}
+                    ]}
+                },
+                "required": ["field", "operator", "value"],
+                "additionalProperties": False
+            }
+        },
+        "orderBy": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "field": {"type": "string"},
+                    "direction": {"type": "string", "enum": ["asc", "desc"]}
+                },
+                "required": ["field", "direction"],
+                "additionalProperties": False
+            }
+        },
+        "limit": {"type": ["integer", "null"]},
+        "explanation": {"type": "string"},
+        "confidence": {"type": "number"}
+    },
+    "required": [
+        "error", "suggestions", "dimensions", "metrics", "filters",
+        "orderBy", "limit", "explanation", "confidence"
+    ],
+    "additionalProperties": False
+}
+
+# JSON mode: any JSON object; works with every chat model and most
+# OpenAI-compatible local servers
+_OPENAI_JSON_FORMAT = {"type": "json_object"}
+
+_OPENAI_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "nlq", "schema": _NLQ_JSON_SCHEMA, "strict": True}
+}
+
+# Batched calls reply with one schema-shaped object per question
+_OPENAI_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "nlq_batch",
+        "schema": {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": _NLQ_JSON_SCHEMA}},
+            "required": ["results"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
+
+
+def _openai_response_format(config: NLQConfig, batch: bool = False) -> Dict[str, Any]:
+    """response_format for an OpenAI call: the strict schema only when enabled."""
+    if not config.structured_output:
+        return _OPENAI_JSON_FORMAT
+    return _OPENAI_BATCH_RESPONSE_FORMAT if batch else _OPENAI_RESPONSE_FORMAT
+
+
+_ANTHROPIC_TOOL = {
+    "name": "semantic_query",
+    "description": "Record the semantic query that answers the user's question.",
+    "input_schema": _NLQ_JSON_SCHEMA
+}
+
+
+# SDKs are imported on first use so the rule-based path never loads them;
+# clients are reused so each call does not build a new HTTP connection pool
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: Optional[str], base_url: Optional[str]):
     try:
         import openai
     except ImportError:
         raise ImportError("openai package required. Install with: pip install openai")
-    
-    client = openai.OpenAI(
-        api_key=config.api_key or os.getenv("OPENAI_API_KEY"),
-        base_url=config.base_url
-    )
-    
-    response = client.chat.completions.create(
-        model=config.model,
-        temperature=config.temperature,
-        max_tokens=config.max_tokens,
-        messages=[
-            {"role": "system", "content": get_system_prompt(dataset_schema)},
-            {"role": "user", "content": question}
-        ],
-        response_format={"type": "json_object"}
-    )
-    
-    result_text = response.choices[0].message.content
-    result = json.loads(result_text)
-    
-    if "error" in result:
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+
+@lru_cache(maxsize=8)
+def _openai_async_client(api_key: Optional[str], base_url: Optional[str]):
+    try:
+        import openai
+    except ImportError:
+        raise ImportError("openai package required. Install with: pip install openai")
+    return openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+@lru_cache(maxsize=8)
+def _anthropic_client(api_key: Optional[str]):
+    try:
+        import anthropic
+    except ImportError:
+        raise ImportError("anthropic package required. Install with: pip install anthropic")
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def _coerce_result(question: str, result: Dict[str, Any]) -> NLQResult:
+    """Build an NLQResult from a provider's parsed JSON reply."""
+    if result.get("error"):
         return NLQResult(
             original_question=question,
             translated_query={},
@@ -139,7 +266,7 @@ def translate_with_openai(
             "metrics": result.get("metrics", []),
             "filters": result.get("filters", []),
             "orderBy": result.get("orderBy", []),
-            "limit": result.get("limit", 100)
+            "limit": 100 if result.get("limit") is None else result["limit"]
         },
         explanation=result.get("explanation", ""),
         confidence=result.get("confidence", 0.8),
@@ -147,62 +274,329 @@ def translate_with_openai(
     )
 
 
-def translate_with_anthropic(
+def translate_with_openai(
     question: str,
     dataset_schema: Dict[str, Any],
     config: NLQConfig
 ) -> NLQResult:
-    """Translate question using Anthropic Claude."""
+    """Translate question using OpenAI."""
+    client = _openai_client(config.api_key or os.getenv("OPENAI_API_KEY"), config.base_url)
+    
+    response = client.chat.completions.create(
+        model=config.model,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens,
+        messages=[
+            {"role": "system", "content": get_system_prompt(dataset_schema)},
+            {"role": "user", "content": question}
+        ],
+        response_format=_openai_response_format(config)
+    )
+    
+    result_text = response.choices[0].message.content
+    return _coerce_result(question, json.loads(result_text))
+
+
+def translate_many_with_openai(
+    questions: List[str],
+    dataset_schema: Dict[str, Any],
+    config: NLQConfig,
+    batch_size: int = 8
+) -> List[NLQResult]:
+    """
+    Translate several questions using OpenAI, batch_size questions per call.
+    
+    The system prompt is the same as for single questions, so its cost is
+    shared by the whole batch. Questions the model leaves out of a batch
+    reply are retried one at a time.
+    """
+    client = _openai_client(config.api_key or os.getenv("OPENAI_API_KEY"), config.base_url)
+    system_prompt = get_system_prompt(dataset_schema)
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    
+    results: List[NLQResult] = []
+    for start in range(0, len(questions), batch_size):
+        batch = questions[start:start + batch_size]
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(batch, 1))
+        
+        response = client.chat.completions.create(
+            model=config.model,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens * len(batch),
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": (
+                    "Translate each numbered question. Reply with JSON "
+                    '{"results":[...]} holding one object per question, in order.\n'
+                    + numbered
+                )}
+            ],
+            response_format=_openai_response_format(config, batch=True)
+        )
+        
+        replies = json.loads(response.choices[0].message.content).get("results", [])
+        for i, question in enumerate(batch):
+            if i < len(replies) and isinstance(replies[i], dict):
+                results.append(_coerce_result(question, replies[i]))
+            else:
+                logger.warning("NLQ batch reply missing question %d; retrying it alone", start + i)
+                results.append(translate_with_openai(question, dataset_schema, config))
+    
+    return results
+
+
+class _RateLimiter:
+    """
+    Token-bucket limiter for requests and tokens per minute.
+    
+    Capacity refills continuously; acquire() waits until both buckets can
+    cover the next call.
+    """
+    
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self.requests_available = float(requests_per_minute or 0)
+        self.tokens_available = float(tokens_per_minute or 0)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        if self.rpm:
+            self.requests_available = min(self.rpm, self.requests_available + elapsed * self.rpm / 60)
+        if self.tpm:
+            self.tokens_available = min(self.tpm, self.tokens_available + elapsed * self.tpm / 60)
+    
+    async def acquire(self, tokens: int) -> None:
+        if not self.rpm and not self.tpm:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                need_requests = 1 - self.requests_available if self.rpm else 0
+                need_tokens = min(tokens, self.tpm) - self.tokens_available if self.tpm else 0
+                if need_requests <= 0 and need_tokens <= 0:
+                    break
+                wait = max(
+                    need_requests * 60 / self.rpm if self.rpm else 0,
+                    need_tokens * 60 / self.tpm if self.tpm else 0,
+                )
+                await asyncio.sleep(wait)
+            if self.rpm:
+                self.requests_available -= 1
+            if self.tpm:
+                self.tokens_available -= min(tokens, self.tpm)
+
+
+async def translate_with_openai_async(
+    question: str,
+    dataset_schema: Dict[str, Any],
+    config: NLQConfig,
+    client: Any = None
+) -> NLQResult:
+    """
+    Translate question using OpenAI without blocking the event loop.
+    
+    Rate-limit (429) responses are retried with exponential backoff and
+    jitter, up to config.max_retries times.
+    """
     try:
-        import anthropic
+        import openai
     except ImportError:
-        raise ImportError("anthropic package required. Install with: pip install anthropic")
+        raise ImportError("openai package required. Install with: pip install openai")
     
-    client = anthropic.Anthropic(
-        api_key=config.api_key or os.getenv("ANTHROPIC_API_KEY")
+    if client is None:
+        client = _openai_async_client(config.api_key or os.getenv("OPENAI_API_KEY"), config.base_url)
+    
+    for attempt in range(config.max_retries + 1):
+        try:
+            response = await client.chat.completions.create(
+                model=config.model,
+                temperature=config.temperature,
+                max_tokens=config.max_tokens,
+                messages=[
+                    {"role": "system", "content": get_system_prompt(dataset_schema)},
+                    {"role": "user", "content": question}
+                ],
+                response_format=_openai_response_format(config)
+            )
+            break
+        except openai.RateLimitError:
+            if attempt == config.max_retries:
+                raise
+            delay = min(60.0, 2 ** attempt) * (0.5 + random.random())
+            logger.warning("OpenAI rate limited; retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+    
+    result_text = response.choices[0].message.content
+    return _coerce_result(question, json.loads(result_text))
+
+
+async def translate_many_async(
+    questions: List[str],
+    dataset_schema: Dict[str, Any],
+    config: NLQConfig,
+    max_concurrent: Optional[int] = None
+) -> List[Union[NLQResult, Exception]]:
+    """
+    Translate many questions concurrently.
+    
+    At most max_concurrent (default config.max_concurrent) calls are in
+    flight, paced by the config's requests/tokens-per-minute limits. A
+    failed question yields its exception in place of a result instead
+    of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent or config.max_concurrent)
+    limiter = _RateLimiter(config.max_requests_per_minute, config.max_tokens_per_minute)
+    # Rough prompt size in tokens (~4 characters each) plus the reply budget
+    prompt_tokens = len(get_system_prompt(dataset_schema)) // 4
+    
+    client = None
+    if config.provider == "openai":
+        client = _openai_async_client(config.api_key or os.getenv("OPENAI_API_KEY"), config.base_url)
+    
+    async def translate(question: str) -> NLQResult:
+        async with semaphore:
+            await limiter.acquire(prompt_tokens + len(question) // 4 + config.max_tokens)
+            if client is not None:
+                return await translate_with_openai_async(question, dataset_schema, config, client)
+            # Other providers have no async path here; keep them off the loop
+            return await asyncio.to_thread(translate_question, question, dataset_schema, config)
+    
+    return await asyncio.gather(*(translate(q) for q in questions), return_exceptions=True)
+
+
+# Fields that make up the translated query; explanation/confidence are extra
+_QUERY_FIELDS = frozenset({"dimensions", "metrics", "filters", "orderBy", "limit"})
+
+
+class _StreamedObjectParser:
+    """
+    Incremental parser for a JSON object arriving in chunks.
+    
+    feed() returns each top-level member as soon as its value is complete,
+    so callers can act on "dimensions" before "explanation" is generated.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.member_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        members = []
+        text = self.text
+        for i in range(self.pos, len(text)):
+            char = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+                if self.depth == 1:
+                    self.member_start = i + 1
+            elif char in "}]":
+                if self.depth == 1:
+                    members.extend(self._member(self.member_start, i))
+                self.depth -= 1
+            elif char == "," and self.depth == 1:
+                members.extend(self._member(self.member_start, i))
+                self.member_start = i + 1
+        self.pos = len(text)
+        return members
+    
+    def _member(self, start: Optional[int], end: int) -> List[Tuple[str, Any]]:
+        member = self.text[start:end].strip() if start is not None else ""
+        if not member:
+            return []
+        return list(json.loads("{" + member + "}").items())
+
+
+async def translate_with_openai_stream(
+    question: str,
+    dataset_schema: Dict[str, Any],
+    config: NLQConfig,
+    need_explanation: bool = True
+):
+    """
+    Translate question using OpenAI, yielding partial results as they stream.
+    
+    Each yielded NLQResult holds every field parsed so far, so query
+    planning can start before the model finishes. With
+    need_explanation=False the stream is closed as soon as all query
+    fields have arrived.
+    """
+    client = _openai_async_client(config.api_key or os.getenv("OPENAI_API_KEY"), config.base_url)
+    stream = await client.chat.completions.create(
+        model=config.model,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens,
+        messages=[
+            {"role": "system", "content": get_system_prompt(dataset_schema)},
+            {"role": "user", "content": question}
+        ],
+        response_format=_openai_response_format(config),
+        stream=True
     )
     
+    parser = _StreamedObjectParser()
+    fields: Dict[str, Any] = {}
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            members = parser.feed(delta)
+            if not members:
+                continue
+            fields.update(members)
+            yield _coerce_result(question, fields)
+            if not need_explanation and not fields.get("error") and _QUERY_FIELDS <= fields.keys():
+                break
+    finally:
+        await stream.close()
+
+
+def translate_with_anthropic(
+    question: str,
+    dataset_schema: Dict[str, Any],
+    config: NLQConfig
+) -> NLQResult:
+    """Translate question using Anthropic Claude."""
+    client = _anthropic_client(config.api_key or os.getenv("ANTHROPIC_API_KEY"))
+    
+    # Forcing the single tool makes the reply a schema-shaped tool input
+    # instead of JSON embedded in prose
     response = client.messages.create(
         model=config.model or "claude-3-haiku-20240307",
         max_tokens=config.max_tokens,
         system=get_system_prompt(dataset_schema),
         messages=[
             {"role": "user", "content": question}
-        ]
+        ],
+        tools=[_ANTHROPIC_TOOL],
+        tool_choice={"type": "tool", "name": _ANTHROPIC_TOOL["name"]}
     )
     
-    result_text = response.content[0].text
-    
-    # Extract JSON from response
-    import re
-    json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-    if json_match:
-        result = json.loads(json_match.group())
-    else:
-        raise ValueError("Could not parse JSON from response")
-    
-    if "error" in result:
-        return NLQResult(
-            original_question=question,
-            translated_query={},
-            explanation=result["error"],
-            confidence=0.0,
-            suggestions=result.get("suggestions", [])
-        )
-    
-    return NLQResult(
-        original_question=question,
-        translated_query={
-            "dimensions": result.get("dimensions", []),
-            "metrics": result.get("metrics", []),
-            "filters": result.get("filters", []),
-            "orderBy": result.get("orderBy", []),
-            "limit": result.get("limit", 100)
-        },
-        explanation=result.get("explanation", ""),
-        confidence=result.get("confidence", 0.8),
-        suggestions=[]
-    )
+    for block in response.content:
+        if block.type == "tool_use":
+            return _coerce_result(question, block.input)
+    raise ValueError("Anthropic response contained no tool call")
 
 
 def translate_question(
@@ -224,17 +618,101 @@ def translate_question(
     config = config or NLQConfig()
     
     if config.provider == "openai":
-        return translate_with_openai(question, dataset_schema, config)
+        translate = translate_with_openai
     elif config.provider == "anthropic":
-        return translate_with_anthropic(question, dataset_schema, config)
+        translate = translate_with_anthropic
     else:
         raise ValueError(f"Unsupported provider: {config.provider}")
+    
+    # Repeated (or, with the semantic tier, similar) questions skip the LLM
+    from app.nlq_cache import get_nlq_cache, schema_hash
+    cache = get_nlq_cache()
+    scope = schema_hash(f"{config.provider}:{config.model}:{_schema_key(dataset_schema)}")
+    cached = cache.get(scope, question)
+    if cached is not None:
+        return replace(
+            cached,
+            original_question=question,
+            translated_query=copy.deepcopy(cached.translated_query)
+        )
+    
+    result = translate(question, dataset_schema, config)
+    if result.translated_query:
+        cache.put(scope, question, result)
+    return result
 
 
 # =============================================================================
 # Simple rule-based fallback (no AI required)
 # =============================================================================
 
+_TOP_N_RE = re.compile(r"top\s+(\d+)")
+
+
+@dataclass(frozen=True)
+class _SchemaIndex:
+    """Field names of a schema plus a matcher for their mentions in questions."""
+    dimensions: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    # (name, lowercase forms matched in questions) per field, in schema order
+    dim_variants: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    metric_variants: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    # Aho-Corasick automaton: lowercase name variant -> [(is_metric, position)]
+    automaton: Any = None
+
+
+def _name_variants(name: str) -> Tuple[str, ...]:
+    """Lowercase spellings of a field name: as-is and with underscores as spaces."""
+    lower = sys.intern(name.lower())
+    spaced = sys.intern(lower.replace("_", " "))
+    return tuple(v for v in dict.fromkeys((lower, spaced)) if v)
+
+
+@lru_cache(maxsize=64)
+def _schema_index(dimensions: Tuple[str, ...], metrics: Tuple[str, ...]) -> _SchemaIndex:
+    """Build the translate_simple lookup structures once per set of field names."""
+    dim_variants = tuple((d, _name_variants(d)) for d in dimensions)
+    metric_variants = tuple((m, _name_variants(m)) for m in metrics)
+    
+    if not AHOCORASICK_AVAILABLE:
+        return _SchemaIndex(dimensions, metrics, dim_variants, metric_variants)
+    
+    owners: Dict[str, List[Tuple[int, int]]] = {}
+    for is_metric, fields in enumerate((dim_variants, metric_variants)):
+        for position, (_, variants) in enumerate(fields):
+            for variant in variants:
+                owners.setdefault(variant, []).append((is_metric, position))
+    if not owners:
+        return _SchemaIndex(dimensions, metrics, dim_variants, metric_variants)
+    
+    automaton = ahocorasick.Automaton()
+    for variant, fields in owners.items():
+        automaton.add_word(variant, fields)
+    automaton.make_automaton()
+    return _SchemaIndex(dimensions, metrics, dim_variants, metric_variants, automaton)
+
+
+def _mentioned_fields(index: _SchemaIndex, question_lower: str) -> Tuple[List[str], List[str]]:
+    """Dimensions and metrics whose names occur in the question, in schema order."""
+    if index.automaton is None:
+        return (
+            [d for d, variants in index.dim_variants
+             if any(v in question_lower for v in variants)],
+            [m for m, variants in index.metric_variants
+             if any(v in question_lower for v in variants)],
+        )
+    
+    # One pass over the question finds every (overlapping) name occurrence
+    hits = ([False] * len(index.dimensions), [False] * len(index.metrics))
+    for _, fields in index.automaton.iter(question_lower):
+        for is_metric, position in fields:
+            hits[is_metric][position] = True
+    return (
+        [d for d, hit in zip(index.dimensions, hits[0]) if hit],
+        [m for m, hit in zip(index.metrics, hits[1]) if hit],
+    )
+
+
 def translate_simple(
     question: str,
     dataset_schema: Dict[str, Any]
@@ -248,29 +726,24 @@ def translate_simple(
     """
     question_lower = question.lower()
     
-    dimensions = [d["name"] for d in dataset_schema.get("dimensions", [])]
-    metrics = [m["name"] for m in dataset_schema.get("metrics", [])]
+    # Keyed on the names alone, the only part of the schema the index reads
+    index = _schema_index(
+        tuple(d["name"] for d in dataset_schema.get("dimensions", [])),
+        tuple(m["name"] for m in dataset_schema.get("metrics", [])),
+    )
+    dimensions = list(index.dimensions)
+    metrics = list(index.metrics)
     
-    result_dims = []
-    result_metrics = []
     result_order = []
     result_limit = 100
     
     # Check for "top N" pattern
-    import re
-    top_match = re.search(r'top\s+(\d+)', question_lower)
+    top_match = _TOP_N_RE.search(question_lower)
     if top_match:
         result_limit = int(top_match.group(1))
     
-    # Find mentioned dimensions
-    for dim in dimensions:
-        if dim.lower() in question_lower or dim.replace("_", " ").lower() in question_lower:
-            result_dims.append(dim)
-    
-    # Find mentioned metrics
-    for metric in metrics:
-        if metric.lower() in question_lower or metric.replace("_", " ").lower() in question_lower:
-            result_metrics.append(metric)
+    # Find mentioned dimensions and metrics
+    result_dims, result_metrics = _mentioned_fields(index, question_lower)
     
     # Check for ordering keywords
     if any(word in question_lower for word in ["top", "highest", "most", "best"]):
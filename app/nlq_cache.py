@@ -0,0 +1,254 @@
+"""
+SetuPranali - NLQ Translation Cache
+
+Caches natural language query translations so repeated questions skip the
+LLM round-trip. Two tiers, both scoped to a dataset schema:
+
+1. Exact: normalized question text -> result (LRU)
+2. Semantic: question embedding -> result, matched by cosine similarity,
+   so "top 10 cities by revenue" also serves "show me the top ten cities
+   by revenue". A similar question only counts as a hit when it carries the
+   same numbers (limits, years, day counts): embeddings barely separate
+   "top 10" from "top 20"
+
+The semantic tier needs numpy and an embedding function; without them the
+cache is exact-only.
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Sequence[float]]
+
+
+def _normalize(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question."""
+    return " ".join(question.lower().split())
+
+
+_NUMBER_WORDS = {
+    word: str(value) for value, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve "
+        "thirteen fourteen fifteen sixteen seventeen eighteen nineteen twenty".split()
+    )
+}
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*|[a-z]+")
+
+
+def _numbers(normalized: str) -> Tuple[str, ...]:
+    """Numbers in a normalized question, in order, with "ten" read as "10"."""
+    numbers = []
+    for token in _NUMBER_RE.findall(normalized):
+        if token[0].isdigit():
+            numbers.append(token.replace(",", ""))
+        elif token in _NUMBER_WORDS:
+            numbers.append(_NUMBER_WORDS[token])
+    return tuple(numbers)
+
+
+class SemanticNLQCache:
+    """
+    In-memory NLQ result cache with an exact and a similarity tier.
+    
+    Vectors are stored L2-normalized in a fixed-size ring buffer, so a
+    lookup is one matrix-vector product over the live entries for the
+    schema.
+    
+    Usage:
+        cache = SemanticNLQCache(embed_fn=openai_embedder(api_key))
+        result = cache.get(schema_hash, question)
+        if result is None:
+            result = translate(...)
+            cache.put(schema_hash, question, result)
+    """
+    
+    def __init__(
+        self,
+        embed_fn: Optional[EmbedFn] = None,
+        dim: Optional[int] = None,
+        capacity: int = 1024,
+        threshold: float = 0.92,
+        ttl_seconds: float = 3600.0
+    ):
+        self.embed_fn = embed_fn if NUMPY_AVAILABLE else None
+        self.dim = dim
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        
+        # Semantic tier, allocated on first insert once dim is known
+        self._vectors = None
+        self._stored_at = None
+        self._schemas = None
+        self._results: List[Any] = [None] * capacity
+        self._numbers: List[Optional[Tuple[str, ...]]] = [None] * capacity
+        self._next = 0
+    
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.embed_fn is not None
+    
+    def get(self, schema_hash: str, question: str) -> Optional[Any]:
+        """Cached result for the question, or None on a miss."""
+        key = (schema_hash, _normalize(question))
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._exact.move_to_end(key)
+                    return entry[1]
+                del self._exact[key]
+        
+        if not self.semantic_enabled or self._vectors is None:
+            return None
+        
+        query = self._embed(key[1])
+        if query is None:
+            return None
+        numbers = _numbers(key[1])
+        
+        with self._lock:
+            live = np.flatnonzero(
+                (self._schemas == schema_hash) & (now - self._stored_at <= self.ttl_seconds)
+            )
+            if not live.size:
+                return None
+            scores = self._vectors[live] @ query
+            # Most similar entry above the threshold that has the same numbers
+            for i in np.argsort(-scores):
+                if scores[i] < self.threshold:
+                    break
+                if self._numbers[live[i]] == numbers:
+                    return self._results[live[i]]
+        return None
+    
+    def put(self, schema_hash: str, question: str, result: Any) -> None:
+        """Store a translation under both tiers."""
+        key = (schema_hash, _normalize(question))
+        now = time.monotonic()
+        
+        with self._lock:
+            self._exact[key] = (now, result)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.capacity:
+                self._exact.popitem(last=False)
+        
+        if not self.semantic_enabled:
+            return
+        
+        vector = self._embed(key[1])
+        if vector is None:
+            return
+        
+        with self._lock:
+            if self._vectors is None:
+                self.dim = self.dim or len(vector)
+                self._vectors = np.zeros((self.capacity, self.dim), dtype=np.float32)
+                self._stored_at = np.full(self.capacity, -np.inf)
+                self._schemas = np.full(self.capacity, None, dtype=object)
+            slot = self._next
+            self._next = (self._next + 1) % self.capacity
+            self._vectors[slot] = vector
+            self._stored_at[slot] = now
+            self._schemas[slot] = schema_hash
+            self._results[slot] = result
+            self._numbers[slot] = _numbers(key[1])
+    
+    def clear(self, schema_hash: Optional[str] = None) -> None:
+        """Drop all entries, or only those for one schema."""
+        with self._lock:
+            if schema_hash is None:
+                self._exact.clear()
+            else:
+                for key in [k for k in self._exact if k[0] == schema_hash]:
+                    del self._exact[key]
+            if self._schemas is None:
+                return
+            for i in np.flatnonzero(
+                self._schemas != None if schema_hash is None else self._schemas == schema_hash  # noqa: E711
+            ):
+                self._schemas[i] = None
+                self._results[i] = None
+                self._numbers[i] = None
+    
+    def _embed(self, text: str):
+        """L2-normalized embedding of text, or None if embedding fails."""
+        try:
+            vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning("NLQ cache embedding failed: %s", e)
+            return None
+        norm = float(np.linalg.norm(vector))
+        if not norm or (self.dim and vector.shape[0] != self.dim):
+            return None
+        return vector / norm
+
+
+def schema_hash(schema_key: str) -> str:
+    """Short digest of a canonical schema string, used to scope cache entries."""
+    return hashlib.blake2b(schema_key.encode(), digest_size=16).hexdigest()
+
+
+def openai_embedder(
+    api_key: Optional[str] = None,
+    model: str = "text-embedding-3-small"
+) -> EmbedFn:
+    """Embedding function backed by the OpenAI embeddings API."""
+    import openai
+    
+    client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+    
+    def embed(text: str) -> Sequence[float]:
+        return client.embeddings.create(model=model, input=text).data[0].embedding
+    
+    return embed
+
+
+_cache: Optional[SemanticNLQCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_nlq_cache() -> SemanticNLQCache:
+    """
+    Process-wide NLQ cache.
+    
+    The semantic tier is enabled with NLQ_SEMANTIC_CACHE=true (OpenAI
+    embeddings, needs numpy and OPENAI_API_KEY); NLQ_CACHE_THRESHOLD and
+    NLQ_CACHE_TTL_SECONDS tune it.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                embed_fn = None
+                if os.getenv("NLQ_SEMANTIC_CACHE", "false").lower() == "true":
+                    try:
+                        embed_fn = openai_embedder()
+                    except Exception as e:
+                        logger.warning("NLQ semantic cache disabled: %s", e)
+                _cache = SemanticNLQCache(
+                    embed_fn=embed_fn,
+                    threshold=float(os.getenv("NLQ_CACHE_THRESHOLD", "0.92")),
+                    ttl_seconds=float(os.getenv("NLQ_CACHE_TTL_SECONDS", "3600")),
+                )
+    return _cache
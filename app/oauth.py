@@ -19,20 +19,40 @@ Features:
 """
 
 import os
+import json
 import time
+import asyncio
 import logging
 import hashlib
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 from functools import lru_cache
 from urllib.parse import urljoin
 
-import jwt
 import requests
-from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter
 from fastapi import HTTPException, Request, Depends
 from fastapi.security import OAuth2AuthorizationCodeBearer, HTTPBearer, HTTPAuthorizationCredentials
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# PyJWT and httpx are imported on first use (see _jwt() and _async_http()),
+# so workers with OAuth disabled never load them
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +63,9 @@ logger = logging.getLogger(__name__)
 class OAuthProvider(BaseModel):
     """OAuth provider configuration."""
     
+    # Immutable once built: discovery returns an updated copy
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+    
     name: str = Field(..., description="Provider name (e.g., 'google', 'azure', 'okta')")
     issuer: str = Field(..., description="OAuth issuer URL")
     client_id: str = Field(..., description="OAuth client ID")
@@ -72,6 +95,26 @@ class OAuthProvider(BaseModel):
     verify_aud: bool = Field(default=True, description="Verify audience")
     leeway: int = Field(default=60, description="Leeway for time-based claims (seconds)")
     cache_ttl: int = Field(default=3600, description="JWKS cache TTL (seconds)")
+    
+    _validation_ctx: Optional[Mapping[str, Any]] = PrivateAttr(default=None)
+    
+    @property
+    def validation_ctx(self) -> Mapping[str, Any]:
+        """Keyword arguments for jwt.decode, built once per provider."""
+        if self._validation_ctx is None:
+            self._validation_ctx = MappingProxyType({
+                "algorithms": ("RS256", "RS384", "RS512"),
+                "options": MappingProxyType({
+                    "verify_signature": True,
+                    "verify_exp": self.verify_exp,
+                    "verify_aud": self.verify_aud,
+                    "require": ("sub",),
+                }),
+                "audience": self.audience if self.verify_aud else None,
+                "issuer": self.issuer,
+                "leeway": self.leeway,
+            })
+        return self._validation_ctx
 
 
 class OAuthConfig(BaseModel):
@@ -88,30 +131,180 @@ class OAuthConfig(BaseModel):
     session_ttl: int = Field(default=3600, description="Session TTL (seconds)")
 
 
+# =============================================================================
+# HTTP Session
+# =============================================================================
+
+# Shared session for discovery and JWKS requests: keeps TCP/TLS connections
+# to each identity provider alive across fetches and retries transient errors
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+))
+
+# (connect, read) timeouts in seconds
+_HTTP_TIMEOUT = (3.05, 10)
+
+# Async client for the FastAPI dependency path and the event loop it was
+# created on; its pooled connections belong to that loop, so a new loop
+# (e.g. each asyncio.run()) gets a new client
+_http_async: Optional[Tuple["weakref.ref[asyncio.AbstractEventLoop]", "httpx.AsyncClient"]] = None
+
+
+def _async_http() -> "httpx.AsyncClient":
+    """Async HTTP client for the running event loop, created on first use."""
+    global _http_async
+    loop = asyncio.get_running_loop()
+    if _http_async is None or _http_async[0]() is not loop:
+        import httpx
+        
+        _http_async = (weakref.ref(loop), httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=3.05),
+            transport=httpx.AsyncHTTPTransport(retries=3),
+        ))
+    return _http_async[1]
+
+
+# =============================================================================
+# JWT JSON Backend
+# =============================================================================
+
+# Opt-in via OAUTH_FAST_JSON=true (needs orjson)
+FAST_JWT_JSON = os.getenv("OAUTH_FAST_JSON", "false").lower() == "true" and ORJSON_AVAILABLE
+
+
+@lru_cache(maxsize=None)
+def _jwt():
+    """PyJWT module, imported on first token validation."""
+    import jwt
+    
+    if FAST_JWT_JSON:
+        _use_fast_jwt_json(jwt)
+    return jwt
+
+
+def _use_fast_jwt_json(jwt) -> None:
+    """
+    Decode JWT headers and claims with orjson instead of stdlib json.
+    
+    Only PyJWT's loads() is replaced; encoding keeps the stdlib so
+    separators/sort_keys/custom encoders behave as before.
+    orjson.JSONDecodeError subclasses ValueError, so malformed tokens still
+    surface as jwt.DecodeError.
+    """
+    fast_json = SimpleNamespace(
+        loads=orjson.loads,
+        dumps=json.dumps,
+        JSONEncoder=json.JSONEncoder,
+    )
+    jwt.api_jws.json = fast_json
+    jwt.api_jwt.json = fast_json
+
+
 # =============================================================================
 # JWKS Cache
 # =============================================================================
 
+@lru_cache(maxsize=None)
+def _jwk_loaders() -> Dict[str, Any]:
+    """JWK key type -> PyJWT algorithm family that can load it."""
+    algorithms = _jwt().algorithms
+    return {
+        "RSA": algorithms.RSAAlgorithm,
+        "EC": getattr(algorithms, "ECAlgorithm", None),
+    }
+
+
+def _parse_jwks(jwks: Dict) -> Dict[str, Any]:
+    """Public keys of a JWKS by kid; keys without a kid or of unknown type are skipped."""
+    parsed = {}
+    loaders = _jwk_loaders()
+    for key in jwks.get("keys", []):
+        kid = key.get("kid")
+        loader = loaders.get(key.get("kty", "RSA"))
+        if not kid or loader is None:
+            continue
+        try:
+            parsed[kid] = loader.from_jwk(key)
+        except Exception as e:
+            logger.warning(f"Skipping unusable JWK {kid}: {e}")
+    return parsed
+
+
 class JWKSCache:
-    """Cache for JSON Web Key Sets."""
+    """
+    Cache for JSON Web Key Sets.
+    
+    Fetches are single-flight per URI: concurrent misses wait for one
+    request instead of each calling the provider. Entries read in the last
+    10% of their TTL are refreshed in the background, so the hot path
+    rarely misses after a key rotation.
+    """
+    
+    # Fraction of the TTL before expiry at which a read triggers a refresh
+    REFRESH_FRACTION = 0.1
+    
+    # Minimum seconds between forced refreshes of one URI
+    MIN_REFRESH_INTERVAL = 60
     
     def __init__(self, ttl: int = 3600):
         self.ttl = ttl
-        self._cache: Dict[str, Tuple[Dict, float]] = {}
+        # uri -> (JWKS document, {kid: parsed public key}, expires_at)
+        self._cache: Dict[str, Tuple[Dict, Dict[str, Any], float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._last_refresh: Dict[str, float] = {}
+        # asyncio locks belong to one event loop: the loop these were made on
+        self._async_locks: Dict[str, asyncio.Lock] = {}
+        self._async_loop: Optional["weakref.ref[asyncio.AbstractEventLoop]"] = None
+    
+    def _lock_for(self, uri: str) -> threading.Lock:
+        return self._locks.setdefault(uri, threading.Lock())
+    
+    def _async_lock_for(self, uri: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is None or self._async_loop() is not loop:
+            self._async_locks = {}
+            self._async_loop = weakref.ref(loop)
+        return self._async_locks.setdefault(uri, asyncio.Lock())
+    
+    def _entry(self, uri: str) -> Optional[Tuple[Dict, Dict[str, Any], float]]:
+        entry = self._cache.get(uri)
+        if entry is None:
+            return None
+        remaining = entry[2] - time.time()
+        if remaining > 0:
+            if remaining < self.ttl * self.REFRESH_FRACTION:
+                self.prefetch_if_stale(uri)
+            return entry
+        self._cache.pop(uri, None)
+        return None
     
     def get(self, uri: str) -> Optional[Dict]:
         """Get JWKS from cache."""
-        if uri in self._cache:
-            jwks, expires_at = self._cache[uri]
-            if time.time() < expires_at:
-                return jwks
-            del self._cache[uri]
-        return None
+        entry = self._entry(uri)
+        return entry[0] if entry else None
     
     def set(self, uri: str, jwks: Dict) -> None:
-        """Set JWKS in cache."""
+        """Set JWKS in cache, parsing its keys once for token validation."""
         expires_at = time.time() + self.ttl
-        self._cache[uri] = (jwks, expires_at)
+        self._cache[uri] = (jwks, _parse_jwks(jwks), expires_at)
+    
+    def signing_keys(self, uri: str) -> Dict[str, Any]:
+        """Parsed public keys by key ID (kid), fetching the JWKS if needed."""
+        entry = self._entry(uri)
+        if entry is None:
+            self.fetch(uri)
+            entry = self._cache[uri]
+        return entry[1]
+    
+    def _download(self, uri: str) -> Dict:
+        response = _http.get(uri, timeout=_HTTP_TIMEOUT)
+        response.raise_for_status()
+        jwks = response.json()
+        self.set(uri, jwks)
+        return jwks
     
     def fetch(self, uri: str) -> Dict:
         """Fetch JWKS from URI with caching."""
@@ -119,15 +312,85 @@ class JWKSCache:
         if cached:
             return cached
         
-        try:
-            response = requests.get(uri, timeout=10)
-            response.raise_for_status()
-            jwks = response.json()
+        with self._lock_for(uri):
+            # Another thread may have fetched it while we waited
+            cached = self.get(uri)
+            if cached:
+                return cached
+            try:
+                return self._download(uri)
+            except Exception as e:
+                logger.error(f"Failed to fetch JWKS from {uri}: {e}")
+                raise HTTPException(status_code=500, detail="Failed to fetch signing keys")
+    
+    async def fetch_async(self, uri: str) -> Dict:
+        """Fetch JWKS from URI with caching, without blocking the event loop."""
+        cached = self.get(uri)
+        if cached:
+            return cached
+        
+        async with self._async_lock_for(uri):
+            # Another coroutine may have fetched it while we waited
+            cached = self.get(uri)
+            if cached:
+                return cached
+            try:
+                response = await _async_http().get(uri)
+                response.raise_for_status()
+                jwks = response.json()
+            except Exception as e:
+                logger.error(f"Failed to fetch JWKS from {uri}: {e}")
+                raise HTTPException(status_code=500, detail="Failed to fetch signing keys")
             self.set(uri, jwks)
             return jwks
-        except Exception as e:
-            logger.error(f"Failed to fetch JWKS from {uri}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to fetch signing keys")
+    
+    async def signing_keys_async(self, uri: str) -> Dict[str, Any]:
+        """Async variant of signing_keys()."""
+        entry = self._entry(uri)
+        if entry is None:
+            await self.fetch_async(uri)
+            entry = self._cache[uri]
+        return entry[1]
+    
+    def refresh(self, uri: str) -> bool:
+        """
+        Re-download the JWKS now, e.g. for a token signed with an unknown kid.
+        
+        Rate-limited to once per MIN_REFRESH_INTERVAL seconds per URI so
+        tokens with bogus key IDs cannot force a fetch per request.
+        Returns whether a refresh happened.
+        """
+        with self._lock_for(uri):
+            now = time.time()
+            if now - self._last_refresh.get(uri, 0.0) < self.MIN_REFRESH_INTERVAL:
+                return False
+            self._last_refresh[uri] = now
+            try:
+                self._download(uri)
+            except Exception as e:
+                logger.warning(f"JWKS refresh from {uri} failed: {e}")
+                return False
+            return True
+    
+    def prefetch_if_stale(self, uri: str) -> None:
+        """Refresh the JWKS for uri in the background if it is missing or near expiry."""
+        entry = self._cache.get(uri)
+        if entry is not None and entry[2] - time.time() >= self.ttl * self.REFRESH_FRACTION:
+            return
+        
+        lock = self._lock_for(uri)
+        if not lock.acquire(blocking=False):
+            return  # a fetch is already in flight
+        
+        def refresh() -> None:
+            try:
+                self._download(uri)
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh from {uri} failed: {e}")
+            finally:
+                lock.release()
+        
+        threading.Thread(target=refresh, name="jwks-refresh", daemon=True).start()
 
 
 # Global JWKS cache
@@ -139,37 +402,41 @@ _jwks_cache = JWKSCache()
 # =============================================================================
 
 def discover_provider(provider: OAuthProvider) -> OAuthProvider:
-    """Discover OAuth provider configuration from OIDC discovery endpoint."""
-    if not provider.discovery_url:
+    """
+    Discover OAuth provider configuration from OIDC discovery endpoint.
+    
+    Returns a copy of the provider with missing endpoints filled in; on
+    failure the returned copy has only discovery_url set.
+    """
+    discovery_url = provider.discovery_url or urljoin(
         # Try to construct discovery URL from issuer
-        provider.discovery_url = urljoin(
-            provider.issuer.rstrip("/") + "/",
-            ".well-known/openid-configuration"
-        )
+        provider.issuer.rstrip("/") + "/",
+        ".well-known/openid-configuration"
+    )
+    updates: Dict[str, Any] = {"discovery_url": discovery_url}
     
     try:
-        response = requests.get(provider.discovery_url, timeout=10)
+        response = _http.get(discovery_url, timeout=_HTTP_TIMEOUT)
         response.raise_for_status()
         config = response.json()
         
         # Update provider with discovered values
-        if not provider.jwks_uri:
-            provider.jwks_uri = config.get("jwks_uri")
-        if not provider.authorization_url:
-            provider.authorization_url = config.get("authorization_endpoint")
-        if not provider.token_url:
-            provider.token_url = config.get("token_endpoint")
-        if not provider.userinfo_url:
-            provider.userinfo_url = config.get("userinfo_endpoint")
-        if not provider.introspection_url:
-            provider.introspection_url = config.get("introspection_endpoint")
+        for attr, key in (
+            ("jwks_uri", "jwks_uri"),
+            ("authorization_url", "authorization_endpoint"),
+            ("token_url", "token_endpoint"),
+            ("userinfo_url", "userinfo_endpoint"),
+            ("introspection_url", "introspection_endpoint"),
+        ):
+            if not getattr(provider, attr):
+                updates[attr] = config.get(key)
         
         logger.info(f"Discovered OAuth provider: {provider.name}")
-        return provider
         
     except Exception as e:
         logger.warning(f"Failed to discover provider {provider.name}: {e}")
-        return provider
+    
+    return provider.model_copy(update=updates)
 
 
 # =============================================================================
@@ -179,6 +446,9 @@ def discover_provider(provider: OAuthProvider) -> OAuthProvider:
 class TokenInfo(BaseModel):
     """Validated token information."""
     
+    # Instances are shared across requests through the token cache
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+    
     sub: str = Field(..., description="Subject (user ID)")
     email: Optional[str] = Field(None, description="User email")
     tenant_id: Optional[str] = Field(None, description="Tenant ID")
@@ -189,15 +459,12 @@ class TokenInfo(BaseModel):
     raw_claims: Dict[str, Any] = Field(default={}, description="Raw JWT claims")
 
 
-def get_signing_key(token: str, provider: OAuthProvider) -> Any:
-    """Get signing key for token validation."""
-    if not provider.jwks_uri:
-        raise HTTPException(status_code=500, detail="JWKS URI not configured")
-    
-    # Get JWKS
-    jwks = _jwks_cache.fetch(provider.jwks_uri)
-    
-    # Decode token header to get kid
+_TOKEN_INFO_ADAPTER = TypeAdapter(TokenInfo)
+
+
+def _token_kid(token: str) -> str:
+    """Key ID (kid) from the unverified token header."""
+    jwt = _jwt()
     try:
         unverified_header = jwt.get_unverified_header(token)
     except jwt.exceptions.DecodeError:
@@ -206,53 +473,71 @@ def get_signing_key(token: str, provider: OAuthProvider) -> Any:
     kid = unverified_header.get("kid")
     if not kid:
         raise HTTPException(status_code=401, detail="Token missing key ID (kid)")
+    return kid
+
+
+def get_signing_key(token: str, provider: OAuthProvider) -> Any:
+    """Get signing key for token validation."""
+    if not provider.jwks_uri:
+        raise HTTPException(status_code=500, detail="JWKS URI not configured")
     
-    # Find matching key
-    for key in jwks.get("keys", []):
-        if key.get("kid") == kid:
-            return jwt.algorithms.RSAAlgorithm.from_jwk(key)
+    kid = _token_kid(token)
+    keys = _jwks_cache.signing_keys(provider.jwks_uri)
     
-    raise HTTPException(status_code=401, detail="Signing key not found")
+    # Find matching key; an unknown kid may mean the provider rotated keys
+    key = keys.get(kid)
+    if key is None and _jwks_cache.refresh(provider.jwks_uri):
+        key = _jwks_cache.signing_keys(provider.jwks_uri).get(kid)
+    if key is None:
+        raise HTTPException(status_code=401, detail="Signing key not found")
+    return key
+
+
+async def get_signing_key_async(token: str, provider: OAuthProvider) -> Any:
+    """Get signing key for token validation without blocking the event loop."""
+    if not provider.jwks_uri:
+        raise HTTPException(status_code=500, detail="JWKS URI not configured")
+    
+    kid = _token_kid(token)
+    keys = await _jwks_cache.signing_keys_async(provider.jwks_uri)
+    
+    key = keys.get(kid)
+    if key is None and await asyncio.to_thread(_jwks_cache.refresh, provider.jwks_uri):
+        key = _jwks_cache.signing_keys(provider.jwks_uri).get(kid)
+    if key is None:
+        raise HTTPException(status_code=401, detail="Signing key not found")
+    return key
 
 
 def validate_token(token: str, provider: OAuthProvider) -> TokenInfo:
     """Validate JWT token and extract claims."""
+    return _decode_token(token, provider, get_signing_key(token, provider))
+
+
+async def validate_token_async(token: str, provider: OAuthProvider) -> TokenInfo:
+    """Validate JWT token and extract claims, fetching keys asynchronously."""
+    return _decode_token(token, provider, await get_signing_key_async(token, provider))
+
+
+def _decode_token(token: str, provider: OAuthProvider, signing_key: Any) -> TokenInfo:
+    """Verify the token against signing_key and map its claims to TokenInfo."""
+    jwt = _jwt()
     try:
-        # Get signing key
-        signing_key = get_signing_key(token, provider)
-        
-        # Build validation options
-        options = {
-            "verify_signature": True,
-            "verify_exp": provider.verify_exp,
-            "verify_aud": provider.verify_aud,
-            "require": ["sub"],
-        }
-        
         # Decode and validate token
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256", "RS384", "RS512"],
-            audience=provider.audience if provider.verify_aud else None,
-            issuer=provider.issuer,
-            leeway=provider.leeway,
-            options=options,
-        )
+        claims = jwt.decode(token, signing_key, **provider.validation_ctx)
         
         # Extract claims
-        token_info = TokenInfo(
-            sub=claims.get("sub"),
-            email=claims.get(provider.email_claim),
-            tenant_id=claims.get(provider.tenant_claim),
-            roles=claims.get(provider.roles_claim, []),
-            scopes=claims.get("scope", "").split() if isinstance(claims.get("scope"), str) else claims.get("scope", []),
-            provider=provider.name,
-            expires_at=datetime.fromtimestamp(claims["exp"]) if "exp" in claims else None,
-            raw_claims=claims,
-        )
-        
-        return token_info
+        scope = claims.get("scope", [])
+        return _TOKEN_INFO_ADAPTER.validate_python({
+            "sub": claims.get("sub"),
+            "email": claims.get(provider.email_claim),
+            "tenant_id": claims.get(provider.tenant_claim),
+            "roles": claims.get(provider.roles_claim, []),
+            "scopes": scope.split() if isinstance(scope, str) else scope,
+            "provider": provider.name,
+            "expires_at": datetime.fromtimestamp(claims["exp"]) if "exp" in claims else None,
+            "raw_claims": claims,
+        })
         
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -265,6 +550,62 @@ def validate_token(token: str, provider: OAuthProvider) -> TokenInfo:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+# =============================================================================
+# Validated Token Cache
+# =============================================================================
+
+class TokenCache:
+    """
+    LRU cache of validated tokens.
+    
+    Entries live until the token expires or for at most ``ttl`` seconds,
+    whichever comes first. Only successful validations are stored.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: int = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, TokenInfo]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: bytes) -> Optional[TokenInfo]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: bytes, token_info: TokenInfo) -> None:
+        expires_at = time.time() + self.ttl
+        exp = token_info.raw_claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, token_info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _token_cache_key(token: str, provider_name: str) -> bytes:
+    """Digest identifying a token for a provider, so raw tokens are not kept as keys."""
+    return hashlib.blake2b(f"{provider_name}:{token}".encode(), digest_size=16).digest()
+
+
+# Global validated-token cache
+_token_cache = TokenCache(ttl=int(os.getenv("OAUTH_TOKEN_CACHE_TTL", "300")))
+
+
 # =============================================================================
 # OAuth Authenticator
 # =============================================================================
@@ -272,19 +613,57 @@ def validate_token(token: str, provider: OAuthProvider) -> TokenInfo:
 class OAuthAuthenticator:
     """OAuth 2.0 / OIDC authenticator for SetuPranali."""
     
+    # Overall budget for provider discovery at startup, in seconds
+    DISCOVERY_TIMEOUT = 10
+    # Minimum seconds between lazy rediscovery attempts for one provider
+    REDISCOVERY_INTERVAL = 60
+    
     def __init__(self, config: OAuthConfig):
         self.config = config
         self.providers: Dict[str, OAuthProvider] = {}
+        # Provider name -> earliest time to retry discovery that failed
+        self._undiscovered: Dict[str, float] = {}
+        # Startup discoveries that overran DISCOVERY_TIMEOUT, by provider name
+        self._discovery_futures: Dict[str, Future] = {}
+        self._discovery_lock = threading.Lock()
         
-        # Initialize providers
-        for provider in config.providers:
-            discovered = discover_provider(provider)
-            self.providers[provider.name] = discovered
+        if not config.enabled:
+            # Nothing will be validated; skip discovery and its network calls
+            self.providers = {p.name: p for p in config.providers}
+        elif config.providers:
+            # Initialize providers, one discovery roundtrip per IdP in parallel
+            executor = ThreadPoolExecutor(
+                max_workers=len(config.providers),
+                thread_name_prefix="oidc-discovery"
+            )
+            futures = {executor.submit(discover_provider, p): p for p in config.providers}
+            done, _ = wait(futures, timeout=self.DISCOVERY_TIMEOUT)
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            for future, provider in futures.items():
+                if future not in done:
+                    self._discovery_futures[provider.name] = future
+                else:
+                    provider = future.result()
+                self.providers[provider.name] = provider
+                if not provider.jwks_uri:
+                    self._undiscovered[provider.name] = 0.0
+                else:
+                    # Warm the signing keys in the background before the first request
+                    _jwks_cache.prefetch_if_stale(provider.jwks_uri)
         
+        if self._undiscovered:
+            logger.warning(f"OAuth discovery deferred for: {', '.join(self._undiscovered)}")
         logger.info(f"OAuth initialized with {len(self.providers)} providers")
     
     def get_provider(self, name: Optional[str] = None) -> OAuthProvider:
         """Get OAuth provider by name."""
+        provider = self._lookup_provider(name)
+        if provider is not None and provider.name in self._undiscovered:
+            provider = self._rediscover(provider)
+        return provider
+    
+    def _lookup_provider(self, name: Optional[str]) -> OAuthProvider:
         if name:
             if name not in self.providers:
                 raise HTTPException(status_code=400, detail=f"Unknown OAuth provider: {name}")
@@ -300,13 +679,65 @@ class OAuthAuthenticator:
         
         raise HTTPException(status_code=500, detail="No OAuth providers configured")
     
+    def _rediscover(self, provider: OAuthProvider) -> OAuthProvider:
+        """Retry discovery that failed or timed out at startup, at most once per interval."""
+        name = provider.name
+        with self._discovery_lock:
+            retry_at = self._undiscovered.get(name)
+            if retry_at is None or time.monotonic() < retry_at:
+                return self.providers[name]
+            
+            # A discovery that overran the startup budget may have finished since
+            future = self._discovery_futures.get(name)
+            if future is not None and not future.done():
+                return provider
+            self._discovery_futures.pop(name, None)
+            discovered = future.result() if future is not None else provider
+            if not discovered.jwks_uri:
+                discovered = discover_provider(provider)
+            
+            self.providers[name] = discovered
+            if discovered.jwks_uri:
+                del self._undiscovered[name]
+            else:
+                self._undiscovered[name] = time.monotonic() + self.REDISCOVERY_INTERVAL
+            return discovered
+    
     def authenticate(self, token: str, provider_name: Optional[str] = None) -> TokenInfo:
         """Authenticate using OAuth token."""
         if not self.config.enabled:
             raise HTTPException(status_code=500, detail="OAuth authentication not enabled")
         
         provider = self.get_provider(provider_name)
-        return validate_token(token, provider)
+        
+        # Tokens are reused across bursts of requests; skip re-verifying them
+        key = _token_cache_key(token, provider.name)
+        token_info = _token_cache.get(key)
+        if token_info is not None:
+            return token_info
+        
+        token_info = validate_token(token, provider)
+        _token_cache.put(key, token_info)
+        return token_info
+    
+    async def authenticate_async(self, token: str, provider_name: Optional[str] = None) -> TokenInfo:
+        """Authenticate using OAuth token; JWKS fetches do not block the event loop."""
+        if not self.config.enabled:
+            raise HTTPException(status_code=500, detail="OAuth authentication not enabled")
+        
+        provider = self._lookup_provider(provider_name)
+        if provider is not None and provider.name in self._undiscovered:
+            # Rediscovery is a blocking HTTP request; keep it off the event loop
+            provider = await asyncio.to_thread(self._rediscover, provider)
+        
+        key = _token_cache_key(token, provider.name)
+        token_info = _token_cache.get(key)
+        if token_info is not None:
+            return token_info
+        
+        token_info = await validate_token_async(token, provider)
+        _token_cache.put(key, token_info)
+        return token_info
     
     def authenticate_from_header(
         self,
@@ -317,12 +748,15 @@ class OAuthAuthenticator:
         if not authorization:
             raise HTTPException(status_code=401, detail="Missing authorization header")
         
-        # Parse Bearer token
-        parts = authorization.split()
-        if len(parts) != 2 or parts[0].lower() != "bearer":
+        # Parse Bearer token: "Bearer <token>", scheme case-insensitive
+        scheme, _, token = authorization.strip().partition(" ")
+        if (
+            scheme.lower() != "bearer"
+            or not token
+            or any(c.isspace() for c in token)
+        ):
             raise HTTPException(status_code=401, detail="Invalid authorization header format")
         
-        token = parts[1]
         return self.authenticate(token, provider_name)
 
 
@@ -374,7 +808,7 @@ async def get_oauth_token_info(
     provider_name = request.headers.get("X-OAuth-Provider")
     
     try:
-        return _oauth_authenticator.authenticate(credentials.credentials, provider_name)
+        return await _oauth_authenticator.authenticate_async(credentials.credentials, provider_name)
     except HTTPException:
         if _oauth_authenticator.config.allow_api_keys:
             return None  # Allow fallback to API key
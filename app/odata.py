@@ -22,22 +22,62 @@ All queries internally route to compile_and_run_query().
 """
 
 from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import Response
-from typing import Any, Dict, List, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import os
 import re
-import xml.etree.ElementTree as ET
+import string
+import threading
+import time
 
-from app.domain.sources.catalog import load_catalog, get_dataset
+from app.domain.sources.catalog import CATALOG_PATH, load_catalog, get_dataset
 from app.shared.types.models import QueryRequest, QueryDimension, QueryMetric, OrderBy
 from app.domain.query.engine import compile_and_run_query
 from app.domain.sources.manager import SOURCES
 from app.connection_manager import get_engine_and_conn
 from app.core.security import require_api_key, TenantContext
-from app.infrastructure.cache.redis_cache import execute_with_cache, build_cache_components_from_request
+from app.infrastructure.cache.redis_cache import (
+    execute_with_cache,
+    build_cache_components_from_request,
+    build_cache_key,
+    get_cache_config,
+)
+from app.infrastructure.observability.analytics import get_metrics
 from app.shared.exceptions.errors import dataset_not_found, internal_error, SetuPranaliError
+from app.shared.utils.serialization import ORJSON_AVAILABLE, orjson
 
 router = APIRouter()
 
+# Patterns used while parsing $filter and entity names, compiled once
+_RE_IN = re.compile(r"(\w+)\s+in\s*\((.+)\)", re.IGNORECASE)
+_RE_CMP = re.compile(r"(\w+)\s+(eq|ne|gt|ge|lt|le)\s+(.+)", re.IGNORECASE)
+_RE_INC = re.compile(r"(\w+)\s+(ge|gt|le|lt)\s+(.+)", re.IGNORECASE)
+# Power BI incremental refresh window: "col ge <from> and col lt <to>"
+_RE_INC_RANGE = re.compile(
+    r"\s*(\w+)\s+ge\s+(?!and )([^\s()]+) +and +\1\s+lt\s+([^\s()]+)\s*", re.IGNORECASE
+)
+_RE_COMMA = re.compile(r",\s*")
+_RE_PASCAL_SPLIT = re.compile(r"[-_]")
+# One $orderby item: first token is the field, optional second the direction
+_RE_ORDERBY = re.compile(r"([^\s,]+)(?:[^\S,]+([^\s,]+))?[^,]*")
+
+# Map OData comparison operators to our internal operators
+_ODATA_OPS = {
+    "eq": "eq",
+    "ne": "ne",
+    "gt": "gt",
+    "ge": "gte",  # OData 'ge' → our 'gte'
+    "lt": "lt",
+    "le": "lte",  # OData 'le' → our 'lte'
+}
+
+# Lowercases ASCII only, so indices in the result line up with the original
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
 # =============================================================================
 # TYPE MAPPING: Catalog types → OData EDM types
 # =============================================================================
@@ -67,7 +107,39 @@ def _get_edm_type(catalog_type: str) -> str:
 # EDMX METADATA GENERATION
 # =============================================================================
 
-def generate_edmx(datasets: List[dict], service_root: str) -> str:
+# (entity set name, entity type name, {property name: EDM type}) per dataset
+EntityIndex = List[Tuple[str, str, Dict[str, str]]]
+
+
+def build_odata_indexes(datasets: List[dict]) -> EntityIndex:
+    """
+    Precompute the EDMX shape of each dataset.
+    
+    The entity names and property types depend only on the catalog, so this
+    runs once per catalog version rather than per $metadata request.
+    """
+    return [
+        (ds["id"], _to_pascal_case(ds["id"]), _collect_odata_properties(ds))
+        for ds in datasets
+    ]
+
+
+_XML_ATTR_ESCAPES = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+    "\r": "&#13;", "\n": "&#10;", "\t": "&#09;",
+})
+
+
+def _xml_attr(value: str) -> str:
+    """Escape a value for a double-quoted XML attribute."""
+    return value.translate(_XML_ATTR_ESCAPES)
+
+
+def generate_edmx(
+    datasets: List[dict],
+    service_root: str,
+    entities: Optional[EntityIndex] = None
+) -> str:
     """
     Generate minimal EDMX XML for Power BI.
     
@@ -77,55 +149,45 @@ def generate_edmx(datasets: List[dict], service_root: str) -> str:
     - Metric names
     
     Power BI uses this to build the field picker in the query editor.
+    ``entities`` is the precomputed build_odata_indexes(datasets), if any.
     """
-    # XML namespaces for OData v4
-    ns_edmx = "http://docs.oasis-open.org/odata/ns/edmx"
-    ns_edm = "http://docs.oasis-open.org/odata/ns/edm"
-    
-    # Root EDMX element
-    root = ET.Element("edmx:Edmx", {
-        "xmlns:edmx": ns_edmx,
-        "Version": "4.0"
-    })
-    
-    data_services = ET.SubElement(root, "edmx:DataServices")
+    if entities is None:
+        entities = build_odata_indexes(datasets)
     
-    # Single schema containing all entity types
-    schema = ET.SubElement(data_services, "Schema", {
-        "xmlns": ns_edm,
-        "Namespace": "SetuPranali"
-    })
-    
-    # Entity container (lists all entity sets)
-    container = ET.SubElement(schema, "EntityContainer", {"Name": "Default"})
-    
-    for ds in datasets:
-        dataset_id = ds["id"]
-        entity_type_name = _to_pascal_case(dataset_id)
-        
-        # Create EntityType with properties
-        entity_type = ET.SubElement(schema, "EntityType", {"Name": entity_type_name})
-        
-        # Collect all available properties (fields + dimensions + metrics)
-        properties = _collect_odata_properties(ds)
-        
-        for prop_name, prop_type in properties.items():
-            ET.SubElement(entity_type, "Property", {
-                "Name": prop_name,
-                "Type": prop_type,
-                "Nullable": "true"
-            })
-        
-        # Register as EntitySet in container
-        ET.SubElement(container, "EntitySet", {
-            "Name": dataset_id,
-            "EntityType": f"SetuPranali.{entity_type_name}"
-        })
+    # Entity container (lists all entity sets) precedes the entity types
+    entity_sets = [
+        f'        <EntitySet Name="{_xml_attr(dataset_id)}" '
+        f'EntityType="SetuPranali.{_xml_attr(entity_type_name)}" />'
+        for dataset_id, entity_type_name, _ in entities
+    ]
+    if entity_sets:
+        lines = ['      <EntityContainer Name="Default">', *entity_sets, "      </EntityContainer>"]
+    else:
+        lines = ['      <EntityContainer Name="Default" />']
     
-    # Serialize to XML string
-    ET.indent(root, space="  ")
-    xml_str = ET.tostring(root, encoding="unicode", xml_declaration=True)
-    return xml_str
+    # One EntityType per dataset with properties (fields + dimensions + metrics)
+    for _, entity_type_name, properties in entities:
+        if not properties:
+            lines.append(f'      <EntityType Name="{_xml_attr(entity_type_name)}" />')
+            continue
+        lines.append(f'      <EntityType Name="{_xml_attr(entity_type_name)}">')
+        lines.extend(
+            f'        <Property Name="{_xml_attr(prop_name)}" '
+            f'Type="{_xml_attr(prop_type)}" Nullable="true" />'
+            for prop_name, prop_type in properties.items()
+        )
+        lines.append("      </EntityType>")
+    
+    return "\n".join([
+        "<?xml version='1.0' encoding='utf-8'?>",
+        '<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">',
+        "  <edmx:DataServices>",
+        '    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="SetuPranali">',
+        *lines,
+        "    </Schema>",
+        "  </edmx:DataServices>",
+        "</edmx:Edmx>",
+    ])
 
 
 def _collect_odata_properties(dataset: dict) -> Dict[str, str]:
@@ -165,7 +227,7 @@ def _collect_odata_properties(dataset: dict) -> Dict[str, str]:
 
 def _to_pascal_case(s: str) -> str:
     """Convert snake_case or kebab-case to PascalCase."""
-    return "".join(word.capitalize() for word in re.split(r"[-_]", s))
+    return "".join(word.capitalize() for word in _RE_PASCAL_SPLIT.split(s))
 
 
 # =============================================================================
@@ -204,6 +266,16 @@ def parse_odata_filter(filter_str: str) -> Optional[dict]:
             return conditions[0]
         return {"and": conditions} if conditions else None
     
+    return _parse_conjunct(filter_str)
+
+
+def _parse_conjunct(filter_str: str) -> Optional[dict]:
+    """
+    Parse one top-level AND operand: an 'or' group or a single condition.
+    
+    Callers that have already split on ' and ' use this directly so the
+    operand is not scanned for ' and ' a second time.
+    """
     # Handle 'or' combinator
     or_parts = _split_top_level(filter_str, " or ")
     if len(or_parts) > 1:
@@ -220,35 +292,34 @@ def parse_odata_filter(filter_str: str) -> Optional[dict]:
 def _split_top_level(s: str, delimiter: str) -> List[str]:
     """
     Split string by delimiter, but only at top level (not inside parentheses).
-    Case-insensitive for the delimiter.
+    Case-insensitive for the delimiter (an ASCII keyword such as " and ").
+    
+    Jumps between delimiter occurrences with str.find and tracks paren
+    depth by counting parens in the text skipped over.
     """
     result = []
-    current = []
-    depth = 0
-    i = 0
+    low = s.translate(_ASCII_LOWER)
     delim_lower = delimiter.lower()
-    
-    while i < len(s):
-        char = s[i]
-        
-        if char == '(':
-            depth += 1
-            current.append(char)
-        elif char == ')':
-            depth -= 1
-            current.append(char)
-        elif depth == 0 and s[i:i+len(delimiter)].lower() == delim_lower:
-            result.append("".join(current).strip())
-            current = []
-            i += len(delimiter)
-            continue
+    width = len(delim_lower)
+    depth = 0
+    start = 0
+    pos = 0
+    
+    while True:
+        i = low.find(delim_lower, pos)
+        if i == -1:
+            break
+        depth += s.count("(", pos, i) - s.count(")", pos, i)
+        if depth == 0:
+            result.append(s[start:i].strip())
+            start = pos = i + width
         else:
-            current.append(char)
-        
-        i += 1
+            # Inside parentheses: keep looking from the next character (the
+            # delimiter contains no parens, so skipping s[i] keeps depth right)
+            pos = i + 1
     
-    if current:
-        result.append("".join(current).strip())
+    if start < len(s):
+        result.append(s[start:].strip())
     
     return result
 
@@ -270,7 +341,7 @@ def _parse_single_condition(cond_str: str) -> Optional[dict]:
         cond_str = cond_str[1:-1].strip()
     
     # Match 'in' operator: field in ('val1', 'val2')
-    in_match = re.match(r"(\w+)\s+in\s*\((.+)\)", cond_str, re.IGNORECASE)
+    in_match = _RE_IN.match(cond_str)
     if in_match:
         field = in_match.group(1)
         values_str = in_match.group(2)
@@ -279,22 +350,13 @@ def _parse_single_condition(cond_str: str) -> Optional[dict]:
     
     # Match comparison operators: field op value
     # Operators: eq, ne, gt, ge, lt, le
-    comp_match = re.match(r"(\w+)\s+(eq|ne|gt|ge|lt|le)\s+(.+)", cond_str, re.IGNORECASE)
+    comp_match = _RE_CMP.match(cond_str)
     if comp_match:
         field = comp_match.group(1)
         op_str = comp_match.group(2).lower()
         value_str = comp_match.group(3).strip()
         
-        # Map OData operators to our internal operators
-        op_map = {
-            "eq": "eq",
-            "ne": "ne",
-            "gt": "gt",
-            "ge": "gte",  # OData 'ge' → our 'gte'
-            "lt": "lt",
-            "le": "lte",  # OData 'le' → our 'lte'
-        }
-        op = op_map[op_str]
+        op = _ODATA_OPS[op_str]
         value = _parse_value(value_str)
         
         return {"field": field, "op": op, "value": value}
@@ -304,12 +366,8 @@ def _parse_single_condition(cond_str: str) -> Optional[dict]:
 
 def _parse_in_values(values_str: str) -> List[Any]:
     """Parse comma-separated values from IN clause."""
-    values = []
     # Split by comma, handling quoted strings
-    parts = re.split(r",\s*", values_str)
-    for part in parts:
-        values.append(_parse_value(part.strip()))
-    return values
+    return [_parse_value(part) for part in _RE_COMMA.split(values_str)]
 
 
 def _parse_value(value_str: str) -> Any:
@@ -323,30 +381,39 @@ def _parse_value(value_str: str) -> Any:
     - null → None
     """
     value_str = value_str.strip()
+    first = value_str[:1]
     
     # String literals (single or double quotes)
-    if (value_str.startswith("'") and value_str.endswith("'")) or \
-       (value_str.startswith('"') and value_str.endswith('"')):
+    if first and first in "'\"" and value_str.endswith(first):
         return value_str[1:-1]
     
-    # Boolean
-    if value_str.lower() == "true":
+    # Numbers: route on the characters so plain strings and dates such as
+    # 2025-01-01 never raise; only float spellings and digit separators
+    # (1_000) go through a try
+    if first.isdigit() or (first and first in "+-."):
+        digits = value_str[1:] if first in "+-" else value_str
+        if "." in digits:
+            try:
+                return float(value_str)
+            except ValueError:
+                pass
+        elif digits.isdecimal():
+            return int(value_str)
+        elif "_" in digits:
+            try:
+                return int(value_str)
+            except ValueError:
+                pass
+    
+    # Boolean / null
+    lowered = value_str.lower()
+    if lowered == "true":
         return True
-    if value_str.lower() == "false":
+    if lowered == "false":
         return False
-    
-    # Null
-    if value_str.lower() == "null":
+    if lowered == "null":
         return None
     
-    # Numbers
-    try:
-        if "." in value_str:
-            return float(value_str)
-        return int(value_str)
-    except ValueError:
-        pass
-    
     # Fallback: return as string
     return value_str
 
@@ -363,32 +430,31 @@ def parse_odata_orderby(orderby_str: str) -> List[OrderBy]:
     - "revenue desc" → [OrderBy(field="revenue", direction="desc")]
     - "city asc, revenue desc" → [OrderBy(...), OrderBy(...)]
     """
-    if not orderby_str or not orderby_str.strip():
+    if not orderby_str:
         return []
     
     result = []
-    parts = orderby_str.split(",")
-    
-    for part in parts:
-        part = part.strip()
-        if not part:
-            continue
-        
-        tokens = part.split()
-        if len(tokens) >= 2:
-            field = tokens[0]
-            direction = tokens[1].lower()
-            if direction not in ("asc", "desc"):
-                direction = "asc"
-        else:
-            field = tokens[0]
+    for field, direction in _RE_ORDERBY.findall(orderby_str):
+        direction = direction.lower()
+        if direction not in ("asc", "desc"):
             direction = "asc"
-        
-        result.append(OrderBy(field=field, direction=direction))
+        # Values are already checked above, so skip pydantic validation
+        result.append(OrderBy.model_construct(field=field, direction=direction))
     
     return result
 
 
+@lru_cache(maxsize=512)
+def _parse_orderby_cached(orderby_str: str) -> Tuple[OrderBy, ...]:
+    """
+    parse_odata_orderby memoized on the raw $orderby string.
+    
+    Power BI repeats the same sort spec on every page and refresh. OrderBy
+    is frozen, so the cached instances can be shared between requests.
+    """
+    return tuple(parse_odata_orderby(orderby_str))
+
+
 # =============================================================================
 # INCREMENTAL REFRESH DETECTION (Power BI)
 # =============================================================================
@@ -416,9 +482,16 @@ def detect_incremental_from_odata_filter(
         Input: "order_date ge 2025-01-01 and city eq 'Delhi'"
         Output: ("2025-01-01", None, {"field": "city", "op": "eq", "value": "Delhi"})
     """
-    if not filter_str or not inc_column:
+    if not filter_str:
+        return None, None, None
+    if not inc_column:
         return None, None, parse_odata_filter(filter_str)
     
+    # Fast path for the exact window Power BI sends on incremental refresh
+    window = _RE_INC_RANGE.fullmatch(filter_str)
+    if window and window.group(1).lower() == inc_column.lower():
+        return _parse_value(window.group(2)), _parse_value(window.group(3)), None
+    
     inc_from = None
     inc_to = None
     remaining_conditions = []
@@ -449,14 +522,19 @@ def detect_incremental_from_odata_filter(
             # Not an incremental condition - keep it
             remaining_conditions.append(part)
     
-    # Rebuild remaining filters
+    # Whole filter was the incremental window: nothing left to parse
+    if not remaining_conditions:
+        return inc_from, inc_to, None
+    
+    # Build remaining filters straight from the parts already split above;
+    # each is a top-level AND operand, so skip the ' and ' pass
+    conditions = [_parse_conjunct(part) for part in remaining_conditions]
+    conditions = [c for c in conditions if c is not None]
     remaining_filter = None
-    if remaining_conditions:
-        if len(remaining_conditions) == 1:
-            remaining_filter = parse_odata_filter(remaining_conditions[0])
-        else:
-            # Rejoin with AND
-            remaining_filter = parse_odata_filter(" and ".join(remaining_conditions))
+    if len(conditions) == 1:
+        remaining_filter = conditions[0]
+    elif conditions:
+        remaining_filter = {"and": conditions}
     
     return inc_from, inc_to, remaining_filter
 
@@ -483,7 +561,7 @@ def _match_incremental_condition(
         cond_str = cond_str[1:-1].strip()
     
     # Match pattern: field op value
-    match = re.match(r"(\w+)\s+(ge|gt|le|lt)\s+(.+)", cond_str, re.IGNORECASE)
+    match = _RE_INC.match(cond_str)
     if not match:
         return None
     
@@ -505,6 +583,23 @@ def _match_incremental_condition(
 # ODATA $select PARSING → dimensions + metrics
 # =============================================================================
 
+# id(dataset) -> (dataset, metric names). The dataset itself is kept in the
+# entry so its id cannot be reused by another dict while the entry exists.
+_METRIC_NAMES_CACHE_SIZE = 256
+_metric_names_cache: Dict[int, Tuple[dict, frozenset]] = {}
+
+
+def _metric_names(dataset: dict) -> frozenset:
+    """Names of a dataset's metrics, computed once per catalog dataset dict."""
+    entry = _metric_names_cache.get(id(dataset))
+    if entry is None or entry[0] is not dataset:
+        if len(_metric_names_cache) >= _METRIC_NAMES_CACHE_SIZE:
+            _metric_names_cache.clear()
+        entry = (dataset, frozenset(m["name"] for m in dataset.get("metrics", [])))
+        _metric_names_cache[id(dataset)] = entry
+    return entry[1]
+
+
 def parse_odata_select(
     select_str: str,
     dataset: dict
@@ -522,9 +617,9 @@ def parse_odata_select(
         # No $select = return default dimensions + metrics
         return _get_default_selections(dataset)
     
-    # Get known metrics and dimensions from dataset
-    metric_names = {m["name"] for m in dataset.get("metrics", [])}
-    dim_names = {d["name"] for d in dataset.get("dimensions", [])}
+    # Known metrics from dataset; dimensions and unknown fields (raw
+    # columns) are both treated as dimensions
+    metric_names = _metric_names(dataset)
     
     # Parse comma-separated field names
     fields = [f.strip() for f in select_str.split(",") if f.strip()]
@@ -532,14 +627,12 @@ def parse_odata_select(
     dimensions = []
     metrics = []
     
+    # Names are plain strings from the URL, so the models skip validation
     for field in fields:
         if field in metric_names:
-            metrics.append(QueryMetric(name=field))
-        elif field in dim_names:
-            dimensions.append(QueryDimension(name=field))
+            metrics.append(QueryMetric.model_construct(name=field))
         else:
-            # Unknown field - treat as dimension (raw column)
-            dimensions.append(QueryDimension(name=field))
+            dimensions.append(QueryDimension.model_construct(name=field))
     
     return dimensions, metrics
 
@@ -551,6 +644,169 @@ def _get_default_selections(dataset: dict) -> Tuple[List[QueryDimension], List[Q
     return dimensions, metrics
 
 
+# =============================================================================
+# CATALOG CACHE
+# =============================================================================
+# Power BI polls the service document and $metadata often; the catalog is
+# parsed once per catalog.yaml modification instead of on every request.
+
+@lru_cache(maxsize=1)
+def _catalog_at(mtime_ns: int) -> dict:
+    """Parsed catalog for the given catalog.yaml modification time."""
+    return load_catalog()
+
+
+@lru_cache(maxsize=128)
+def _dataset_at(mtime_ns: int, dataset_id: str) -> dict:
+    """Dataset from the catalog at mtime_ns; raises KeyError if absent."""
+    return get_dataset(_catalog_at(mtime_ns), dataset_id)
+
+
+def _cached_catalog() -> dict:
+    """The current catalog, re-read only when catalog.yaml has changed."""
+    return _catalog_at(CATALOG_PATH.stat().st_mtime_ns)
+
+
+def _cached_dataset(dataset_id: str) -> dict:
+    """A dataset from the current catalog; raises KeyError if absent."""
+    return _dataset_at(CATALOG_PATH.stat().st_mtime_ns, dataset_id)
+
+
+@lru_cache(maxsize=1)
+def _odata_indexes_at(mtime_ns: int) -> EntityIndex:
+    """build_odata_indexes() for the catalog at mtime_ns."""
+    return build_odata_indexes(_catalog_at(mtime_ns).get("datasets", []))
+
+
+@lru_cache(maxsize=8)
+def _edmx_at(mtime_ns: int, service_root: str) -> bytes:
+    """Serialized EDMX document for the catalog at mtime_ns."""
+    datasets = _catalog_at(mtime_ns).get("datasets", [])
+    return generate_edmx(datasets, service_root, entities=_odata_indexes_at(mtime_ns)).encode("utf-8")
+
+
+def invalidate_catalog_cache() -> None:
+    """Drop cached catalog data (e.g. after an in-place edit within the mtime resolution)."""
+    _catalog_at.cache_clear()
+    _dataset_at.cache_clear()
+    _odata_indexes_at.cache_clear()
+    _edmx_at.cache_clear()
+
+
+def _json_response(payload: dict):
+    """
+    Encode a response payload with orjson when possible.
+    
+    Row sets can be large, and orjson encodes them in C straight to bytes.
+    Payloads it cannot encode (e.g. Decimal values) and installs without
+    orjson are returned as-is for FastAPI's own encoder.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return Response(content=orjson.dumps(payload), media_type="application/json")
+        except TypeError:
+            pass
+    return payload
+
+
+# =============================================================================
+# L0 RESULT CACHE
+# =============================================================================
+# Power BI refreshes partitions in parallel and often repeats an identical
+# query (same partition, same tenant) within seconds. A short-lived
+# in-process cache in front of Redis answers those without a round-trip.
+
+class _ResultCache:
+    """
+    Small TTL + LRU cache of (columns, rows, stats) query results.
+    
+    Keys are full Redis cache keys, so tenant and role are always part of
+    the key and tenants never share entries.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[List, List, Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Tuple[List, List, Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: str, result: Tuple[List, List, Dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_l0_cache = _ResultCache(ttl=float(os.getenv("ODATA_L0_CACHE_TTL", "5")))
+
+
+def _execute_with_l0_cache(execute_fn, cache_components) -> Tuple[List, List, Dict]:
+    """execute_with_cache() behind the per-process L0 cache."""
+    config = get_cache_config()
+    if not config.enabled or _l0_cache.ttl <= 0:
+        return execute_with_cache(execute_fn=execute_fn, cache_components=cache_components)
+    
+    key = build_cache_key(cache_components)
+    metrics = get_metrics()
+    cached = _l0_cache.get(key)
+    if cached is not None:
+        if metrics:
+            metrics.inc_counter("odata_l0_cache_hits_total")
+        columns, rows, stats = cached
+        return columns, rows, {**stats, "cacheHit": True, "cacheLayer": "l0"}
+    
+    if metrics:
+        metrics.inc_counter("odata_l0_cache_misses_total")
+    columns, rows, stats = execute_with_cache(execute_fn=execute_fn, cache_components=cache_components)
+    # Same admission policy as the Redis layer
+    if len(rows) <= config.max_rows and (config.cache_admin_bypass or not stats.get("rlsBypassed")):
+        _l0_cache.put(key, (columns, rows, stats))
+    return columns, rows, stats
+
+
+# Results with at least this many rows are streamed in STREAM_CHUNK_ROWS chunks
+STREAM_MIN_ROWS = 10000
+STREAM_CHUNK_ROWS = 1000
+
+
+def _encode_rows(rows: List[dict]) -> bytes:
+    """JSON array of rows; chunks orjson rejects go through FastAPI's encoder first."""
+    try:
+        return orjson.dumps(rows)
+    except TypeError:
+        return orjson.dumps(jsonable_encoder(rows))
+
+
+def _stream_odata_json(context: str, rows: List[dict]) -> Iterator[bytes]:
+    """
+    OData entity-set JSON, emitted as the envelope head and then row chunks.
+    
+    Each chunk is one orjson call over a slice of rows, so the full response
+    body is never materialized as a single buffer.
+    """
+    yield b'{"@odata.context":' + orjson.dumps(context) + b',"value":['
+    for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+        chunk = _encode_rows(rows[start:start + STREAM_CHUNK_ROWS])[1:-1]
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]}"
+
+
 # =============================================================================
 # ODATA ENDPOINTS
 # =============================================================================
@@ -564,7 +820,7 @@ def odata_service_document(request: Request):
     Lists all available entity sets (datasets) that Power BI can browse.
     This is the entry point for "Get Data → OData Feed".
     """
-    catalog = load_catalog()
+    catalog = _cached_catalog()
     datasets = catalog.get("datasets", [])
     
     # Build service root URL
@@ -594,11 +850,8 @@ def odata_metadata(request: Request):
     Returns XML describing all entity types and their properties.
     Power BI uses this to build the schema for the data source.
     """
-    catalog = load_catalog()
-    datasets = catalog.get("datasets", [])
-    
     service_root = str(request.url).replace("/$metadata", "")
-    edmx_xml = generate_edmx(datasets, service_root)
+    edmx_xml = _edmx_at(CATALOG_PATH.stat().st_mtime_ns, service_root)
     
     return Response(
         content=edmx_xml,
@@ -607,7 +860,7 @@ def odata_metadata(request: Request):
 
 
 @router.get("/{datasetId}")
-def odata_query_entity_set(
+async def odata_query_entity_set(
     datasetId: str,
     request: Request,
     ctx: TenantContext = Depends(require_api_key)
@@ -632,14 +885,15 @@ def odata_query_entity_set(
     RLS filter is injected transparently - Power BI doesn't need to know.
     
     Internally converts to QueryRequest and calls compile_and_run_query().
+    Parsing runs on the event loop; only the blocking part (connection,
+    cache, query and response encoding) takes a worker thread.
     """
     # Load dataset from catalog
-    catalog = load_catalog()
     request_id = getattr(request.state, "request_id", None)
     try:
-        dataset = get_dataset(catalog, datasetId)
+        dataset = _cached_dataset(datasetId)
     except KeyError:
-        available = [ds["id"] for ds in catalog.get("datasets", [])]
+        available = [ds["id"] for ds in _cached_catalog().get("datasets", [])]
         raise dataset_not_found(
             dataset=datasetId,
             available_datasets=available,
@@ -647,7 +901,7 @@ def odata_query_entity_set(
         )
     
     # Extract OData query params
-    params = dict(request.query_params)
+    params = request.query_params
     
     select_str = params.get("$select", "")
     filter_str = params.get("$filter", "")
@@ -683,7 +937,7 @@ def odata_query_entity_set(
         filters = parse_odata_filter(filter_str)
     
     # Parse $orderby → List[OrderBy]
-    order_by = parse_odata_orderby(orderby_str)
+    order_by = list(_parse_orderby_cached(orderby_str))
     
     # Parse $top and $skip
     try:
@@ -712,6 +966,22 @@ def odata_query_entity_set(
         incrementalTo=inc_to
     )
     
+    service_root = str(request.url).split("?")[0].rsplit("/", 1)[0]
+    context = f"{service_root}/$metadata#${datasetId}"
+    
+    return await run_in_threadpool(
+        _query_entity_set, dataset, query_req, ctx, context, request_id
+    )
+
+
+def _query_entity_set(
+    dataset: dict,
+    query_req: QueryRequest,
+    ctx: TenantContext,
+    context: str,
+    request_id: Optional[str]
+) -> Response:
+    """Run an entity set query (blocking I/O) and build the OData response."""
     # Execute query using existing engine (NO new SQL logic!)
     # RLS is applied transparently based on authenticated tenant
     # Caching is automatic and tenant-scoped for security
@@ -723,7 +993,7 @@ def odata_query_entity_set(
             query_req, dataset, engine, ctx.tenant, ctx.role
         )
         
-        # Execute with caching
+        # Execute with caching (L0 in-process, then Redis)
         def execute_query():
             return compile_and_run_query(
                 dataset, query_req, conn,
@@ -732,24 +1002,25 @@ def odata_query_entity_set(
                 role=ctx.role
             )
         
-        columns, rows, stats = execute_with_cache(
-            execute_fn=execute_query,
-            cache_components=cache_components
-        )
+        columns, rows, stats = _execute_with_l0_cache(execute_query, cache_components)
     except SetuPranaliError:
         raise
     except Exception as e:
         raise internal_error(
             message=f"OData query failed: {str(e)}",
-            details={"dataset": datasetId},
+            details={"dataset": query_req.dataset},
             request_id=request_id
         )
     
-    # Build OData response
-    service_root = str(request.url).split("?")[0].rsplit("/", 1)[0]
+    # Large pulls (e.g. incremental refresh partitions) are streamed in chunks
+    if ORJSON_AVAILABLE and isinstance(rows, list) and len(rows) >= STREAM_MIN_ROWS:
+        return StreamingResponse(
+            _stream_odata_json(context, rows),
+            media_type="application/json"
+        )
     
-    return {
-        "@odata.context": f"{service_root}/$metadata#${datasetId}",
+    return _json_response({
+        "@odata.context": context,
         "value": rows
-    }
+    })
 
@@ -239,13 +239,19 @@ class PermissionEvaluator:
         self.config = config
         self._roles_cache: Dict[str, Role] = {}
         self._policies_cache: Dict[str, Policy] = {}
+        # Compiled wildcard patterns by pattern string (see _match_pattern)
+        self._pattern_cache: Dict[str, "re.Pattern[str]"] = {}
         
         # Index roles and policies
         for role in config.roles:
             self._roles_cache[role.name] = role
+            for ds_perm in role.datasets:
+                self._compile_pattern(ds_perm.dataset)
         
         for policy in config.policies:
             self._policies_cache[policy.id] = policy
+            for pattern in (*policy.principals, *policy.resources):
+                self._compile_pattern(pattern)
         
         logger.info(f"Permission evaluator initialized with {len(self._roles_cache)} roles, {len(self._policies_cache)} policies")
     
@@ -290,14 +296,29 @@ class PermissionEvaluator:
         
         return self._resolve_roles(list(role_names))
     
+    def _compile_pattern(self, pattern: str) -> Optional["re.Pattern[str]"]:
+        """Compiled regex for a glob pattern, or None if it needs no regex."""
+        compiled = self._pattern_cache.get(pattern)
+        if compiled is not None:
+            return compiled
+        # Exact names and "prefix*" are matched without a regex
+        if "?" not in pattern and "*" not in pattern[:-1]:
+            return None
+        regex = re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".")
+        compiled = self._pattern_cache[pattern] = re.compile(regex, re.DOTALL)
+        return compiled
+    
     def _match_pattern(self, pattern: str, value: str) -> bool:
-        """Match a pattern against a value (supports wildcards)."""
-        if pattern == "*":
+        """Match a pattern against a value (supports * and ? wildcards)."""
+        if pattern == "*" or pattern == value:
             return True
         
-        # Convert glob pattern to regex
-        regex = pattern.replace(".", r"\.").replace("*", ".*").replace("?", ".")
-        return bool(re.match(f"^{regex}$", value))
+        compiled = self._compile_pattern(pattern)
+        if compiled is not None:
+            return compiled.fullmatch(value) is not None
+        if pattern.endswith("*"):
+            return value.startswith(pattern[:-1])
+        return False
     
     def _evaluate_policies(self, ctx: PermissionContext) -> List[Tuple[Policy, PermissionEffect]]:
         """Evaluate policies for context."""
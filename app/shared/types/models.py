@@ -1,5 +1,5 @@
 from typing import Any, Dict, List, Literal, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date, datetime
 
 FieldType = Literal[
@@ -67,6 +67,8 @@ class QueryMetric(BaseModel):
     where: Optional[FilterGroup] = None
 
 class OrderBy(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     field: str
     direction: Literal["asc","desc"]
     nulls: Optional[Literal["first","last"]] = None
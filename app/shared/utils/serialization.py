@@ -0,0 +1,45 @@
+"""
+Fast JSON serialization helpers.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths return ``str`` from ``dumps`` and accept datetimes,
+so callers never need to branch on which backend is active.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+_ORJSON_OPTIONS = 0
+if ORJSON_AVAILABLE:
+    # Match the stdlib fallback: int keys allowed, naive datetimes without an offset
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types the stdlib json module does not handle."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(obj, default=_default)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a JSON ``str`` or ``bytes`` document."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,35 @@
+"""
+Tests for schema introspection helpers that need no database.
+"""
+
+import types
+
+import pytest
+
+from app.domain.modeling.modeling.schema_introspection import ColumnType, SchemaIntrospector
+
+
+def make_introspector(cls=SchemaIntrospector):
+    return cls(types.SimpleNamespace(ENGINE="postgres", pool=object()))
+
+
+class TestNormalizeType:
+    """SchemaIntrospector._normalize_type() mapping."""
+
+    @pytest.mark.parametrize("data_type, expected", [
+        ("VARCHAR(255)", ColumnType.STRING),
+        ("character varying", ColumnType.STRING),
+        (" Text ", ColumnType.STRING),
+        ("no_such_type", ColumnType.UNKNOWN),
+    ])
+    def test_maps_engine_types(self, data_type, expected):
+        assert make_introspector()._normalize_type(data_type) == expected
+
+    def test_subclass_mapping_is_used(self):
+        class JsonTextIntrospector(SchemaIntrospector):
+            TYPE_MAPPING = {**SchemaIntrospector.TYPE_MAPPING, "text": ColumnType.JSON}
+
+        # Warm the cache through the base class first
+        assert make_introspector()._normalize_type("text") == ColumnType.STRING
+        assert make_introspector(JsonTextIntrospector)._normalize_type("text") == ColumnType.JSON
+        assert make_introspector()._normalize_type("text") == ColumnType.STRING
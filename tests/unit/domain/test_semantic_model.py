@@ -0,0 +1,391 @@
+"""
+Tests for semantic model definitions and their SQLite persistence.
+"""
+
+import json
+import pickle
+import sqlite3
+
+import pytest
+
+from app.domain.modeling.modeling.semantic_model import (
+    CalculatedField,
+    Dimension,
+    ExpressionValidator,
+    Measure,
+    TimeIntelligence,
+    SemanticModel,
+    SemanticModelManager,
+)
+
+
+def make_model(model_id="m1", source_id="src", dimensions=("city", "country"), measures=("revenue",)):
+    return SemanticModel(
+        id=model_id,
+        name=f"Model {model_id}",
+        source_id=source_id,
+        dimensions=[Dimension.from_dict({"name": n, "sourceColumn": n}) for n in dimensions],
+        measures=[Measure.from_dict({"name": n, "expression": n}) for n in measures],
+    )
+
+
+class TestFieldLookup:
+    """get_dimension/get_measure/get_calculated_field match rules."""
+
+    def test_matches_id_name_and_case_insensitive_name(self):
+        model = make_model()
+        city = model.dimensions[0]
+        assert model.get_dimension(city.id) is city
+        assert model.get_dimension("city") is city
+        assert model.get_dimension(" CITY ") is city
+        assert model.get_measure("Revenue") is model.measures[0]
+
+    def test_first_match_wins(self):
+        model = make_model(dimensions=("Region", "region"))
+        assert model.get_dimension("region") is model.dimensions[0]
+
+    def test_replaced_field_is_not_found(self):
+        model = make_model()
+        model.dimensions[0] = Dimension.from_dict({"name": "state", "sourceColumn": "state"})
+        assert model.get_dimension("city") is None
+        assert model.get_dimension("state") is model.dimensions[0]
+
+    def test_renamed_in_place(self):
+        model = make_model()
+        model.get_dimension("city")
+        model.dimensions[0].name = "town"
+        assert model.get_dimension("city") is None
+        assert model.get_dimension("town") is model.dimensions[0]
+
+    def test_rename_to_earlier_match(self):
+        model = make_model(dimensions=("city", "country", "region"))
+        model.get_dimension("region")
+        model.dimensions[0].name = "region"
+        assert model.get_dimension("region") is model.dimensions[0]
+
+    def test_list_mutations(self):
+        model = make_model()
+        model.get_dimension("city")
+        model.dimensions.insert(0, Dimension.from_dict({"name": "City", "sourceColumn": "c"}))
+        assert model.get_dimension("city") is model.dimensions[0]
+        model.dimensions.pop(0)
+        assert model.get_dimension("city") is model.dimensions[0]
+        assert model.dimensions[0].name == "city"
+        del model.dimensions[0]
+        assert model.get_dimension("city") is None
+        model.dimensions.append(Dimension.from_dict({"name": "city", "sourceColumn": "c"}))
+        model.dimensions.sort(key=lambda d: d.name)
+        assert model.get_dimension("city") is model.dimensions[0]
+
+    def test_reassigned_list(self):
+        model = make_model()
+        model.get_measure("revenue")
+        model.measures = [Measure.from_dict({"name": "cost", "expression": "cost"})]
+        assert model.get_measure("revenue") is None
+        assert model.get_measure("cost") is model.measures[0]
+
+    def test_calculated_field_exact_match_only(self):
+        model = make_model()
+        model.calculated_fields.append(CalculatedField.from_dict({"name": "Margin", "expression": "1"}))
+        assert model.get_calculated_field("Margin") is model.calculated_fields[0]
+        assert model.get_calculated_field("margin") is None
+
+    def test_pickled_model(self):
+        model = make_model()
+        model.get_dimension("city")
+        restored = pickle.loads(pickle.dumps(model))
+        restored.dimensions[0].name = "town"
+        assert restored.get_dimension("town") is restored.dimensions[0]
+        assert model.get_dimension("city") is model.dimensions[0]
+
+    def test_time_intelligence_dimension_validation(self):
+        model = make_model()
+        model.time_intelligence = [
+            TimeIntelligence.from_dict({"dimensionId": "City"}),
+            TimeIntelligence.from_dict({"dimensionId": "missing"}),
+        ]
+        assert model.validate() == ["Time intelligence references unknown dimension: missing"]
+
+
+class TestFromDictIds:
+    """from_dict() keeps stored IDs and generates missing ones."""
+
+    @pytest.mark.parametrize("cls", [Dimension, Measure, CalculatedField, SemanticModel])
+    def test_empty_id_is_kept(self, cls):
+        assert cls.from_dict({"id": "", "name": "x"}).id == ""
+
+    @pytest.mark.parametrize("cls", [Dimension, Measure, CalculatedField, SemanticModel])
+    def test_missing_id_is_generated(self, cls):
+        first, second = cls.from_dict({"name": "x"}), cls.from_dict({"name": "x"})
+        assert first.id and second.id and first.id != second.id
+
+
+class TestToJson:
+    """SemanticModel.to_json() serialization."""
+
+    def test_round_trips(self):
+        model = make_model()
+        assert SemanticModel.from_dict(json.loads(model.to_json())).to_dict() == model.to_dict()
+
+    def test_reflects_in_place_edits(self):
+        model = make_model()
+        model.to_json()
+        model.dimensions[0].name = "town"
+        model.metadata["owner"] = "finance"
+        data = json.loads(model.to_json())
+        assert data["dimensions"][0]["name"] == "town"
+        assert data["metadata"] == {"owner": "finance"}
+
+
+class TestValidateReferences:
+    """Calculated field reference checks in validate()."""
+
+    def test_unknown_referenced_field(self):
+        model = make_model()
+        model.calculated_fields = [
+            CalculatedField.from_dict({"name": "margin", "expression": "[revenue] - [cost]", "referencedFields": ["revenue", "cost"]}),
+        ]
+        assert model.validate() == ["Calculated field 'margin' references unknown field: cost"]
+
+    def test_expression_not_scanned_without_referenced_fields(self):
+        model = make_model()
+        model.calculated_fields = [
+            CalculatedField.from_dict({"name": "margin", "expression": "[revenue] - [cost]"}),
+        ]
+        assert model.validate() == []
+
+
+class TestBlockedPatterns:
+    """ExpressionValidator blocked-pattern checks."""
+
+    @pytest.mark.parametrize("expression", [
+        "SUM([a]) # '\n; DROP TABLE t; -- '",
+        "[a] + 1 # ' ; DELETE FROM t '",
+        "CONCAT([a], ';')",
+        "[a] -- ' DROP'",
+        "[DROP]",
+        "[drop table] + 1",
+        "'a\\' DROP TABLE t'",
+    ])
+    def test_blocked(self, expression):
+        is_valid, errors = ExpressionValidator.validate(expression)
+        assert not is_valid
+        assert any(e.startswith("Blocked pattern detected") for e in errors)
+
+    @pytest.mark.parametrize("expression", [
+        "SUM([Revenue])",
+        "CASE WHEN [Status] = 'DELETE' THEN 1 ELSE 0 END",
+        "COALESCE([Updated At], [Created At])",
+    ])
+    def test_allowed(self, expression):
+        assert ExpressionValidator.validate(expression) == (True, [])
+
+
+class TestSubstituteFields:
+    """ExpressionValidator.substitute_fields()."""
+
+    def test_whole_tokens_only(self):
+        field_map = {"Revenue": "SUM(t.amount)", "Revenue Growth": "g"}
+        assert ExpressionValidator.substitute_fields("[Revenue Growth] / [Revenue]", field_map) == "(g) / (SUM(t.amount))"
+
+    def test_unknown_reference_kept(self):
+        assert ExpressionValidator.substitute_fields("[a] + [x]", {"a": "t.a"}) == "(t.a) + [x]"
+
+    def test_nested_calculated_fields(self):
+        field_map = {
+            "Margin %": "[Profit] / [Revenue]",
+            "Profit": "[Revenue] - [Cost]",
+            "Revenue": "SUM(t.revenue)",
+            "Cost": "SUM(t.cost)",
+        }
+        assert ExpressionValidator.substitute_fields("[Margin %] * 100", field_map) == (
+            "(((SUM(t.revenue)) - (SUM(t.cost))) / (SUM(t.revenue))) * 100"
+        )
+
+    def test_independent_of_map_order(self):
+        assert ExpressionValidator.substitute_fields("[a] [b]", {"a": "[b]", "b": "c"}) == "((c)) (c)"
+        assert ExpressionValidator.substitute_fields("[a] [b]", {"b": "c", "a": "[b]"}) == "((c)) (c)"
+
+    def test_cycles_terminate(self):
+        assert ExpressionValidator.substitute_fields("[a]", {"a": "[b] + 1", "b": "[a] * 2"}) == "(([a] * 2) + 1)"
+        assert ExpressionValidator.substitute_fields("[city]", {"city": "t.[city]"}) == "(t.[city])"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SemanticModelManager(db_path=str(tmp_path / "semantic.db"))
+    yield manager
+    manager.close()
+
+
+class TestManagerGet:
+    """SemanticModelManager.get() and its in-memory cache."""
+
+    def test_returns_independent_copies(self, manager):
+        manager.create(make_model())
+        first = manager.get("m1")
+        second = manager.get("m1")
+        assert first is not second
+        assert first.to_dict() == second.to_dict()
+
+    def test_unsaved_edits_do_not_leak(self, manager):
+        manager.create(make_model())
+        model = manager.get("m1")
+        model.dimensions[0].name = "edited"
+        model.metadata["draft"] = True
+        # e.g. a route that fails validation after editing and never saves
+
+        fresh = manager.get("m1")
+        assert fresh.dimensions[0].name == "city"
+        assert "draft" not in fresh.metadata
+
+    def test_sees_updates(self, manager):
+        manager.create(make_model())
+        model = manager.get("m1")
+        model.name = "Renamed"
+        manager.update(model)
+        assert manager.get("m1").name == "Renamed"
+
+    def test_missing_model(self, manager):
+        assert manager.get("nope") is None
+
+    def test_cache_hit_reads_only_updated_at(self, manager):
+        manager.create(make_model())
+        manager.get("m1")
+        statements = []
+        manager._conn.set_trace_callback(statements.append)
+        assert manager.get("m1").id == "m1"
+        manager._conn.set_trace_callback(None)
+        selects = [s for s in statements if s.startswith("SELECT")]
+        assert selects == ["SELECT updated_at FROM semantic_models WHERE id = 'm1'"]
+
+
+class TestListSummaries:
+    """SemanticModelManager.list_summaries() field counts."""
+
+    def test_counts_fields(self, manager):
+        manager.create(make_model("m1"))
+        manager.create(make_model("m2", measures=("cost", "units")))
+        counts = {s["id"]: (s["dimensionCount"], s["measureCount"]) for s in manager.list_summaries()}
+        assert counts == {"m1": (2, 1), "m2": (2, 2)}
+
+    def test_filters_by_source(self, manager):
+        manager.create(make_model("m1"))
+        manager.create(make_model("other", source_id="elsewhere"))
+        assert [s["id"] for s in manager.list_summaries("elsewhere")] == ["other"]
+
+
+def field_rows(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT model_id, name, position FROM {table} ORDER BY model_id, position").fetchall()
+    finally:
+        conn.close()
+
+
+class TestFieldTables:
+    """Normalized dimension/measure/calculated field tables."""
+
+    def test_create_writes_rows(self, manager):
+        manager.create(make_model())
+        assert field_rows(manager.db_path, "semantic_dimensions") == [("m1", "city", 0), ("m1", "country", 1)]
+        assert field_rows(manager.db_path, "semantic_measures") == [("m1", "revenue", 0)]
+
+    def test_update_replaces_rows(self, manager):
+        manager.create(make_model())
+        model = manager.get("m1")
+        model.dimensions = model.dimensions[1:]
+        model.calculated_fields = [CalculatedField.from_dict({"name": "double", "expression": "[revenue] * 2"})]
+        manager.update(model)
+        assert field_rows(manager.db_path, "semantic_dimensions") == [("m1", "country", 0)]
+        assert field_rows(manager.db_path, "semantic_calculated_fields") == [("m1", "double", 0)]
+
+    def test_delete_removes_rows(self, manager):
+        manager.create(make_model("m1"))
+        manager.create(make_model("m2"))
+        manager.delete("m1")
+        assert {row[0] for row in field_rows(manager.db_path, "semantic_dimensions")} == {"m2"}
+        assert {row[0] for row in field_rows(manager.db_path, "semantic_measures")} == {"m2"}
+
+    def test_backfills_models_stored_before_the_tables(self, tmp_path):
+        db_path = str(tmp_path / "legacy.db")
+        model = make_model()
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE semantic_models (
+                id TEXT PRIMARY KEY, name TEXT NOT NULL, source_id TEXT NOT NULL,
+                erd_model_id TEXT, description TEXT, data TEXT NOT NULL,
+                version INTEGER DEFAULT 1, created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO semantic_models VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (model.id, model.name, model.source_id, None, None, model.to_json(), 1,
+             model.created_at.isoformat(), model.updated_at.isoformat()),
+        )
+        conn.commit()
+        conn.close()
+
+        manager = SemanticModelManager(db_path=db_path)
+        try:
+            assert field_rows(db_path, "semantic_dimensions") == [("m1", "city", 0), ("m1", "country", 1)]
+            [summary] = manager.list_summaries()
+            assert (summary["dimensionCount"], summary["measureCount"]) == (2, 1)
+        finally:
+            manager.close()
+
+        # Reopening does not duplicate the backfilled rows
+        SemanticModelManager(db_path=db_path).close()
+        assert len(field_rows(db_path, "semantic_dimensions")) == 2
+
+    def test_backfill_runs_once(self, tmp_path, monkeypatch):
+        db_path = str(tmp_path / "semantic.db")
+        manager = SemanticModelManager(db_path=db_path)
+        manager.create(make_model(dimensions=(), measures=()))
+        manager.close()
+
+        def fail(data):
+            raise AssertionError("model decoded on startup")
+
+        monkeypatch.setattr("app.domain.modeling.modeling.semantic_model.json_loads", fail)
+        SemanticModelManager(db_path=db_path).close()
+
+
+class TestListFieldNames:
+    """SemanticModelManager.list_field_names() over the normalized field tables."""
+
+    def test_lists_fields_of_each_model_for_the_source(self, manager):
+        model = make_model("m1")
+        model.calculated_fields = [CalculatedField.from_dict({"name": "double", "expression": "[revenue] * 2"})]
+        manager.create(model)
+        manager.create(make_model("m2", dimensions=("day",), measures=()))
+        manager.create(make_model("other", source_id="elsewhere"))
+
+        fields = manager.list_field_names("src")
+        assert sorted((f["modelId"], f["fieldType"], f["name"]) for f in fields) == [
+            ("m1", "calculated", "double"),
+            ("m1", "dimension", "city"),
+            ("m1", "dimension", "country"),
+            ("m1", "measure", "revenue"),
+            ("m2", "dimension", "day"),
+        ]
+
+    def test_reflects_updates(self, manager):
+        manager.create(make_model())
+        model = manager.get("m1")
+        model.dimensions[0].name = "town"
+        manager.update(model)
+        names = {f["name"] for f in manager.list_field_names("src") if f["fieldType"] == "dimension"}
+        assert names == {"town", "country"}
+
+    def test_unknown_source(self, manager):
+        manager.create(make_model())
+        assert manager.list_field_names("nope") == []
+
+    def test_does_not_read_model_blobs(self, manager):
+        manager.create(make_model())
+        statements = []
+        manager._conn.set_trace_callback(statements.append)
+        assert len(manager.list_field_names("src")) == 3
+        manager._conn.set_trace_callback(None)
+        assert not any("data" in s or "json_" in s for s in statements)
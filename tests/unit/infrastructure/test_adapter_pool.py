@@ -0,0 +1,54 @@
+"""
+Tests for the adapter session pool used by parallel introspection.
+"""
+
+from app.infrastructure.adapters.base import AdapterResult, BaseAdapter, ConnectionPool
+from app.infrastructure.adapters.mysql_adapter import MySQLAdapter
+from app.infrastructure.adapters.oracle_adapter import OracleAdapter
+from app.infrastructure.adapters.postgres_adapter import PostgresAdapter
+
+
+class StubAdapter(BaseAdapter):
+    ENGINE = "stub"
+
+    def connect(self):
+        self._connected = True
+
+    def disconnect(self):
+        self._connected = False
+
+    def execute(self, sql, params=None):
+        return AdapterResult(rows=[], columns=[])
+
+    def health_check(self):
+        return True
+
+
+class PooledStubAdapter(StubAdapter):
+    POOLED_EXECUTE = True
+
+
+class TestAdapterPool:
+    """BaseAdapter.pool opt-in."""
+
+    def test_shared_connection_adapter_has_no_pool(self):
+        adapter = StubAdapter({})
+        adapter._pool = object()  # e.g. Oracle's session pool behind one connection
+        assert adapter.pool is None
+
+    def test_pooled_adapter_without_open_pool(self):
+        assert PooledStubAdapter({}).pool is None
+
+    def test_pooled_adapter_capped_by_driver_pool(self):
+        adapter = PooledStubAdapter({})
+        adapter._pool = object()
+        adapter.pool_size = 1
+        pool = adapter.pool
+        assert isinstance(pool, ConnectionPool)
+        assert pool.size == 1
+        assert adapter.pool is pool
+
+    def test_opted_in_adapters(self):
+        assert PostgresAdapter.POOLED_EXECUTE
+        assert MySQLAdapter.POOLED_EXECUTE
+        assert not OracleAdapter.POOLED_EXECUTE
@@ -0,0 +1,190 @@
+"""
+Tests for query analytics and audit logging.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infrastructure.observability.analytics import (
+    AuditEvent,
+    AuditEventType,
+    AuditLogger,
+    ObservabilityConfig,
+    PrometheusMetrics,
+    QueryAnalytics,
+    QueryRecord,
+)
+from app.infrastructure.storage import state_storage
+
+
+def make_record(timestamp=None, **overrides):
+    values = dict(
+        query_id="q1",
+        timestamp=timestamp or datetime.now(timezone.utc),
+        dataset="orders",
+        dimensions=["city"],
+        metrics=["revenue"],
+        filters=None,
+        duration_ms=12.5,
+        rows_returned=3,
+    )
+    values.update(overrides)
+    return QueryRecord(**values)
+
+
+class TestQueryRecord:
+    """QueryRecord construction."""
+
+    def test_timestamp_ns_follows_timestamp(self):
+        timestamp = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+        record = make_record(timestamp)
+        assert record.timestamp_ns == 1714566615_250000_000
+
+    def test_naive_timestamp_is_utc(self):
+        naive = datetime(2024, 5, 1, 12, 30, 15, 250000)
+        assert make_record(naive).timestamp_ns == make_record(naive.replace(tzinfo=timezone.utc)).timestamp_ns
+
+    def test_backdated_record(self):
+        timestamp = datetime.now(timezone.utc) - timedelta(days=3)
+        assert make_record(timestamp).timestamp_ns < make_record().timestamp_ns
+
+    def test_timestamp_ns_is_not_a_constructor_argument(self):
+        with pytest.raises(TypeError):
+            make_record(timestamp_ns=0)
+
+
+@pytest.fixture
+def analytics(monkeypatch):
+    """In-memory QueryAnalytics (no DuckDB state storage)."""
+    def unavailable():
+        raise RuntimeError("no state storage in unit tests")
+
+    monkeypatch.setattr(state_storage, "get_state_storage", unavailable)
+    return QueryAnalytics(ObservabilityConfig(analytics_retention_hours=24))
+
+
+class TestRecordRetention:
+    """In-memory record retention in QueryAnalytics."""
+
+    def test_expired_records_evicted_on_append(self, analytics):
+        now = datetime.now(timezone.utc)
+        analytics.record_query(make_record(now - timedelta(hours=30), query_id="old"))
+        analytics.record_query(make_record(now - timedelta(hours=1), query_id="recent"))
+        assert [r.query_id for r in analytics._records] == ["recent"]
+
+    def test_late_records_kept_in_time_order(self, analytics):
+        now = datetime.now(timezone.utc)
+        for query_id, hours_ago in [("a", 5), ("c", 1), ("b", 3), ("first", 10)]:
+            analytics.record_query(make_record(now - timedelta(hours=hours_ago), query_id=query_id))
+        assert [r.query_id for r in analytics._records] == ["first", "a", "b", "c"]
+
+    def test_late_record_expires_before_newer_ones(self, analytics, monkeypatch):
+        now = datetime.now(timezone.utc)
+        analytics.record_query(make_record(now - timedelta(hours=2), query_id="newer"))
+        analytics.record_query(make_record(now - timedelta(hours=20), query_id="late"))
+
+        # Six hours on, only the late record is past the 24h retention
+        later_ns = int((now + timedelta(hours=6)).timestamp() * 1e9)
+        monkeypatch.setattr("app.infrastructure.observability.analytics.time.time_ns", lambda: later_ns)
+        analytics.record_query(make_record(now, query_id="now"))
+        assert [r.query_id for r in analytics._records] == ["newer", "now"]
+
+
+class TestPrometheusCounters:
+    """PrometheusMetrics counters and their export."""
+
+    def test_concurrent_increments_are_not_lost(self):
+        metrics = PrometheusMetrics(ObservabilityConfig(metrics_prefix="t"))
+
+        def work():
+            for _ in range(5000):
+                metrics.inc_counter("requests_total", labels={"path": "/q"})
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert 't_requests_total{path="/q"} 40000.0' in metrics.export().splitlines()
+
+    def test_unit_and_weighted_increments_share_a_series(self):
+        metrics = PrometheusMetrics(ObservabilityConfig(metrics_prefix="t"))
+        metrics.inc_counter("rows_total")
+        metrics.inc_counter("rows_total", 2.5)
+        metrics.export()
+        metrics.inc_counter("rows_total")
+        assert "t_rows_total 4.5" in metrics.export().splitlines()
+
+    def test_finished_threads_are_folded(self):
+        metrics = PrometheusMetrics(ObservabilityConfig(metrics_prefix="t"))
+        for _ in range(3):
+            thread = threading.Thread(target=metrics.inc_counter, args=("jobs_total",))
+            thread.start()
+            thread.join()
+        metrics.inc_counter("jobs_total")
+        assert "t_jobs_total 4.0" in metrics.export().splitlines()
+        assert [c.thread for c in metrics._thread_counters] == [threading.current_thread()]
+        assert "t_jobs_total 4.0" in metrics.export().splitlines()
+
+
+@pytest.fixture
+def audit_logger():
+    return AuditLogger(ObservabilityConfig())
+
+
+class TestAuditSanitize:
+    """AuditLogger._sanitize_details() redaction."""
+
+    def test_redacts_sensitive_keys(self, audit_logger):
+        details = {"dataset": "orders", "Password": "hunter2", "api_key": "abc"}
+        assert audit_logger._sanitize_details(details) == {
+            "dataset": "orders",
+            "Password": "[REDACTED]",
+            "api_key": "[REDACTED]",
+        }
+
+    def test_recurses_into_dict_subclasses(self, audit_logger):
+        details = {"connection": OrderedDict(host="db", secret="s3cr3t")}
+        assert audit_logger._sanitize_details(details) == {
+            "connection": {"host": "db", "secret": "[REDACTED]"},
+        }
+
+
+class TestAuditGetEvents:
+    """AuditLogger.get_events() filtering and return shape."""
+
+    def log(self, audit_logger, event_id, event_type, tenant_id=None, timestamp=None):
+        audit_logger.log(AuditEvent(
+            event_id=event_id,
+            timestamp=timestamp or datetime.now(timezone.utc),
+            event_type=event_type,
+            tenant_id=tenant_id,
+            details={"dataset": "orders", "token": "t"},
+        ))
+
+    def test_returns_logged_types(self, audit_logger):
+        timestamp = datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        self.log(audit_logger, "e1", AuditEventType.QUERY, timestamp=timestamp)
+
+        [event] = audit_logger.get_events()
+        assert event["timestamp"] == timestamp
+        assert event["event_type"] is AuditEventType.QUERY
+        assert event["details"] == {"dataset": "orders", "token": "[REDACTED]"}
+
+    def test_filters(self, audit_logger):
+        now = datetime.now(timezone.utc)
+        self.log(audit_logger, "e1", AuditEventType.QUERY, "acme", now - timedelta(hours=2))
+        self.log(audit_logger, "e2", AuditEventType.ERROR, "acme", now - timedelta(hours=1))
+        self.log(audit_logger, "e3", AuditEventType.QUERY, "globex", now)
+
+        def ids(**filters):
+            return [e["event_id"] for e in audit_logger.get_events(**filters)]
+
+        assert ids(event_type=AuditEventType.QUERY) == ["e1", "e3"]
+        assert ids(tenant_id="acme") == ["e1", "e2"]
+        assert ids(start_time=now - timedelta(minutes=90)) == ["e2", "e3"]
+        assert ids(end_time=now - timedelta(minutes=90)) == ["e1"]
+        assert ids(limit=1) == ["e3"]
@@ -0,0 +1,41 @@
+"""
+Tests for the JSON serialization helpers.
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.shared.utils import serialization
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if not serialization.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+    return request.param
+
+
+class TestDumps:
+    """dumps() output is the same whichever backend is active."""
+
+    def test_naive_datetime_has_no_offset(self, backend):
+        value = datetime(2024, 5, 1, 12, 30, 15, 250000)
+        assert serialization.loads(serialization.dumps({"at": value})) == {"at": value.isoformat()}
+
+    def test_aware_datetime_keeps_offset(self, backend):
+        value = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        assert serialization.loads(serialization.dumps([value])) == ["2024-05-01T12:30:00+00:00"]
+
+    def test_date(self, backend):
+        assert serialization.loads(serialization.dumps(date(2024, 5, 1))) == "2024-05-01"
+
+    def test_int_keys(self, backend):
+        assert serialization.loads(serialization.dumps({1: "a"})) == {"1": "a"}
+
+    def test_returns_str(self, backend):
+        assert isinstance(serialization.dumps({"a": [1, 2.5, None, True]}), str)
@@ -0,0 +1,37 @@
+"""
+Tests for the slotted dataclass helper.
+"""
+
+import pickle
+from dataclasses import field, fields
+
+import pytest
+
+from app.shared.utils.slots import slotted_dataclass
+
+
+@slotted_dataclass
+class Point:
+    x: int
+    y: int = 0
+    tags: list = field(default_factory=list)
+
+
+class TestSlottedDataclass:
+    """slotted_dataclass() behaves like @dataclass without a __dict__."""
+
+    def test_has_slots_and_no_dict(self):
+        point = Point(1)
+        assert Point.__slots__ == ("x", "y", "tags")
+        assert not hasattr(point, "__dict__")
+        with pytest.raises(AttributeError):
+            point.z = 3
+
+    def test_dataclass_behaviour(self):
+        assert [f.name for f in fields(Point)] == ["x", "y", "tags"]
+        assert Point(1, 2) == Point(1, 2)
+        assert Point(1).tags is not Point(1).tags
+
+    def test_pickles(self):
+        point = Point(1, 2, ["a"])
+        assert pickle.loads(pickle.dumps(point)) == point
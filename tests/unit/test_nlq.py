@@ -0,0 +1,131 @@
+"""
+Tests for the NLQ translation helpers (no network calls).
+"""
+
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+from app import nlq
+from app.nlq import NLQConfig
+
+
+class _FakeCompletions:
+    """Records create() kwargs and replies with a fixed JSON object."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = types.SimpleNamespace(content=json.dumps(self.reply))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    completions = _FakeCompletions({"dimensions": ["city"], "metrics": ["revenue"]})
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    monkeypatch.setattr(nlq, "_openai_client", lambda api_key, base_url: client)
+    return completions
+
+
+class TestOpenAIResponseFormat:
+    """response_format sent to OpenAI-compatible backends."""
+
+    def test_json_mode_by_default(self, fake_openai):
+        result = nlq.translate_with_openai("revenue by city", {"name": "orders"}, NLQConfig())
+        assert fake_openai.calls[-1]["response_format"] == {"type": "json_object"}
+        assert result.translated_query["dimensions"] == ["city"]
+        assert result.translated_query["limit"] == 100
+
+    def test_structured_output_opt_in(self, fake_openai):
+        config = NLQConfig(model="gpt-4o-mini", structured_output=True)
+        nlq.translate_with_openai("revenue by city", {"name": "orders"}, config)
+        response_format = fake_openai.calls[-1]["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["strict"] is True
+
+    def test_batch_uses_json_mode_by_default(self, fake_openai):
+        fake_openai.reply = {"results": [{"dimensions": ["a"]}, {"dimensions": ["b"]}]}
+        results = nlq.translate_many_with_openai(["q1", "q2"], {"name": "orders"}, NLQConfig())
+        assert fake_openai.calls[-1]["response_format"] == {"type": "json_object"}
+        assert [r.translated_query["dimensions"] for r in results] == [["a"], ["b"]]
+
+
+class _FakeAsyncCompletions(_FakeCompletions):
+    async def create(self, **kwargs):
+        return _FakeCompletions.create(self, **kwargs)
+
+
+@pytest.fixture
+def fake_openai_module(monkeypatch):
+    """Stub ``openai`` module whose AsyncOpenAI counts how often it is built."""
+    completions = _FakeAsyncCompletions({"dimensions": ["city"], "metrics": ["revenue"]})
+    module = types.ModuleType("openai")
+    module.built = []
+
+    class AsyncOpenAI:
+        def __init__(self, api_key=None, base_url=None):
+            module.built.append((api_key, base_url))
+            self.chat = types.SimpleNamespace(completions=completions)
+
+    module.AsyncOpenAI = AsyncOpenAI
+    module.RateLimitError = type("RateLimitError", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "openai", module)
+    nlq._openai_async_client.cache_clear()
+    yield module
+    nlq._openai_async_client.cache_clear()
+
+
+class TestOpenAIAsyncClient:
+    """The async OpenAI client is built once per api_key/base_url."""
+
+    def test_reused_across_calls(self, fake_openai_module):
+        config = NLQConfig(api_key="k")
+
+        async def run():
+            for _ in range(3):
+                await nlq.translate_with_openai_async("revenue by city", {"name": "orders"}, config)
+            return await nlq.translate_many_async(["q1", "q2"], {"name": "orders"}, config)
+
+        results = asyncio.run(run())
+        assert [r.translated_query["dimensions"] for r in results] == [["city"], ["city"]]
+        assert fake_openai_module.built == [("k", None)]
+
+    def test_separate_client_per_backend(self, fake_openai_module):
+        for base_url in ("http://a/v1", "http://b/v1", "http://a/v1"):
+            config = NLQConfig(api_key="k", base_url=base_url)
+            asyncio.run(nlq.translate_with_openai_async("q", {"name": "orders"}, config))
+        assert fake_openai_module.built == [("k", "http://a/v1"), ("k", "http://b/v1")]
+
+
+class TestTranslateSimple:
+    """Rule-based translate_simple() fallback."""
+
+    SCHEMA = {
+        "dimensions": [{"name": "region", "description": "Sales region"}, {"name": "order_date"}],
+        "metrics": [{"name": "revenue"}, {"name": "order_count"}],
+    }
+
+    def test_mentioned_fields_and_ordering(self):
+        query = nlq.translate_simple("Top 5 region by order count", self.SCHEMA).translated_query
+        assert query["dimensions"] == ["region"]
+        assert query["metrics"] == ["order_count"]
+        assert query["orderBy"] == [{"field": "order_count", "direction": "desc"}]
+        assert query["limit"] == 5
+
+    def test_defaults_to_first_fields(self):
+        query = nlq.translate_simple("show me everything", self.SCHEMA).translated_query
+        assert (query["dimensions"], query["metrics"]) == (["region"], ["revenue"])
+
+    def test_index_ignores_descriptions(self):
+        nlq._schema_index.cache_clear()
+        redescribed = {**self.SCHEMA, "dimensions": [{"name": "region", "description": "Area"}, {"name": "order_date"}]}
+        nlq.translate_simple("revenue by region", self.SCHEMA)
+        nlq.translate_simple("revenue by region", redescribed)
+        assert nlq._schema_index.cache_info().hits == 1
@@ -0,0 +1,102 @@
+"""
+Tests for the NLQ translation cache (exact and semantic tiers).
+"""
+
+import pytest
+
+from app import nlq_cache
+from app.nlq_cache import NUMPY_AVAILABLE, SemanticNLQCache
+
+VOCABULARY = ("top", "cities", "countries", "revenue", "orders")
+
+
+def embed(text):
+    """Bag of known words: ignores numbers and filler, like a loose embedding."""
+    words = text.lower().split()
+    return [float(words.count(word)) for word in VOCABULARY]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for TTL checks."""
+    now = [1000.0]
+    monkeypatch.setattr(nlq_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestExactTier:
+    """Normalized question text lookups."""
+
+    def test_hit_ignores_case_and_whitespace(self):
+        cache = SemanticNLQCache()
+        cache.put("s1", "Top 10 cities by revenue", "result")
+        assert cache.get("s1", "  top 10   CITIES by revenue ") == "result"
+
+    def test_scoped_to_schema(self):
+        cache = SemanticNLQCache()
+        cache.put("s1", "revenue by city", "result")
+        assert cache.get("s2", "revenue by city") is None
+
+    def test_entries_expire(self, clock):
+        cache = SemanticNLQCache(ttl_seconds=60)
+        cache.put("s1", "revenue by city", "result")
+        clock[0] += 61
+        assert cache.get("s1", "revenue by city") is None
+
+    def test_least_recently_used_evicted(self):
+        cache = SemanticNLQCache(capacity=2)
+        cache.put("s1", "q1", "r1")
+        cache.put("s1", "q2", "r2")
+        cache.get("s1", "q1")
+        cache.put("s1", "q3", "r3")
+        assert [cache.get("s1", q) for q in ("q1", "q2", "q3")] == ["r1", None, "r3"]
+
+    def test_clear_one_schema(self):
+        cache = SemanticNLQCache()
+        cache.put("s1", "q", "r1")
+        cache.put("s2", "q", "r2")
+        cache.clear("s1")
+        assert cache.get("s1", "q") is None
+        assert cache.get("s2", "q") == "r2"
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="semantic tier needs numpy")
+class TestSemanticTier:
+    """Similarity lookups over question embeddings."""
+
+    @pytest.fixture
+    def cache(self):
+        cache = SemanticNLQCache(embed_fn=embed, threshold=0.9)
+        cache.put("s1", "top 10 cities by revenue", "top-10-cities")
+        return cache
+
+    def test_similar_question_hits(self, cache):
+        assert cache.get("s1", "show me the top 10 cities by revenue") == "top-10-cities"
+
+    def test_number_words_match_digits(self, cache):
+        assert cache.get("s1", "show me the top ten cities by revenue") == "top-10-cities"
+
+    def test_different_numbers_miss(self, cache):
+        assert cache.get("s1", "show me the top 20 cities by revenue") is None
+        assert cache.get("s1", "top cities by revenue") is None
+
+    def test_picks_the_entry_with_matching_numbers(self, cache):
+        cache.put("s1", "top 20 cities by revenue", "top-20-cities")
+        assert cache.get("s1", "the top 20 cities by revenue") == "top-20-cities"
+        assert cache.get("s1", "the top 10 cities by revenue") == "top-10-cities"
+
+    def test_dissimilar_question_misses(self, cache):
+        assert cache.get("s1", "top 10 countries by orders") is None
+
+    def test_scoped_to_schema(self, cache):
+        assert cache.get("s2", "show me the top 10 cities by revenue") is None
+
+    def test_cleared(self, cache):
+        cache.clear()
+        assert cache.get("s1", "show me the top 10 cities by revenue") is None
+
+    def test_entries_expire(self, clock):
+        cache = SemanticNLQCache(embed_fn=embed, threshold=0.9, ttl_seconds=60)
+        cache.put("s1", "top 10 cities by revenue", "result")
+        clock[0] += 61
+        assert cache.get("s1", "show me the top 10 cities by revenue") is None
@@ -0,0 +1,255 @@
+"""
+Tests for OAuth token validation (no network calls).
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+from app import oauth
+from app.oauth import OAuthAuthenticator, OAuthConfig, OAuthProvider, TokenCache, TokenInfo
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks_fetches(monkeypatch, signing_key):
+    """Serve the JWKS endpoint from memory; returns the list of fetched URIs."""
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(signing_key.public_key()))
+    jwk["kid"] = "k1"
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"keys": [jwk]}
+
+    fetches = []
+
+    def get(uri, timeout=None):
+        fetches.append(uri)
+        return Response()
+
+    monkeypatch.setattr(oauth._http, "get", get)
+    oauth._jwks_cache._cache.clear()
+    oauth._token_cache.clear()
+    yield fetches
+    oauth._jwks_cache._cache.clear()
+    oauth._token_cache.clear()
+
+
+@pytest.fixture
+def provider(jwks_fetches):
+    return OAuthProvider(
+        name="test", issuer="https://issuer", client_id="client",
+        jwks_uri="https://issuer/jwks", audience="api",
+    )
+
+
+def make_token(signing_key, **claims):
+    payload = {"sub": "user-1", "iss": "https://issuer", "aud": "api", "exp": int(time.time()) + 600}
+    payload.update(claims)
+    return jwt.encode(payload, signing_key, algorithm="RS256", headers={"kid": "k1"})
+
+
+class TestTokenInfo:
+    """TokenInfo fields and validate_token() mapping."""
+
+    def test_expires_at_is_a_constructor_field(self):
+        expires_at = datetime(2030, 1, 1, 12, 0)
+        info = TokenInfo(sub="u", provider="test", expires_at=expires_at)
+        assert info.expires_at == expires_at
+        assert info.model_dump()["expires_at"] == expires_at
+        assert set(info.model_dump()) == set(TokenInfo.model_fields)
+
+    def test_validate_token_sets_expires_at(self, provider, signing_key):
+        exp = int(time.time()) + 600
+        info = oauth.validate_token(make_token(signing_key, exp=exp, scope="read write"), provider)
+        assert info.sub == "user-1"
+        assert info.scopes == ["read", "write"]
+        assert info.expires_at == datetime.fromtimestamp(exp)
+
+
+class TestTokenCache:
+    """TokenCache expiry and eviction."""
+
+    def info(self, exp=None):
+        return TokenInfo(sub="u", provider="test", raw_claims={"exp": exp} if exp else {})
+
+    def test_hit_until_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(oauth.time, "time", lambda: now[0])
+        cache = TokenCache(ttl=60)
+        info = self.info()
+        cache.put(b"k", info)
+        assert cache.get(b"k") is info
+        now[0] += 60
+        assert cache.get(b"k") is None
+
+    def test_entry_ends_at_token_exp(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(oauth.time, "time", lambda: now[0])
+        cache = TokenCache(ttl=300)
+        cache.put(b"k", self.info(exp=1010))
+        now[0] += 10
+        assert cache.get(b"k") is None
+
+    def test_expired_token_not_stored(self):
+        cache = TokenCache()
+        cache.put(b"k", self.info(exp=time.time() - 1))
+        assert cache.get(b"k") is None
+
+    def test_least_recently_used_evicted(self):
+        cache = TokenCache(maxsize=2)
+        infos = {key: self.info() for key in (b"a", b"b", b"c")}
+        cache.put(b"a", infos[b"a"])
+        cache.put(b"b", infos[b"b"])
+        cache.get(b"a")
+        cache.put(b"c", infos[b"c"])
+        assert [cache.get(k) for k in (b"a", b"b", b"c")] == [infos[b"a"], None, infos[b"c"]]
+
+
+class TestAuthenticateCache:
+    """OAuthAuthenticator reuses validated tokens."""
+
+    @pytest.fixture
+    def authenticator(self, provider):
+        authenticator = OAuthAuthenticator(OAuthConfig(enabled=True))
+        authenticator.providers[provider.name] = provider
+        return authenticator
+
+    @pytest.fixture
+    def validations(self, monkeypatch):
+        calls = []
+        validate_token = oauth.validate_token
+
+        def counting(token, provider):
+            calls.append(token)
+            return validate_token(token, provider)
+
+        async def counting_async(token, provider):
+            return counting(token, provider)
+
+        monkeypatch.setattr(oauth, "validate_token", counting)
+        monkeypatch.setattr(oauth, "validate_token_async", counting_async)
+        return calls
+
+    def test_second_call_is_cached(self, authenticator, validations, signing_key):
+        token = make_token(signing_key)
+        first = authenticator.authenticate(token)
+        assert authenticator.authenticate(token) is first
+        assert len(validations) == 1
+
+    def test_async_shares_the_cache(self, authenticator, validations, signing_key):
+        token = make_token(signing_key)
+        first = authenticator.authenticate(token)
+        assert asyncio.run(authenticator.authenticate_async(token)) is first
+        assert len(validations) == 1
+
+    def test_distinct_tokens_validated_separately(self, authenticator, validations, signing_key):
+        authenticator.authenticate(make_token(signing_key, sub="a"))
+        info = authenticator.authenticate(make_token(signing_key, sub="b"))
+        assert info.sub == "b"
+        assert len(validations) == 2
+
+    def test_failures_are_not_cached(self, authenticator, validations, signing_key):
+        token = make_token(signing_key, aud="other")
+        for _ in range(2):
+            with pytest.raises(oauth.HTTPException) as exc_info:
+                authenticator.authenticate(token)
+            assert exc_info.value.detail == "Invalid token audience"
+        assert len(validations) == 2
+
+
+class TestAuthorizationHeader:
+    """authenticate_from_header() Bearer parsing."""
+
+    @pytest.fixture
+    def tokens(self, monkeypatch):
+        authenticator = OAuthAuthenticator(OAuthConfig(enabled=True))
+        seen = []
+        monkeypatch.setattr(authenticator, "authenticate", lambda token, provider_name=None: seen.append(token))
+        return authenticator, seen
+
+    @pytest.mark.parametrize("header", ["Bearer abc.def", "bearer abc.def", "BEARER abc.def", "  Bearer abc.def\n"])
+    def test_accepted(self, tokens, header):
+        authenticator, seen = tokens
+        authenticator.authenticate_from_header(header)
+        assert seen == ["abc.def"]
+
+    @pytest.mark.parametrize("header", [
+        "Bearer", "Bearer ", "Basic abc", "Bearerabc.def", "Bearer abc def",
+        "Bearer abc\tdef", "Bearer\tabc", "Bearer  abc",
+    ])
+    def test_rejected(self, tokens, header):
+        authenticator, seen = tokens
+        with pytest.raises(oauth.HTTPException) as exc_info:
+            authenticator.authenticate_from_header(header)
+        assert exc_info.value.detail == "Invalid authorization header format"
+        assert seen == []
+
+
+class TestAsyncPath:
+    """authenticate_async() and the async JWKS fetch."""
+
+    @pytest.fixture
+    def async_client(self, monkeypatch, jwks_fetches):
+        class Client:
+            async def get(self, uri):
+                await asyncio.sleep(0)
+                return oauth._http.get(uri)
+
+        monkeypatch.setattr(oauth, "_async_http", Client)
+
+    def test_rediscovery_runs_off_the_event_loop(self, monkeypatch, provider, async_client, signing_key):
+        undiscovered = provider.model_copy(update={"jwks_uri": None})
+        authenticator = OAuthAuthenticator(OAuthConfig(enabled=True))
+        authenticator.providers[provider.name] = undiscovered
+        authenticator._undiscovered[provider.name] = 0.0
+
+        loops = []
+
+        def discover(p):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return provider
+
+        monkeypatch.setattr(oauth, "discover_provider", discover)
+        info = asyncio.run(authenticator.authenticate_async(make_token(signing_key)))
+        assert info.sub == "user-1"
+        assert loops == [None]
+        assert authenticator.providers[provider.name] is provider
+
+    def test_fetch_async_across_event_loops(self, async_client, jwks_fetches):
+        cache = oauth.JWKSCache()
+
+        async def concurrent_fetches():
+            await asyncio.gather(*(cache.fetch_async("https://issuer/jwks") for _ in range(3)))
+
+        for _ in range(2):
+            cache._cache.clear()
+            asyncio.run(concurrent_fetches())
+        assert jwks_fetches == ["https://issuer/jwks"] * 2
+
+    def test_async_client_per_event_loop(self):
+        pytest.importorskip("httpx")
+
+        async def clients():
+            return oauth._async_http(), oauth._async_http()
+
+        first, same = asyncio.run(clients())
+        second, _ = asyncio.run(clients())
+        assert first is same
+        assert second is not first
@@ -0,0 +1,113 @@
+"""
+Tests for the OData in-process (L0) result cache.
+"""
+
+import pytest
+
+from app import odata
+from app.infrastructure.cache.redis_cache import CacheConfig, CacheKeyComponents
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for TTL checks."""
+    now = [1000.0]
+    monkeypatch.setattr(odata.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestResultCache:
+    """_ResultCache TTL and LRU behaviour."""
+
+    def test_hit_until_ttl(self, clock):
+        cache = odata._ResultCache(ttl=5)
+        result = (["a"], [{"a": 1}], {})
+        cache.put("k", result)
+        assert cache.get("k") is result
+        clock[0] += 5
+        assert cache.get("k") is None
+
+    def test_least_recently_used_evicted(self):
+        cache = odata._ResultCache(maxsize=2)
+        cache.put("a", "ra")
+        cache.put("b", "rb")
+        cache.get("a")
+        cache.put("c", "rc")
+        assert [cache.get(k) for k in ("a", "b", "c")] == ["ra", None, "rc"]
+
+
+class TestExecuteWithL0Cache:
+    """_execute_with_l0_cache() in front of the Redis layer."""
+
+    @pytest.fixture
+    def cache_config(self, monkeypatch):
+        config = CacheConfig(max_rows=3)
+        monkeypatch.setattr(odata, "get_cache_config", lambda: config)
+        monkeypatch.setattr(odata, "get_metrics", lambda: None)
+        monkeypatch.setattr(odata, "_l0_cache", odata._ResultCache(ttl=5))
+        return config
+
+    @pytest.fixture
+    def redis_layer(self, monkeypatch):
+        """Stand-in for execute_with_cache(); records each call and its result."""
+        calls = []
+
+        def execute_with_cache(execute_fn, cache_components):
+            calls.append(cache_components)
+            columns, rows, stats = execute_fn()
+            return columns, rows, {**stats, "cacheHit": False}
+
+        monkeypatch.setattr(odata, "execute_with_cache", execute_with_cache)
+        return calls
+
+    def components(self, tenant="acme"):
+        return CacheKeyComponents(tenant=tenant, role="analyst", dataset="orders")
+
+    def run(self, rows=({"n": 1},), stats=None, tenant="acme"):
+        result = (["n"], list(rows), dict(stats or {}))
+        return odata._execute_with_l0_cache(lambda: result, self.components(tenant))
+
+    def test_repeat_query_served_from_l0(self, cache_config, redis_layer):
+        first = self.run()
+        second = self.run()
+        assert len(redis_layer) == 1
+        assert second[:2] == first[:2]
+        assert second[2]["cacheHit"] is True
+        assert second[2]["cacheLayer"] == "l0"
+        # Marking the hit does not touch the stored stats
+        assert self.run()[2] == second[2]
+        assert first[2] == {"cacheHit": False}
+
+    def test_tenants_do_not_share_entries(self, cache_config, redis_layer):
+        self.run(tenant="acme")
+        self.run(tenant="globex")
+        assert [c.tenant for c in redis_layer] == ["acme", "globex"]
+
+    def test_large_results_not_admitted(self, cache_config, redis_layer):
+        rows = [{"n": i} for i in range(4)]
+        self.run(rows)
+        self.run(rows)
+        assert len(redis_layer) == 2
+
+    def test_admin_bypass_results_not_admitted(self, cache_config, redis_layer):
+        self.run(stats={"rlsBypassed": True})
+        self.run(stats={"rlsBypassed": True})
+        assert len(redis_layer) == 2
+
+    def test_admin_bypass_admitted_when_allowed(self, cache_config, redis_layer):
+        cache_config.cache_admin_bypass = True
+        self.run(stats={"rlsBypassed": True})
+        self.run(stats={"rlsBypassed": True})
+        assert len(redis_layer) == 1
+
+    def test_skipped_when_caching_disabled(self, cache_config, redis_layer):
+        cache_config.enabled = False
+        self.run()
+        self.run()
+        assert len(redis_layer) == 2
+
+    def test_expires(self, cache_config, redis_layer, clock):
+        self.run()
+        clock[0] += 5
+        self.run()
+        assert len(redis_layer) == 2